@@ -1,5 +1,5 @@
 import os
-import requests
+from movies.transport_service import http_session
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,7 +12,7 @@ if not api_key:
 url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
 
 try:
-    response = requests.get(url)
+    response = http_session().get(url)
     if response.status_code == 200:
         models = response.json().get('models', [])
         print("Available Models:")
@@ -98,6 +98,10 @@ DATABASES = {
         conn_max_age=600
     )
 }
+# pgbouncer in transaction mode (Neon's -pooler hosts) can't keep server-side cursors open,
+# so .iterator() falls back to client-side fetching there
+if '-pooler' in (DATABASES['default'].get('HOST') or ''):
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
 
 
 # Password validation
@@ -139,12 +143,51 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 # Caching
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Set REDIS_URL so every worker shares one cache (rate limits, quiz bank, ...)
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+
+# Rate limits: scope -> (requests, window in seconds)
+RATE_LIMITS = {
+    'quiz': (20, 60),    # take_quiz, per user
+    'search': (30, 60),  # TMDB searches from the home page, per user/IP
+    'llm': (30, 60),     # Ollama generations across all users
 }
+# Proxies in front of the app that append to X-Forwarded-For (1 on Render).
+# With 0 the header is ignored and clients are told apart by REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+
+# Sessions
+# Quiz state lives in movies.QuizAttempt, so sessions only carry auth and
+# messages; signed cookies avoid a database write per request.
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE', 'django.contrib.sessions.backends.signed_cookies')
+
+# Quiz serving: seconds a user may wait for the LLM before a metadata question is served instead
+QUIZ_LATENCY_BUDGET = float(os.environ.get('QUIZ_LATENCY_BUDGET', 8))
+
+# Outbound HTTP (TMDB, Ollama): 'live', 'record' (also save responses to HTTP_CASSETTE_DIR) or
+# 'replay' (serve only recorded responses, for offline benchmarks); see movies/transport_service.py
+HTTP_TRANSPORT = os.environ.get('HTTP_TRANSPORT', 'live')
+HTTP_CASSETTE_DIR = os.environ.get('HTTP_CASSETTE_DIR', str(BASE_DIR / 'cassettes'))
+# Replay only: 'recorded', milliseconds, or a 'min-max' range; share of requests failed on purpose
+HTTP_REPLAY_LATENCY = os.environ.get('HTTP_REPLAY_LATENCY', 'recorded')
+HTTP_REPLAY_ERROR_RATE = float(os.environ.get('HTTP_REPLAY_ERROR_RATE', 0))
+HTTP_REPLAY_SEED = os.environ.get('HTTP_REPLAY_SEED')
+
+# Badges are evaluated on a background thread; set to False to award them inline (e.g. while debugging rules)
+ACHIEVEMENTS_ASYNC = os.environ.get('ACHIEVEMENTS_ASYNC', 'True') == 'True'
 
 # Cloudinary
 CLOUDINARY_STORAGE = {
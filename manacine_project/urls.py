@@ -27,5 +27,8 @@ urlpatterns = [
     path("login/", auth_views.LoginView.as_view(template_name='users/login.html'), name="login"),
     path("logout/", auth_views.LogoutView.as_view(next_page='login'), name="logout"),
     path("profile/set-banner/<int:movie_id>/", user_views.set_banner, name="set-banner"),
+    path("profile/import/", user_views.import_history, name="import-history"),
+    path("profile/export/", user_views.download_my_data, name="download-my-data"),
+    path("profile/<str:kind>/", user_views.profile_list, name="profile-list"),
     path("", include("movies.urls")),
 ]
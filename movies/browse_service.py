@@ -0,0 +1,237 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+
+# Process-local copy of the index; reloaded from the shared cache every REFRESH_SECONDS
+_index = None
+_loaded_at = 0.0
+# Background rebuilds, one at a time, started when a reader finds the index old
+_build_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browse-index')
+
+
+class BrowseService:
+    """
+    Faceted browsing over the local Movie catalog, with no TMDB calls.
+
+    The catalog is loaded once into column arrays (year, rating band) and
+    boolean bitmaps per genre, streaming provider and original language,
+    plus one precomputed ordering per sort. A query ANDs the bitmaps for
+    the selected filters, and a page is the first matching positions of the
+    chosen ordering. Facet counts are sums over the same masks. Everything
+    is vectorised numpy over the whole catalog, so any combination and any
+    page depth costs the same few milliseconds.
+
+    The index is built by `build_browse_index` and shared through the cache;
+    each worker reloads it every REFRESH_SECONDS. Once the shared copy is
+    older than REBUILD_SECONDS the next reader queues a rebuild in the
+    background and keeps serving the old one, so newly mirrored movies show
+    up within about REBUILD_SECONDS + REFRESH_SECONDS. Only the holder of
+    BUILD_LOCK_KEY builds; a cold cache makes the other workers wait for it
+    rather than all building at once.
+    """
+
+    CACHE_KEY = 'browse_index_v1'
+    CACHE_TIMEOUT = 86400
+    REFRESH_SECONDS = 600
+    REBUILD_SECONDS = 1800
+    BUILD_LOCK_KEY = 'browse_index_build_lock'
+    BUILD_LOCK_TIMEOUT = 600
+    # How long a reader on a cold cache waits for another worker's build
+    BUILD_WAIT_SECONDS = 30
+    PAGE_SIZE = 24
+    DEFAULT_LANGUAGE = 'te'
+    # Lower edges of the rating bands offered as "N+ stars" filters
+    RATING_BANDS = [5, 6, 7, 8]
+    SORTS = {
+        'newest': 'Newest',
+        'rating': 'Top rated',
+        'title': 'A–Z',
+    }
+
+    # ── Index ────────────────────────────────────────────────────────
+
+    def build(self):
+        """Reads the catalog into a fresh index and shares it through the cache."""
+        from .models import Movie
+        rows = list(
+            Movie.objects.exclude(title=None).exclude(title='')
+            .values_list(
+                'id', 'title', 'poster_url', 'release_date', 'rating',
+                'original_language', 'details__genres', 'details__providers',
+            )
+            .iterator(chunk_size=2000)
+        )
+        n = len(rows)
+        cards = []
+        years = np.zeros(n, dtype=np.int16)
+        ratings = np.zeros(n, dtype=np.float32)
+        genres, providers, languages = {}, {}, {}
+
+        def mark(bitmaps, key, i):
+            if key not in bitmaps:
+                bitmaps[key] = np.zeros(n, dtype=bool)
+            bitmaps[key][i] = True
+
+        for i, (pk, title, poster, released, rating, language, movie_genres, movie_providers) in enumerate(rows):
+            # Placeholders are left out to keep the shared index small; they are attached per page
+            cards.append({'id': pk, 'title': title, 'poster_url': poster, 'release_date': released or '', 'rating': rating or 0})
+            year = (released or '')[:4]
+            years[i] = int(year) if year.isdigit() else 0
+            ratings[i] = rating or 0
+            for genre in movie_genres or []:
+                mark(genres, genre, i)
+            # Streaming (flatrate) only: "on Netflix" means included in the subscription
+            for provider in (movie_providers or {}).get('stream', []):
+                mark(providers, provider['name'], i)
+            mark(languages, language or '', i)
+
+        def order(keys):
+            return np.lexsort(keys).astype(np.int32)
+
+        index = {
+            'cards': cards,
+            'years': years,
+            'ratings': ratings,
+            'genres': genres,
+            'providers': providers,
+            'languages': languages,
+            # np.lexsort sorts by the last key first
+            'orders': {
+                'newest': order((-ratings, -years.astype(np.int32), years == 0)),
+                'rating': order((-years.astype(np.int32), -ratings, ratings == 0)),
+                'title': np.array(sorted(range(n), key=lambda i: cards[i]['title'].casefold()), dtype=np.int32),
+            },
+            'built_at': time.time(),
+        }
+        cache.set(self.CACHE_KEY, index, self.CACHE_TIMEOUT)
+        self._keep(index)
+        return index
+
+    def _keep(self, index):
+        global _index, _loaded_at
+        _index, _loaded_at = index, time.monotonic()
+
+    def index(self):
+        if _index is not None and time.monotonic() - _loaded_at < self.REFRESH_SECONDS:
+            return _index
+        index = cache.get(self.CACHE_KEY)
+        if index is None and _index is None:
+            return self._build_or_wait()
+        if index is None or time.time() - index['built_at'] > self.REBUILD_SECONDS:
+            # Evicted or old: keep serving what we have while it's rebuilt
+            self.build_in_background()
+        index = _index if index is None else index
+        self._keep(index)
+        return index
+
+    def build_in_background(self):
+        """Queues a rebuild unless one is already running somewhere."""
+        if cache.add(self.BUILD_LOCK_KEY, True, self.BUILD_LOCK_TIMEOUT):
+            _build_pool.submit(self._build_and_release)
+
+    def _build_and_release(self):
+        try:
+            self.build()
+        except Exception as e:
+            print(f"Error building browse index: {e}")
+        finally:
+            cache.delete(self.BUILD_LOCK_KEY)
+            connection.close()
+
+    def _build_or_wait(self):
+        # Nothing to serve yet: one worker builds, the rest poll for its result
+        deadline = time.monotonic() + self.BUILD_WAIT_SECONDS
+        while not cache.add(self.BUILD_LOCK_KEY, True, self.BUILD_LOCK_TIMEOUT):
+            time.sleep(0.25)
+            index = cache.get(self.CACHE_KEY)
+            if index is not None:
+                self._keep(index)
+                return index
+            if time.monotonic() > deadline:
+                print("Browse index build is taking too long; building here too")
+                return self.build()
+        try:
+            return self.build()
+        finally:
+            cache.delete(self.BUILD_LOCK_KEY)
+
+    # ── Querying ─────────────────────────────────────────────────────
+
+    def search(self, genres=(), providers=(), year_from=None, year_to=None, min_rating=None,
+               language=DEFAULT_LANGUAGE, sort='newest', page=1, size=PAGE_SIZE):
+        """
+        One page of movies matching every filter, with facet counts.
+
+        `genres` must all match; `providers` match if the movie streams on any
+        of them. Facet counts follow the usual convention: each facet is
+        counted with the other facets' filters applied but not its own, so
+        picking a provider doesn't hide the alternatives.
+        """
+        index = self.index()
+        n = len(index['cards'])
+        if language == self.DEFAULT_LANGUAGE and language not in index['languages']:
+            # Catalog mirrored before languages were recorded: show everything rather than nothing
+            language = 'all'
+        everything = np.ones(n, dtype=bool)
+
+        def any_of(bitmaps, keys):
+            mask = np.zeros(n, dtype=bool)
+            for key in keys:
+                if key in bitmaps:
+                    mask |= bitmaps[key]
+            return mask
+
+        masks = {
+            'language': index['languages'].get(language, np.zeros(n, dtype=bool)) if language != 'all' else everything,
+            'genres': np.logical_and.reduce(
+                [index['genres'].get(genre, np.zeros(n, dtype=bool)) for genre in genres] or [everything]
+            ),
+            'providers': any_of(index['providers'], providers) if providers else everything,
+            'years': (
+                (index['years'] >= (year_from or 0)) & (index['years'] <= (year_to or 9999))
+                & ((index['years'] > 0) | (not year_from and not year_to))
+            ),
+            'rating': index['ratings'] >= min_rating if min_rating else everything,
+        }
+
+        def without(*names):
+            return np.logical_and.reduce([mask for name, mask in masks.items() if name not in names])
+
+        matched = without()
+        order = index['orders'].get(sort, index['orders']['newest'])
+        positions = order[matched[order]]
+        total = len(positions)
+        page = max(1, min(page, math.ceil(total / size) or 1))
+        window = positions[(page - 1) * size:page * size]
+
+        from .services import TMDBService
+        return {
+            'movies': TMDBService()._attach_placeholders([dict(index['cards'][i]) for i in window]),
+            'language': language,
+            'total': total,
+            'page': page,
+            'pages': math.ceil(total / size),
+            'facets': self._facets(index, matched, without, keep=set(genres) | set(providers)),
+        }
+
+    def _facets(self, index, matched, without, keep=()):
+        def counts(bitmaps, mask):
+            # Selected values stay listed even at zero so they can be unticked
+            found = ((key, int(np.count_nonzero(bitmap & mask))) for key, bitmap in bitmaps.items() if key)
+            return sorted((item for item in found if item[1] or item[0] in keep), key=lambda item: (-item[1], item[0]))
+
+        years = index['years'][without('years')]
+        decades = np.bincount(years[years > 0] // 10) if years.size else np.zeros(0)
+        ratings = index['ratings'][without('rating')]
+        return {
+            # Genres narrow the result (AND), so count within the current matches
+            'genres': counts(index['genres'], matched),
+            'providers': counts(index['providers'], without('providers')),
+            'languages': counts(index['languages'], without('language')),
+            'decades': [(decade * 10, int(count)) for decade, count in enumerate(decades) if count][::-1],
+            'ratings': [(band, int(np.count_nonzero(ratings >= band))) for band in self.RATING_BANDS],
+        }
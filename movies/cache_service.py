@@ -0,0 +1,92 @@
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+
+# A family of cache entries. `version` is the schema version: bump it in code
+# when the cached shape changes. `timeout` is how long its entries live.
+Namespace = namedtuple('Namespace', ['version', 'timeout', 'description'])
+
+
+class CacheService:
+    """
+    Registry of the TMDB-backed cache entries, with versioned namespaces and
+    tags for targeted invalidation.
+
+    A key is built from its namespace's schema version and generation plus
+    the generation of every tag it carries, e.g.
+    `movie_details:v3.1729...:603:movie:603=1729...`. Bumping a namespace or
+    purging a tag writes one new generation, an O(1) operation: every key
+    built from the old one stops matching and the stranded entries expire
+    with their timeout. A generation that has fallen out of the cache comes
+    back as a new one, so eviction can only invalidate, never resurrect.
+
+    Tags in use: movie:<id>, person:<id>, row:home, row:search, row:genre.
+    Purging movie:<id> or person:<id> also forgets the stored validators,
+    so the next fetch is a full download rather than a revalidation of a
+    bad copy.
+    """
+
+    NAMESPACES = {
+        'movie_details': Namespace(3, 86400, "Processed movie details (v3: original_language)"),
+        'similar_movies': Namespace(1, 7 * 86400, "Same director/cast discover results for the similar rail"),
+        'person_details': Namespace(2, 86400, "Processed person details (v2: filmography moved out)"),
+        'filmography': Namespace(1, 86400, "Per-person filmography index"),
+        'movie_rows': Namespace(1, 3600, "Pages of home, genre and search rows"),
+        'find_movie': Namespace(1, 86400, "Title/year lookups for history imports, misses included"),
+    }
+    TAG_PREFIXES = ('movie', 'person', 'row')
+    GENERATION_KEY = 'cache_gen:{name}'
+
+    def _generations(self, names):
+        keys = {name: self.GENERATION_KEY.format(name=name) for name in names}
+        found = cache.get_many(keys.values())
+        generations = {}
+        for name, key in keys.items():
+            generation = found.get(key)
+            if generation is None:
+                # add() so concurrent first users agree on one generation
+                cache.add(key, time.time_ns(), None)
+                generation = cache.get(key) or 0
+            generations[name] = generation
+        return generations
+
+    def key(self, namespace, *parts, tags=()):
+        """The current cache key for `parts` in a registered namespace."""
+        spec = self.NAMESPACES[namespace]
+        generations = self._generations([f'ns:{namespace}'] + [f'tag:{tag}' for tag in tags])
+        tagged = ''.join(f":{tag}={generations[f'tag:{tag}']}" for tag in tags)
+        return f"{namespace}:v{spec.version}.{generations[f'ns:{namespace}']}:{':'.join(str(p) for p in parts)}{tagged}"
+
+    def timeout(self, namespace):
+        return self.NAMESPACES[namespace].timeout
+
+    def bump(self, namespace):
+        """Invalidates every entry in a namespace."""
+        if namespace not in self.NAMESPACES:
+            raise ValueError(f"Unknown cache namespace: {namespace}")
+        cache.set(self.GENERATION_KEY.format(name=f'ns:{namespace}'), time.time_ns(), None)
+
+    def purge(self, tag):
+        """Invalidates every entry carrying `tag` (e.g. 'movie:603')."""
+        kind, _, value = tag.partition(':')
+        if kind not in self.TAG_PREFIXES or not value:
+            raise ValueError(f"Unknown cache tag: {tag} (expected movie:<id>, person:<id> or row:<name>)")
+        cache.set(self.GENERATION_KEY.format(name=f'tag:{tag}'), time.time_ns(), None)
+        if kind in ('movie', 'person') and value.isdigit():
+            from .models import Movie, Person
+            model = Movie if kind == 'movie' else Person
+            model.objects.filter(id=int(value)).update(
+                details_etag=None, details_last_modified=None, details_checked_at=None
+            )
+
+    def invalidate(self, target):
+        """Admin/command entry point: a tag (contains ':') or a namespace name."""
+        if ':' in target:
+            self.purge(target)
+        else:
+            self.bump(target)
+
+    def namespaces(self):
+        """[(name, Namespace), ...] for listing."""
+        return sorted(self.NAMESPACES.items())
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import requests
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Movie, Person
+
+
+class ChangeTrackingService:
+    """
+    Follows TMDB's /movie/changes and /person/changes feeds so expired
+    details can be reused without asking TMDB at all.
+
+    sync() stamps changed_at on every mirrored movie or person the feed
+    lists, and records the span the feed has been followed for. Stored
+    details checked inside that span and not stamped since are known to be
+    current, so unchanged() lets TMDBService serve them without a request.
+    Anything else (including everything when the feed hasn't been synced)
+    falls back to a conditional request with the stored ETag.
+
+    Watch providers come from JustWatch and are not in the feed, so stored
+    details are trusted for at most MAX_TRUST_DAYS before being revalidated.
+    """
+
+    # TMDB serves at most 14 days of changes per request
+    MAX_WINDOW_DAYS = 14
+    MAX_TRUST_DAYS = 7
+    MAX_PAGES = 500
+    BATCH_SIZE = 500
+    COVERAGE_KEY = 'tmdb_changes_coverage'
+    MODELS = {'movie': Movie, 'person': Person}
+
+    def coverage(self):
+        """{'since', 'through'}: the span every change has been recorded for, or None."""
+        return cache.get(self.COVERAGE_KEY)
+
+    def unchanged(self, stored, now=None):
+        """True when a stored row (details_checked_at, changed_at) can be served as is."""
+        checked = stored.get('details_checked_at')
+        coverage = self.coverage()
+        if not checked or not coverage:
+            return False
+        now = now or timezone.now()
+        if now - checked > timedelta(days=self.MAX_TRUST_DAYS) or checked < coverage['since']:
+            return False
+        return not stored.get('changed_at') or stored['changed_at'] < checked
+
+    def sync(self, now=None):
+        """Records changes since the last sync. Returns {kind: rows stamped}, or None if TMDB failed."""
+        from .services import TMDBService
+        tmdb = TMDBService()
+        if not tmdb.api_key:
+            return None
+        now = now or timezone.now()
+        oldest = now - timedelta(days=self.MAX_WINDOW_DAYS - 1)
+        coverage = self.coverage()
+        if coverage and coverage['through'] > oldest:
+            start, since = coverage['through'], coverage['since']
+        else:
+            # First sync, or a gap longer than the feed reaches back: start a fresh span
+            start = since = oldest
+
+        stamped = {}
+        for kind, model in self.MODELS.items():
+            ids = self._changed_ids(tmdb, kind, start, now)
+            if ids is None:
+                return None
+            stamped[kind] = 0
+            for i in range(0, len(ids), self.BATCH_SIZE):
+                stamped[kind] += model.objects.filter(id__in=ids[i:i + self.BATCH_SIZE]).update(changed_at=now)
+        cache.set(self.COVERAGE_KEY, {'since': since, 'through': now}, None)
+        return stamped
+
+    def _changed_ids(self, tmdb, kind, start, end):
+        # The feed is day-granular; re-reading the start day is harmless
+        ids, page, total_pages = [], 1, 1
+        while page <= total_pages:
+            if page > self.MAX_PAGES:
+                print(f"Too many {kind} changes since {start:%Y-%m-%d}; not advancing the change feed")
+                return None
+            try:
+                response = tmdb.session.get(
+                    f"{tmdb.base_url}/{kind}/changes",
+                    params={
+                        'api_key': tmdb.api_key,
+                        'start_date': start.date().isoformat(),
+                        'end_date': end.date().isoformat(),
+                        'page': page,
+                    },
+                    timeout=10,
+                )
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                print(f"Error reading TMDB {kind} changes: {e}")
+                return None
+            ids.extend(item['id'] for item in data.get('results', []))
+            total_pages = data.get('total_pages') or 1
+            page += 1
+        return ids
@@ -0,0 +1,133 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OuterRef, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+class _Echo:
+    # csv.writer wants a file; this one just hands each formatted line back
+    def write(self, value):
+        return value
+
+
+class ExportService:
+    """
+    Streams tables out as CSV or JSON without loading them. Rows are read in
+    keyset pages of CHUNK_SIZE (pk > last pk seen) and encoded one at a time
+    into a StreamingHttpResponse, so the first bytes go out immediately and
+    memory stays flat however many rows there are. Every page is an ordinary
+    query rather than a server-side cursor, which pgbouncer in transaction
+    mode (the Neon -pooler host) can't hold open across a stream.
+    """
+
+    CHUNK_SIZE = 2000
+
+    def _datasets(self):
+        from django.contrib.auth.models import User
+        from reviews.models import Review
+        from .models import Favorite, Watched
+        titled = self._titled
+        return {
+            'users': (
+                User.objects.order_by('id').annotate(
+                    watched_count=F('stats__watched_count'),
+                    favorites_count=F('stats__favorites_count'),
+                    reviews_count=F('stats__reviews_count'),
+                ),
+                [
+                    'id', 'username', 'date_joined', 'last_login', 'is_staff',
+                    'watched_count', 'favorites_count', 'reviews_count',
+                ],
+            ),
+            'reviews': (
+                Review.objects.order_by('id'),
+                [
+                    'id', 'user_id', 'movie_id', 'rating', 'music_rating', 'direction_rating', 'acting_rating',
+                    'cinematography_rating', 'content', 'created_at', 'updated_at',
+                ],
+            ),
+            'watched': (titled(Watched.objects.order_by('id')), ['id', 'user_id', 'movie_id', 'title', 'created_at']),
+            'favorites': (titled(Favorite.objects.order_by('id')), ['id', 'user_id', 'movie_id', 'title', 'created_at']),
+        }
+
+    def _titled(self, queryset):
+        # Titles live on Movie; one correlated lookup per row by primary key
+        from .models import Movie
+        return queryset.annotate(title=Subquery(Movie.objects.filter(id=OuterRef('movie_id')).values('title')[:1]))
+
+    def datasets(self):
+        return list(self._datasets())
+
+    def rows(self, queryset, columns):
+        queryset = queryset.order_by('pk')
+        last = None
+        while True:
+            page = queryset.filter(pk__gt=last) if last is not None else queryset
+            chunk = list(page.values_list('pk', *columns)[:self.CHUNK_SIZE])
+            for row in chunk:
+                yield row[1:]
+            if len(chunk) < self.CHUNK_SIZE:
+                return
+            last = chunk[-1][0]
+
+    def csv_lines(self, queryset, columns):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in self.rows(queryset, columns):
+            yield writer.writerow(row)
+
+    def json_lines(self, queryset, columns):
+        # A JSON array written one object per line
+        yield '['
+        separator = '\n'
+        for row in self.rows(queryset, columns):
+            yield separator + json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder)
+            separator = ',\n'
+        yield '\n]\n'
+
+    def response(self, dataset, fmt='csv'):
+        """StreamingHttpResponse with the whole `dataset` as CSV or JSON. Raises KeyError for unknown datasets."""
+        queryset, columns = self._datasets()[dataset]
+        lines = self.json_lines(queryset, columns) if fmt == 'json' else self.csv_lines(queryset, columns)
+        filename = f"manacine-{dataset}-{timezone.now():%Y%m%d}.{'json' if fmt == 'json' else 'csv'}"
+        return self._attachment(lines, filename, 'application/json' if fmt == 'json' else 'text/csv')
+
+    def user_data(self, user):
+        """Everything stored about `user` as one streamed JSON document ("download my data")."""
+        from reviews.models import Review
+        from users.models import UserBadge
+        from .models import Favorite, Watched
+
+        sections = [
+            ('watched', self._titled(Watched.objects.filter(user=user)), ['movie_id', 'title', 'created_at']),
+            ('favorites', self._titled(Favorite.objects.filter(user=user)), ['movie_id', 'title', 'created_at']),
+            ('reviews', Review.objects.filter(user=user), [
+                'movie_id', 'rating', 'music_rating', 'direction_rating', 'acting_rating', 'cinematography_rating',
+                'content', 'created_at', 'updated_at',
+            ]),
+            ('badges', UserBadge.objects.filter(user=user), ['code', 'movie_id', 'awarded_at']),
+        ]
+        account = {
+            'username': user.username,
+            'date_joined': user.date_joined,
+            'bio': user.profile.bio,
+            'banner_url': user.profile.banner_url,
+        }
+
+        def document():
+            yield '{\n"account": ' + json.dumps(account, cls=DjangoJSONEncoder)
+            for name, queryset, columns in sections:
+                yield f',\n"{name}": '
+                yield from self.json_lines(queryset, columns)
+            yield '}\n'
+
+        filename = f"manacine-{user.username}-{timezone.now():%Y%m%d}.json"
+        return self._attachment(document(), filename, 'application/json')
+
+    def _attachment(self, lines, filename, content_type):
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
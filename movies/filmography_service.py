@@ -0,0 +1,144 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from django.core.cache import cache
+
+# One movie in a person's filmography. `roles` is a bitmask so acting in and
+# directing the same film is one entry; `year` is 0 when TMDB has no date.
+Credit = namedtuple('Credit', ['movie_id', 'title', 'poster_path', 'year', 'roles', 'character', 'language', 'popularity'])
+
+ACTOR = 1
+DIRECTOR = 2
+ROLES = {'all': ACTOR | DIRECTOR, 'actor': ACTOR, 'director': DIRECTOR}
+
+
+class FilmographyService:
+    """
+    Person filmographies as a compact, pre-sorted index. TMDB credits are
+    reduced to tuples (uncredited parts dropped, acting and directing the same
+    film merged), sorted newest first with undated titles last, and cached
+    together with position lists per role and per original language. Every
+    page, filter and facet count is then answered from the cached index
+    without touching TMDB again.
+    """
+
+    PAGE_SIZE = 24
+    DEFAULT_LANGUAGE = 'te'
+    POSTER_BASE_URL = "https://image.tmdb.org/t/p/w342"
+
+    def cache_key(self, person_id):
+        from .cache_service import CacheService
+        return CacheService().key('filmography', person_id, tags=[f'person:{person_id}'])
+
+    def build(self, person_id, movie_credits):
+        """Builds and caches the index from a TMDB `movie_credits` payload."""
+        merged = {}
+        for item, role in [(c, ACTOR) for c in movie_credits.get('cast', [])] + [
+            (c, DIRECTOR) for c in movie_credits.get('crew', []) if c.get('job') == 'Director'
+        ]:
+            character = (item.get('character') or '').strip()
+            if not item.get('title') or '(uncredited)' in character.lower():
+                continue
+            credit = merged.get(item['id'])
+            if credit:
+                merged[item['id']] = credit._replace(
+                    roles=credit.roles | role, character=credit.character or (character if role == ACTOR else '')
+                )
+                continue
+            release = item.get('release_date') or ''
+            merged[item['id']] = Credit(
+                movie_id=item['id'],
+                title=item['title'],
+                poster_path=item.get('poster_path'),
+                year=int(release[:4]) if release[:4].isdigit() else 0,
+                roles=role,
+                character=character if role == ACTOR else '',
+                language=item.get('original_language') or '',
+                popularity=item.get('popularity') or 0,
+            )
+
+        # Newest first, undated (announced / unknown) at the end, better-known films first within a year
+        credits = sorted(merged.values(), key=lambda c: (c.year == 0, -c.year, -c.popularity))
+        index = {
+            'credits': credits,
+            # Ascending copy of -year for bisect: a year is one contiguous slice
+            'years': array('i', [-c.year if c.year else 1 for c in credits]),
+            'roles': {
+                role: array('H', [i for i, c in enumerate(credits) if c.roles & role]) for role in (ACTOR, DIRECTOR)
+            },
+            'languages': {},
+        }
+        for i, credit in enumerate(credits):
+            index['languages'].setdefault(credit.language, array('H')).append(i)
+        from .cache_service import CacheService
+        cache.set(self.cache_key(person_id), index, CacheService().timeout('filmography'))
+        return index
+
+    def index(self, person_id):
+        index = cache.get(self.cache_key(person_id))
+        if index is None:
+            from .services import TMDBService
+            movie_credits = TMDBService().get_person_credits(person_id)
+            if movie_credits is None:
+                return None
+            index = self.build(person_id, movie_credits)
+        return index
+
+    def default_language(self, index):
+        # Telugu first, but people with no Telugu credits get everything rather than an empty page
+        return self.DEFAULT_LANGUAGE if index['languages'].get(self.DEFAULT_LANGUAGE) else 'all'
+
+    def _positions(self, index, role='all', language='all', year=None):
+        positions = range(len(index['credits']))
+        if year:
+            years = index['years']
+            positions = range(bisect_left(years, -year), bisect_right(years, -year))
+        selected = set(positions)
+        if ROLES.get(role, ROLES['all']) != ROLES['all']:
+            selected.intersection_update(index['roles'][ROLES[role]])
+        if language != 'all':
+            selected.intersection_update(index['languages'].get(language, ()))
+        return sorted(selected)
+
+    def page(self, person_id, role='all', language=None, year=None, page=1, size=PAGE_SIZE):
+        """(credits as template dicts, has_next) for one page of a filtered filmography."""
+        index = self.index(person_id)
+        if index is None:
+            return [], False
+        language = language or self.default_language(index)
+        positions = self._positions(index, role, language, year)
+        start = (max(page, 1) - 1) * size
+        window = positions[start:start + size]
+        return [self.as_card(index['credits'][i]) for i in window], start + size < len(positions)
+
+    def facets(self, person_id, language=None):
+        """Counts for the filter chips: per role within `language`, and per language."""
+        index = self.index(person_id)
+        if index is None:
+            return None
+        language = language or self.default_language(index)
+        return {
+            'language': language,
+            'roles': [
+                (role, label, len(self._positions(index, role, language)))
+                for role, label in (('all', 'All'), ('actor', 'Acting'), ('director', 'Directing'))
+            ],
+            'languages': sorted(
+                ((code, len(positions)) for code, positions in index['languages'].items() if code),
+                key=lambda item: -item[1],
+            ),
+            'total': len(index['credits']),
+        }
+
+    def as_card(self, credit):
+        return {
+            'id': credit.movie_id,
+            'title': credit.title,
+            'poster_url': f"{self.POSTER_BASE_URL}{credit.poster_path}" if credit.poster_path else None,
+            'year': credit.year or 'TBA',
+            'character': credit.character,
+            'is_actor': bool(credit.roles & ACTOR),
+            'is_director': bool(credit.roles & DIRECTOR),
+            'language': credit.language,
+        }
@@ -0,0 +1,71 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Interaction
+
+
+class InteractionService:
+    """
+    Maintains movies.Interaction, the one-row-per-(user, movie) view of
+    Watched, Favorite and Review. Setting or clearing a flag is a single
+    UPDATE with a bitwise OR/AND, and an insert only on the first interaction.
+    """
+
+    # kind -> (flag bit, timestamp field)
+    KINDS = {
+        'watched': (Interaction.WATCHED, 'watched_at'),
+        'favorite': (Interaction.FAVORITE, 'favorited_at'),
+        'review': (Interaction.REVIEWED, 'reviewed_at'),
+    }
+
+    def record(self, kind, user_id, movie_id, at):
+        flag, field = self.KINDS[kind]
+        rows = Interaction.objects.filter(user_id=user_id, movie_id=movie_id)
+        if rows.update(flags=F('flags').bitor(flag), **{field: at}):
+            return
+        try:
+            with transaction.atomic():
+                Interaction.objects.create(user_id=user_id, movie_id=movie_id, flags=flag, created_at=at, **{field: at})
+        except IntegrityError:
+            # Another request created the row first
+            rows.update(flags=F('flags').bitor(flag), **{field: at})
+
+    def clear(self, kind, user_id, movie_id):
+        flag, field = self.KINDS[kind]
+        rows = Interaction.objects.filter(user_id=user_id, movie_id=movie_id)
+        rows.update(flags=F('flags').bitand(~flag), **{field: None})
+        rows.filter(flags=0).delete()
+
+    def get(self, user, movie_id):
+        """The user's Interaction with a movie, or None (also for anonymous users)."""
+        if not user.is_authenticated:
+            return None
+        return Interaction.objects.filter(user=user, movie_id=movie_id).first()
+
+    def rebuild(self, user_ids=None, batch_size=1000):
+        """
+        Recreates rows from Watched/Favorite/Review, for everyone or just
+        `user_ids` (e.g. after a bulk import, which sends no signals).
+        Returns the number of rows written.
+        """
+        from reviews.models import Review
+        from .models import Favorite, Watched
+        sources = {'watched': Watched, 'favorite': Favorite, 'review': Review}
+        scope = {} if user_ids is None else {'user_id__in': user_ids}
+
+        rows = {}
+        for kind, model in sources.items():
+            flag, field = self.KINDS[kind]
+            history = model.objects.filter(**scope).values_list('user_id', 'movie_id', 'created_at')
+            for user_id, movie_id, at in history.iterator():
+                row = rows.get((user_id, movie_id))
+                if row is None:
+                    row = rows[(user_id, movie_id)] = Interaction(user_id=user_id, movie_id=movie_id, created_at=at)
+                row.flags |= flag
+                setattr(row, field, at)
+                row.created_at = min(row.created_at, at)
+
+        with transaction.atomic():
+            Interaction.objects.filter(**scope).delete()
+            Interaction.objects.bulk_create(rows.values(), batch_size=batch_size)
+        return len(rows)
@@ -0,0 +1,524 @@
+import hashlib
+import html
+import json
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import connection
+
+GENRES = [(28, 'Action'), (35, 'Comedy'), (18, 'Drama'), (10749, 'Romance'), (53, 'Thriller'), (10751, 'Family')]
+PROVIDERS = ['Aha', 'Netflix', 'Amazon Prime Video']
+# Title words double as search terms, so searches always find something
+TITLE_WORDS = ['Prema', 'Yuddham', 'Raju', 'Kalyanam', 'Veera', 'Sita', 'Gharana', 'Aakasam']
+# What the stub LLM marks as correct, so quiz submissions can pass
+STUB_ANSWER = 'The stub answer'
+PAGE_SIZE = 20
+
+Sample = namedtuple('Sample', ['endpoint', 'status', 'ms', 'queries'])
+
+
+class StubCatalog:
+    """Deterministic synthetic Telugu movies and people, the same for a given size on every run."""
+
+    def __init__(self, movies=500, people=200):
+        self.movie_ids = list(range(1, movies + 1))
+        self.person_ids = list(range(1, people + 1))
+        self.today = date.today()
+        self.credits = {person_id: [] for person_id in self.person_ids}
+        self.summaries = []
+        for movie_id in self.movie_ids:
+            movie = self.movie(movie_id)
+            self.summaries.append(self.summary(movie))
+            for member in movie['credits']['cast']:
+                self.credits[member['id']].append(dict(self.summary(movie), character=member['character']))
+            for member in movie['credits']['crew']:
+                self.credits[member['id']].append(dict(self.summary(movie), job='Director'))
+
+    def title(self, movie_id):
+        return f"{TITLE_WORDS[movie_id % len(TITLE_WORDS)]} {movie_id}"
+
+    def movie(self, movie_id):
+        rng = random.Random(movie_id)
+        people = len(self.person_ids)
+        cast = [(movie_id * 7 + k) % people + 1 for k in range(6)]
+        director = (movie_id * 3) % people + 1
+        genres = rng.sample(GENRES, 2)
+        provider = PROVIDERS[movie_id % len(PROVIDERS)]
+        return {
+            'id': movie_id,
+            'title': self.title(movie_id),
+            'overview': f"{self.title(movie_id)} follows a family in coastal Andhra through one eventful summer.",
+            'poster_path': f'/stub/{movie_id}.jpg',
+            'backdrop_path': f'/stub/{movie_id}-backdrop.jpg',
+            # Spread from ~10 months ago to ~6 months ahead, so every calendar window has titles
+            'release_date': (self.today + timedelta(days=(movie_id * 37) % 480 - 300)).isoformat(),
+            'runtime': rng.randint(110, 175),
+            'vote_average': round(rng.uniform(4, 9), 1),
+            'vote_count': rng.randint(10, 5000),
+            'popularity': round(rng.uniform(1, 100), 2),
+            'original_language': 'te',
+            'genre_ids': [g for g, _ in genres],
+            'genres': [{'id': g, 'name': name} for g, name in genres],
+            'credits': {
+                'cast': [
+                    {'id': p, 'name': f'Stub Actor {p}', 'character': f'Role {k + 1}', 'profile_path': None}
+                    for k, p in enumerate(cast)
+                ],
+                'crew': [{'id': director, 'name': f'Stub Actor {director}', 'job': 'Director'}],
+            },
+            'videos': {'results': []},
+            'external_ids': {'imdb_id': f'tt{movie_id:07d}'},
+            'watch/providers': {'results': {'IN': {
+                'link': f'https://example.invalid/watch/{movie_id}',
+                'flatrate': [{'provider_name': provider, 'logo_path': f'/stub/{provider}.png'}],
+            }}},
+        }
+
+    def summary(self, movie):
+        fields = ('id', 'title', 'overview', 'poster_path', 'release_date', 'vote_average', 'vote_count',
+                  'popularity', 'original_language', 'genre_ids')
+        return {f: movie[f] for f in fields}
+
+    def person(self, person_id):
+        credits = self.credits[person_id]
+        return {
+            'id': person_id,
+            'name': f'Stub Actor {person_id}',
+            'biography': 'A synthetic person for load tests.',
+            'birthday': '1980-01-01',
+            'place_of_birth': 'Vijayawada, India',
+            'profile_path': None,
+            'known_for_department': 'Acting',
+            'movie_credits': {
+                'cast': [c for c in credits if 'character' in c],
+                'crew': [c for c in credits if 'job' in c],
+            },
+        }
+
+    def discover(self, params):
+        movies = list(self.summaries)
+        first, last = params.get('primary_release_date.gte'), params.get('primary_release_date.lte')
+        if first:
+            movies = [m for m in movies if m['release_date'] >= first]
+        if last:
+            movies = [m for m in movies if m['release_date'] <= last]
+        if params.get('with_genres'):
+            wanted = {int(g) for g in re.split(r'[,|]', params['with_genres']) if g.isdigit()}
+            movies = [m for m in movies if wanted & set(m['genre_ids'])]
+        if params.get('with_people'):
+            wanted = {int(p) for p in re.split(r'[,|]', params['with_people']) if p.isdigit()}
+            credited = {c['id'] for p in wanted for c in self.credits.get(p, [])}
+            movies = [m for m in movies if m['id'] in credited]
+        field, _, order = (params.get('sort_by') or 'popularity.desc').rpartition('.')
+        field = {'primary_release_date': 'release_date'}.get(field, field)
+        if movies and field in movies[0]:
+            movies.sort(key=lambda m: m[field], reverse=order == 'desc')
+        return movies
+
+    def search(self, query):
+        query = (query or '').lower()
+        return [m for m in self.summaries if query in m['title'].lower()]
+
+
+class StubUpstream:
+    """
+    TMDB and Ollama look-alikes on one local port, serving StubCatalog data.
+    Every TMDB response waits `latency` ms (±50%) and every quiz generation
+    `llm_latency` ms, so the app's caches and budgets are exercised as if
+    the real services were on the other end. Details carry ETags and honour
+    If-None-Match, like TMDB. Point the app at it with TMDB_API_URL and
+    OLLAMA_API_URL.
+    """
+
+    def __init__(self, catalog, latency=30, llm_latency=800):
+        self.catalog = catalog
+        self.latency = latency
+        self.llm_latency = llm_latency
+        self.requests = 0
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def tmdb_url(self):
+        return f'{self.url}/3'
+
+    @property
+    def ollama_url(self):
+        return f'{self.url}/api/generate'
+
+    def start(self):
+        handler = type('StubHandler', (_StubHandler,), {'upstream': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='stub-upstream', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _wait(self, ms):
+        if ms > 0:
+            time.sleep(random.uniform(0.5, 1.5) * ms / 1000)
+
+    def get(self, path, params):
+        """(status, payload) for a TMDB GET."""
+        self._wait(self.latency)
+        page = int(params.get('page') or 1)
+        if path in ('/3/discover/movie', '/3/search/movie'):
+            movies = self.catalog.discover(params) if path.endswith('discover/movie') else self.catalog.search(params.get('query'))
+            total_pages = max(1, -(-len(movies) // PAGE_SIZE))
+            return 200, {
+                'page': page,
+                'results': movies[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+                'total_pages': total_pages,
+                'total_results': len(movies),
+            }
+        if path in ('/3/movie/changes', '/3/person/changes'):
+            return 200, {'page': page, 'results': [], 'total_pages': 1}
+        match = re.fullmatch(r'/3/(movie|person)/(\d+)(/movie_credits)?', path)
+        if match:
+            kind, object_id, credits_only = match.group(1), int(match.group(2)), match.group(3)
+            ids = self.catalog.movie_ids if kind == 'movie' else self.catalog.person_ids
+            if object_id in ids:
+                if kind == 'movie':
+                    return 200, self.catalog.movie(object_id)
+                person = self.catalog.person(object_id)
+                return 200, person['movie_credits'] if credits_only else person
+        return 404, {'status_code': 34, 'status_message': 'The resource you requested could not be found.'}
+
+    def generate(self):
+        """The Ollama /api/generate reply: one question whose answer is STUB_ANSWER."""
+        self._wait(self.llm_latency)
+        quiz = {
+            'question': 'Which of these happens in the story?',
+            'options': [STUB_ANSWER, 'A wrong answer', 'Another wrong answer', 'Yet another wrong answer'],
+            'correct_answer': STUB_ANSWER,
+        }
+        return 200, {'model': 'stub', 'response': json.dumps(quiz), 'done': True}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    upstream = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.upstream.requests += 1
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        status, payload = self.upstream.get(parts.path, params)
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            return self._send(304, b'', etag)
+        self._send(status, body, etag)
+
+    def do_POST(self):
+        self.upstream.requests += 1
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urlsplit(self.path).path != '/api/generate':
+            return self._send(404, b'{}')
+        status, payload = self.upstream.generate()
+        self._send(status, json.dumps(payload).encode())
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadTestService:
+    """
+    Drives the site in-process with Django test clients, one per virtual
+    user thread, through a weighted mix of scenarios. Each HTTP request is
+    recorded as a Sample with its latency and the number of SQL queries run
+    on the request thread (background pools and fetch_parallel workers are
+    not counted). Meant to run against a throwaway database seeded by
+    seed() and upstreams from StubUpstream; see `benchmark_site`.
+    """
+
+    # scenario -> (weight, client: anonymous / user / staff)
+    SCENARIOS = {
+        'home': (25, 'anonymous'),
+        'search': (6, 'anonymous'),
+        'row_scroll': (6, 'anonymous'),
+        'browse': (5, 'anonymous'),
+        'releases': (4, 'anonymous'),
+        'movie_detail': (20, 'anonymous'),
+        'person_detail': (6, 'anonymous'),
+        'review_search': (3, 'anonymous'),
+        'favorite': (9, 'user'),
+        'watch_quiz': (7, 'user'),
+        'review': (6, 'user'),
+        'profile': (5, 'user'),
+        'export': (1, 'user'),
+        'admin_dashboard': (3, 'staff'),
+        'admin_export': (1, 'staff'),
+    }
+
+    def __init__(self, catalog, seed=0):
+        self.catalog = catalog
+        self.seed = seed
+        self.users = []
+        self.staff = None
+        self.watched = {}
+        self.samples = []
+        self.iterations = 0
+        self._lock = threading.Lock()
+
+    def seed_data(self, users=50, watched_per_user=15):
+        """Creates the staff user, `users` members and their watch history and reviews."""
+        from django.contrib.auth.models import User
+        from movies.models import Watched
+        from reviews.models import Review
+
+        rng = random.Random(self.seed)
+        self.staff = User.objects.create(username='bench_admin', is_staff=True, is_superuser=True, password='!')
+        for i in range(users):
+            user = User.objects.create(username=f'bench_user_{i}', password='!')
+            self.users.append(user)
+            # More watches than fit on one profile page, so the "Older" cursor gets used
+            self.watched[user.id] = rng.sample(self.catalog.movie_ids, min(watched_per_user, len(self.catalog.movie_ids)))
+            for n, movie_id in enumerate(self.watched[user.id]):
+                Watched.objects.create(user=user, movie_id=movie_id)
+                # Review half, leaving the rest for the review scenario
+                if n % 2 == 0:
+                    Review.objects.create(
+                        user=user, movie_id=movie_id, rating=rng.randint(1, 5),
+                        content=f"{self.catalog.title(movie_id)} was {rng.choice(['great', 'fine', 'too long'])}.",
+                    )
+
+    # ── Running ──────────────────────────────────────────────────────
+
+    def run(self, concurrency, duration=None, iterations=None, only=None):
+        """Runs `concurrency` virtual users until `duration` seconds or `iterations` scenarios. Returns elapsed seconds."""
+        from concurrent.futures import ThreadPoolExecutor
+        names = [name for name in self.SCENARIOS if not only or name in only]
+        self.samples, self.iterations = [], 0
+        deadline = time.monotonic() + duration if duration else None
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='virtual-user') as pool:
+            for future in [pool.submit(self._virtual_user, i, names, deadline, iterations) for i in range(concurrency)]:
+                future.result()
+        return time.perf_counter() - started
+
+    def wait_for_background(self, timeout=60):
+        """Lets queued prefetches, LLM generations, calendar syncs and achievement batches finish."""
+        from movies.quiz_service import _llm_pool
+        from movies.release_calendar_service import _sync_pool
+        from movies.row_service import _prefetch_pool
+        from users.achievement_service import AchievementService, _queue
+        for pool in (_prefetch_pool, _llm_pool, _sync_pool):
+            # Queues are FIFO, so once a no-op per worker has run, the backlog has been picked up
+            for future in [pool.submit(time.sleep, 0.1) for _ in range(pool._max_workers)]:
+                future.result(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while not _queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        # The batch taken off the queue last is still being evaluated
+        time.sleep(2 * AchievementService.BATCH_WAIT)
+
+    def _next_iteration(self, deadline, limit):
+        if deadline and time.monotonic() >= deadline:
+            return False
+        with self._lock:
+            if limit and self.iterations >= limit:
+                return False
+            self.iterations += 1
+            return True
+
+    def _virtual_user(self, index, names, deadline, limit):
+        from django.test import Client
+        rng = random.Random(self.seed * 1000 + index)
+        user = self.users[index % len(self.users)]
+        clients = {'anonymous': Client(raise_request_exception=False)}
+        clients['user'] = Client(raise_request_exception=False)
+        clients['user'].force_login(user)
+        clients['staff'] = Client(raise_request_exception=False)
+        clients['staff'].force_login(self.staff)
+        weights = [self.SCENARIOS[name][0] for name in names]
+        try:
+            while self._next_iteration(deadline, limit):
+                name = rng.choices(names, weights)[0]
+                getattr(self, f'_{name}')(clients[self.SCENARIOS[name][1]], rng, user)
+        finally:
+            connection.close()
+
+    def _request(self, client, endpoint, method, path, data=None, expect=None):
+        """
+        One timed request. `expect(response)` checks the body; a response that
+        fails it counts as an error, so a page that answers 200 with nothing in
+        it (a dead index, say) still shows up.
+        """
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count):
+                response = getattr(client, method)(path, data or {})
+                if response.streaming:
+                    # Exports run their queries while the body is streamed
+                    response.body = b''.join(response.streaming_content)
+            status = response.status_code
+            if status < 400 and expect and not expect(response):
+                print(f"Unexpected response from {path}")
+                status = 0
+        except Exception as e:
+            print(f"Error requesting {path}: {e}")
+            response, status = None, 0
+        self.samples.append(Sample(endpoint, status, (time.perf_counter() - started) * 1000, queries))
+        return response
+
+    # ── Scenarios ────────────────────────────────────────────────────
+
+    def _home(self, client, rng, user):
+        self._request(client, 'home', 'get', '/')
+
+    def _search(self, client, rng, user):
+        self._request(client, 'search', 'get', '/', {'q': rng.choice(TITLE_WORDS)})
+
+    def _row_scroll(self, client, rng, user):
+        row = rng.choice(['popular', 'top_rated', 'recent'])
+        for page in range(2, rng.randint(3, 5)):
+            response = self._request(client, 'row_page', 'get', f'/rows/{row}/', {'page': page})
+            if not response or response.get('X-Has-Next') != 'true':
+                break
+
+    def _browse(self, client, rng, user):
+        self._request(client, 'browse', 'get', '/browse/', {'genre': rng.choice(GENRES)[1]})
+
+    def _releases(self, client, rng, user):
+        self._request(client, 'releases', 'get', '/releases/')
+
+    def _movie_detail(self, client, rng, user):
+        self._request(client, 'movie_detail', 'get', f'/movie/{rng.choice(self.catalog.movie_ids)}/')
+
+    def _person_detail(self, client, rng, user):
+        self._request(client, 'person_detail', 'get', f'/person/{rng.choice(self.catalog.person_ids)}/')
+
+    def _review_search(self, client, rng, user):
+        # Every seeded word is in some review, so an empty result means the index is broken
+        self._request(
+            client, 'review_search', 'get', '/reviews/search/', {'q': rng.choice(['great', 'fine', 'long'])},
+            expect=lambda response: b'No reviews mention' not in response.content,
+        )
+
+    def _favorite(self, client, rng, user):
+        self._request(client, 'toggle_favorite', 'post', f'/toggle-favorite/{rng.choice(self.catalog.movie_ids)}/')
+
+    def _watch_quiz(self, client, rng, user):
+        movie_id = rng.choice(self.catalog.movie_ids)
+        response = self._request(client, 'toggle_watched', 'post', f'/toggle-watched/{movie_id}/')
+        if not response or '/quiz/' not in response.get('Location', ''):
+            # It was watched, and has just been unwatched
+            return
+        response = self._request(client, 'quiz_get', 'get', f'/quiz/{movie_id}/')
+        if not response or response.status_code != 200:
+            return
+        page = response.content.decode()
+        attempt = re.search(r'name="attempt" value="([^"]+)"', page)
+        options = {}
+        for question, value in re.findall(r'name="(question_\d+)" value="([^"]*)"', page):
+            options.setdefault(question, []).append(html.unescape(value))
+        if not attempt:
+            return
+        # AI questions come from the stub and can be answered; metadata ones are guessed
+        answers = {q: STUB_ANSWER if STUB_ANSWER in values else rng.choice(values) for q, values in options.items()}
+        self._request(client, 'quiz_submit', 'post', f'/quiz/{movie_id}/', {'attempt': attempt.group(1), **answers})
+
+    def _review(self, client, rng, user):
+        self._request(client, 'add_review', 'post', f'/movie/{rng.choice(self.watched[user.id])}/review/', {
+            'rating': rng.randint(1, 5),
+            'content': f"Load test review, {rng.choice(['great', 'fine', 'too long'])}.",
+        })
+
+    def _profile(self, client, rng, user):
+        self._request(client, 'profile', 'get', '/profile/')
+        kind = rng.choice(['watched', 'favorites'])
+        response = self._request(client, 'profile_list', 'get', f'/profile/{kind}/')
+        older = re.search(r'href="\?cursor=([^"]+)"', response.content.decode()) if response else None
+        if older:
+            self._request(client, 'profile_list', 'get', f'/profile/{kind}/', {'cursor': older.group(1)})
+
+    def _export(self, client, rng, user):
+        self._request(client, 'export', 'get', '/profile/export/', expect=lambda response: json.loads(response.body)['watched'])
+
+    def _admin_dashboard(self, client, rng, user):
+        self._request(client, 'admin_dashboard', 'get', '/admin-dashboard/')
+
+    def _admin_export(self, client, rng, user):
+        # Datasets seed_data always fills: a header (or "[") and no rows is a failure
+        dataset = rng.choice(['users', 'reviews', 'watched'])
+        self._request(
+            client, 'admin_export', 'get', f'/admin-dashboard/export/{dataset}/', {'format': rng.choice(['csv', 'json'])},
+            expect=lambda response: len(response.body.splitlines()) > 2,
+        )
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0
+    return ordered[max(0, min(len(ordered) - 1, -(-len(ordered) * p // 100) - 1))]
+
+
+def summarize(samples, elapsed):
+    """{endpoint: stats, ..., 'ALL': stats} with throughput, latency percentiles (ms) and query counts."""
+    groups = {}
+    for sample in samples:
+        groups.setdefault(sample.endpoint, []).append(sample)
+    groups['ALL'] = list(samples)
+    summary = {}
+    for endpoint, group in sorted(groups.items()):
+        if not group:
+            continue
+        ms = sorted(s.ms for s in group)
+        queries = [s.queries for s in group]
+        summary[endpoint] = {
+            'requests': len(group),
+            'errors': sum(1 for s in group if not s.status or s.status >= 500),
+            'rps': round(len(group) / elapsed, 2) if elapsed else 0,
+            'mean_ms': round(sum(ms) / len(ms), 1),
+            'p50_ms': round(percentile(ms, 50), 1),
+            'p95_ms': round(percentile(ms, 95), 1),
+            'p99_ms': round(percentile(ms, 99), 1),
+            'max_ms': round(ms[-1], 1),
+            'queries_mean': round(sum(queries) / len(queries), 1),
+            'queries_max': max(queries),
+        }
+    return summary
+
+
+def compare(current, baseline):
+    """[(endpoint, old rps, new rps, old p95, new p95, p95 change %)] for endpoints in both result sets."""
+    rows = []
+    for endpoint, new in current['endpoints'].items():
+        old = baseline.get('endpoints', {}).get(endpoint)
+        if not old:
+            continue
+        change = (new['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+        rows.append((endpoint, old['rps'], new['rps'], old['p95_ms'], new['p95_ms'], round(change, 1)))
+    return rows
@@ -0,0 +1,177 @@
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from movies.load_test_service import LoadTestService, StubCatalog, StubUpstream, compare, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "End-to-end load test: run a weighted mix of anonymous browsing, detail pages, favorites, quizzes, "
+        "reviews and admin dashboard loads against local stub TMDB/Ollama servers and a throwaway database, "
+        "and report throughput, p50/p95/p99 and SQL queries per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=8, help="Concurrent virtual users (threads).")
+        parser.add_argument('--duration', type=float, default=30, help="Seconds to measure for.")
+        parser.add_argument(
+            '--iterations', type=int, metavar='N',
+            help="Stop after N scenarios in total instead of after --duration.",
+        )
+        parser.add_argument('--warmup', type=float, default=5, help="Seconds of unmeasured traffic first, to fill caches.")
+        parser.add_argument(
+            '--only', metavar='SCENARIOS',
+            help=f"Comma-separated scenarios to run (default all): {', '.join(LoadTestService.SCENARIOS)}.",
+        )
+        parser.add_argument('--catalog', type=int, default=500, help="Stub TMDB catalog size (movies).")
+        parser.add_argument('--people', type=int, default=200, help="Stub TMDB people.")
+        parser.add_argument('--members', type=int, default=50, help="Seeded site users (each with watches and reviews).")
+        parser.add_argument('--upstream-latency', type=float, default=30, help="Stub TMDB latency in ms (±50%%).")
+        parser.add_argument('--llm-latency', type=float, default=800, help="Stub Ollama latency in ms (±50%%).")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed for the data and the scenario mix.")
+        parser.add_argument('--output', metavar='FILE', help="Write the results as JSON, for --compare on a later run.")
+        parser.add_argument('--compare', metavar='FILE', help="Show p95 and throughput changes against an earlier --output.")
+        parser.add_argument(
+            '--max-regression', type=float, metavar='PCT',
+            help="With --compare, fail if any endpoint's p95 grew by more than PCT percent.",
+        )
+        parser.add_argument('--verbose-app', action='store_true', help="Keep the app's own prints (hidden by default).")
+
+    def handle(self, *args, **options):
+        only = set(options['only'].split(',')) if options['only'] else None
+        unknown = (only or set()) - set(LoadTestService.SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        catalog = StubCatalog(movies=options['catalog'], people=options['people'])
+        upstream = StubUpstream(
+            catalog, latency=options['upstream_latency'], llm_latency=options['llm_latency']
+        ).start()
+        self.stdout.write(f"Stub TMDB/Ollama on {upstream.url}; creating the benchmark database...")
+
+        environ = {'TMDB_API_KEY': 'stub', 'TMDB_API_URL': upstream.tmdb_url, 'OLLAMA_API_URL': upstream.ollama_url}
+        saved_environ = {name: os.environ.get(name) for name in environ}
+        old_name = self._create_database()
+        try:
+            os.environ.update(environ)
+            # Own cache (a shared Redis is never touched), no rate limiting, real HTTP to the stubs
+            with override_settings(
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-site'}},
+                RATE_LIMITS={scope: (10 ** 9, window) for scope, (_, window) in settings.RATE_LIMITS.items()},
+                HTTP_TRANSPORT='live',
+                DEBUG=False,
+            ):
+                results = self._run(catalog, upstream, only, options)
+        finally:
+            for name, value in saved_environ.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            upstream.stop()
+
+        self._report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if baseline:
+            self._compare(results, baseline, options['max_regression'])
+
+    def _create_database(self):
+        if connection.vendor == 'sqlite':
+            # Virtual users run in threads, which can't share the default in-memory test database
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+            connection.settings_dict['OPTIONS'].setdefault('timeout', 30)
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name
+
+    def _run(self, catalog, upstream, only, options):
+        service = LoadTestService(catalog, seed=options['seed'])
+        app_output = contextlib.nullcontext() if options['verbose_app'] else contextlib.redirect_stdout(open(os.devnull, 'w'))
+        with app_output:
+            service.seed_data(users=options['members'])
+            if options['warmup']:
+                service.run(options['users'], duration=options['warmup'], only=only)
+            upstream.requests = 0
+            elapsed = service.run(
+                options['users'],
+                duration=None if options['iterations'] else options['duration'],
+                iterations=options['iterations'],
+                only=only,
+            )
+            # Background work must not outlive the database
+            service.wait_for_background()
+        return {
+            'meta': {
+                'finished_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'commit': self._commit(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'argv': sys.argv[1:],
+                'options': {k: options[k] for k in (
+                    'users', 'duration', 'iterations', 'warmup', 'only', 'catalog', 'people', 'members',
+                    'upstream_latency', 'llm_latency', 'seed',
+                )},
+            },
+            'elapsed_s': round(elapsed, 2),
+            'iterations': service.iterations,
+            'upstream_requests': upstream.requests,
+            'endpoints': summarize(service.samples, elapsed),
+        }
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    def _report(self, results):
+        self.stdout.write(
+            f"\n{results['iterations']} scenarios in {results['elapsed_s']}s "
+            f"({results['upstream_requests']} upstream requests)\n"
+        )
+        self.stdout.write(
+            f"{'endpoint':<18}{'reqs':>7}{'errors':>7}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}"
+        )
+        for endpoint, stats in results['endpoints'].items():
+            line = (
+                f"{endpoint:<18}{stats['requests']:>7}{stats['errors']:>7}{stats['rps']:>8}"
+                f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['queries_mean']:>9}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['errors'] else line)
+
+    def _compare(self, results, baseline, max_regression):
+        self.stdout.write(f"\nAgainst {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta'].get('finished_at')}):")
+        self.stdout.write(f"{'endpoint':<18}{'rps':>16}{'p95 ms':>20}{'change':>9}")
+        regressions = []
+        for endpoint, old_rps, new_rps, old_p95, new_p95, change in compare(results, baseline):
+            line = f"{endpoint:<18}{f'{old_rps} -> {new_rps}':>16}{f'{old_p95} -> {new_p95}':>20}{f'{change:+}%':>9}"
+            if max_regression is not None and change > max_regression:
+                regressions.append(endpoint)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"p95 regressed more than {max_regression}% on: {', '.join(regressions)}")
@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.browse_service import BrowseService
+from movies.models import Movie
+from movies.services import TMDBService
+
+GENRES = ['Action', 'Comedy', 'Drama', 'Romance', 'Thriller', 'Horror', 'Family', 'Crime', 'Fantasy', 'History']
+PROVIDERS = ['Aha', 'Netflix', 'Amazon Prime Video', 'Disney Plus Hotstar', 'Zee5', 'Sun Nxt', 'ETV Win']
+
+
+class Command(BaseCommand):
+    help = "Rebuild the faceted browse index (genre / year / rating / provider) from the local catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fetch-missing', type=int, default=0, metavar='N',
+            help="First fetch TMDB details for up to N catalog movies with no details or language mirrored yet.",
+        )
+        parser.add_argument(
+            '--benchmark', type=int, metavar='N',
+            help="Instead, time queries over N synthetic movies (seeded in a transaction that is rolled back).",
+        )
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options['benchmark'])
+
+        if options['fetch_missing']:
+            from django.db.models import Q
+            tmdb = TMDBService()
+            missing = (
+                Movie.objects.filter(Q(details=None) | Q(original_language=None))
+                .values_list('id', flat=True)[:options['fetch_missing']]
+            )
+            fetched = sum(1 for movie_id in missing if tmdb.get_movie_details(movie_id))
+            self.stdout.write(f"Fetched details for {fetched} movies.")
+
+        started = time.perf_counter()
+        index = BrowseService().build()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index['cards'])} movies ({len(index['genres'])} genres, "
+            f"{len(index['providers'])} providers) in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def benchmark(self, n_movies):
+        rng = random.Random(3)
+        service = BrowseService()
+        with transaction.atomic():
+            first_id = (Movie.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+            for start in range(0, n_movies, 5000):
+                Movie.objects.bulk_create([
+                    Movie(
+                        id=first_id + i,
+                        title=f'Bench Movie {i}',
+                        release_date=f'{rng.randint(1960, 2026)}-{rng.randint(1, 12):02d}-01',
+                        rating=round(rng.uniform(2, 9.5), 1),
+                        original_language='te' if rng.random() < 0.8 else rng.choice(['ta', 'hi', 'ml']),
+                        details={
+                            'genres': rng.sample(GENRES, rng.randint(1, 3)),
+                            'providers': {'stream': [{'name': p} for p in rng.sample(PROVIDERS, rng.randint(0, 2))]},
+                        },
+                    )
+                    for i in range(start, min(start + 5000, n_movies))
+                ])
+            started = time.perf_counter()
+            index = service.build()
+            self.stdout.write(f"Built index over {len(index['cards'])} movies in {time.perf_counter() - started:.1f}s.")
+
+            queries = [
+                ("no filters, page 1", {}),
+                ("no filters, page 500", {'page': 500}),
+                ("Action + Comedy", {'genres': ['Action', 'Comedy']}),
+                ("Thriller, 2015-2024, 7+", {'genres': ['Thriller'], 'year_from': 2015, 'year_to': 2024, 'min_rating': 7}),
+                ("Aha or Netflix, top rated, page 40", {'providers': ['Aha', 'Netflix'], 'sort': 'rating', 'page': 40}),
+                ("everything, all languages, A-Z", {
+                    'genres': ['Drama'], 'providers': ['Zee5'], 'year_from': 1990, 'min_rating': 6,
+                    'language': 'all', 'sort': 'title', 'page': 3,
+                }),
+            ]
+            for label, query in queries:
+                runs = []
+                for _ in range(5):
+                    started = time.perf_counter()
+                    result = service.search(**query)
+                    runs.append(time.perf_counter() - started)
+                self.stdout.write(
+                    f"  {label:<40} {statistics.median(runs) * 1000:7.1f} ms  ({result['total']} matches)"
+                )
+            transaction.set_rollback(True)
+        # The benchmark index was shared through the cache; put the real one back
+        service.build()
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.recommendation_service import RecommendationService
+
+
+class Command(BaseCommand):
+    help = "Precompute the personalised \"For You\" home row for recently active users."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Users active within this many days get a row.")
+        parser.add_argument('--size', type=int, default=20, help="Movies stored per user.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = RecommendationService().build_for_you(days=options['days'], size=options['size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored For You rows for {written} users in {time.perf_counter() - started:.1f}s."
+        ))
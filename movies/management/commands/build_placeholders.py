@@ -0,0 +1,105 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from movies.models import Movie
+from movies.placeholder_service import PlaceholderService
+from users.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Precompute inline blur placeholders for every poster/backdrop in the local catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', action='store_true', help="Recompute placeholders that already exist.")
+        parser.add_argument('--limit', type=int, help="Process at most this many movies.")
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument(
+            '--benchmark', metavar='DIR',
+            help="Only encode the local images in DIR and report throughput; nothing is saved.",
+        )
+
+    def handle(self, *args, **options):
+        service = PlaceholderService()
+        if options['benchmark']:
+            return self.benchmark(service, Path(options['benchmark']))
+
+        movies = Movie.objects.all()
+        if not options['refresh']:
+            movies = movies.filter(
+                Q(poster_url__isnull=False, poster_placeholder__isnull=True)
+                | Q(backdrop_url__isnull=False, backdrop_placeholder__isnull=True)
+            )
+        movies = movies.order_by('id')
+        if options['limit']:
+            movies = movies[:options['limit']]
+
+        started = time.perf_counter()
+        done = 0
+        batch = []
+        for movie in movies.iterator(chunk_size=options['batch_size']):
+            batch.append(movie)
+            if len(batch) >= options['batch_size']:
+                done += self.process(service, batch, options)
+                batch = []
+        if batch:
+            done += self.process(service, batch, options)
+
+        banners = self.fill_banners()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {done} placeholders in {elapsed:.1f}s; updated {banners} profile banners."
+        ))
+
+    def process(self, service, movies, options):
+        jobs = []
+        for movie in movies:
+            if movie.poster_url and (options['refresh'] or not movie.poster_placeholder):
+                jobs.append(((movie.id, 'poster_placeholder'), movie.poster_url, 'poster'))
+            if movie.backdrop_url and (options['refresh'] or not movie.backdrop_placeholder):
+                jobs.append(((movie.id, 'backdrop_placeholder'), movie.backdrop_url, 'backdrop'))
+
+        results = service.build(jobs, workers=options['workers'])
+        by_id = {movie.id: movie for movie in movies}
+        for (movie_id, field), uri in results.items():
+            setattr(by_id[movie_id], field, uri)
+        Movie.objects.bulk_update(movies, ['poster_placeholder', 'backdrop_placeholder'])
+        return len(results)
+
+    def fill_banners(self):
+        profiles = list(
+            Profile.objects.filter(banner_url__isnull=False, banner_placeholder__isnull=True)
+        )
+        placeholders = dict(
+            Movie.objects.filter(
+                backdrop_url__in=[p.banner_url for p in profiles], backdrop_placeholder__isnull=False
+            ).values_list('backdrop_url', 'backdrop_placeholder')
+        )
+        updated = [p for p in profiles if p.banner_url in placeholders]
+        for profile in updated:
+            profile.banner_placeholder = placeholders[profile.banner_url]
+        Profile.objects.bulk_update(updated, ['banner_placeholder'])
+        return len(updated)
+
+    def benchmark(self, service, directory):
+        paths = sorted(
+            p for p in directory.iterdir()
+            if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp')
+        )
+        if not paths:
+            self.stderr.write(f"No images found in {directory}")
+            return
+
+        started = time.perf_counter()
+        total_bytes = 0
+        for path in paths:
+            total_bytes += len(service.encode(path))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{len(paths)} images in {elapsed:.2f}s "
+            f"({len(paths) / elapsed:.0f} images/s, avg {total_bytes // len(paths)} bytes per data URI)"
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from movies.models import Movie
+from movies.provider_index_service import ProviderIndexService
+from movies.services import TMDBService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the provider -> movies index (\"New on Aha\", \"Telugu on Netflix\") from mirrored details."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--refresh', type=int, default=0, metavar='N',
+            help="Instead, revalidate TMDB details for the N movies checked longest ago; "
+                 "provider changes are applied to the index as they come in.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['refresh']:
+            tmdb = TMDBService()
+            stale = (
+                Movie.objects.exclude(details=None)
+                .order_by(F('details_checked_at').asc(nulls_first=True), 'updated_at')
+                .values_list('id', flat=True)[:options['refresh']]
+            )
+            fetched = sum(1 for movie_id in stale if tmdb.get_movie_details(movie_id, refresh=True))
+            self.stdout.write(self.style.SUCCESS(
+                f"Refreshed details for {fetched} movies in {time.perf_counter() - started:.1f}s."
+            ))
+            return
+        written = ProviderIndexService().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {written} provider offers in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,85 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.models import Movie
+from movies.recommendation_service import RecommendationService
+from movies.services import TMDBService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed \"You Might Also Like\" neighbours."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', choices=['collab', 'content', 'all'], default='all',
+            help="collab: from Watched/Favorite/Review. content: from genres, cast, directors and era.",
+        )
+        parser.add_argument('--top-k', type=int, default=20, help="Neighbours stored per movie.")
+        parser.add_argument('--min-support', type=int, default=2, help="Users that must share a pair of movies (collab).")
+        parser.add_argument('--min-neighbors', type=int, default=4, help="Skip movies with fewer neighbours than this.")
+        parser.add_argument('--full', action='store_true', help="Rebuild the whole content index instead of only changed movies.")
+        parser.add_argument(
+            '--fetch-missing', type=int, default=0, metavar='N',
+            help="First fetch TMDB details for up to N catalog movies that have none mirrored yet.",
+        )
+        parser.add_argument(
+            '--benchmark', metavar='SIZES',
+            help="Time the content index build on synthetic catalogs, e.g. 1000,5000,20000. Nothing is saved.",
+        )
+
+    def handle(self, *args, **options):
+        service = RecommendationService()
+        if options['benchmark']:
+            return self.benchmark(service, [int(n) for n in options['benchmark'].split(',')], options['top_k'])
+
+        if options['fetch_missing']:
+            tmdb = TMDBService()
+            missing = Movie.objects.filter(details=None).values_list('id', flat=True)[:options['fetch_missing']]
+            fetched = sum(1 for movie_id in missing if tmdb.get_movie_details(movie_id))
+            self.stdout.write(f"Fetched details for {fetched} movies.")
+
+        if options['source'] in ('collab', 'all'):
+            started = time.perf_counter()
+            written = service.build_collaborative(
+                top_k=options['top_k'],
+                min_support=options['min_support'],
+                min_neighbors=options['min_neighbors'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Collaborative: stored neighbours for {written} movies in {time.perf_counter() - started:.1f}s."
+            ))
+
+        if options['source'] in ('content', 'all'):
+            started = time.perf_counter()
+            written = service.build_content(
+                full=options['full'],
+                top_k=options['top_k'],
+                min_neighbors=options['min_neighbors'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Content: stored neighbours for {written} movies in {time.perf_counter() - started:.1f}s."
+            ))
+
+    def benchmark(self, service, sizes, top_k):
+        rng = random.Random(42)
+        genres = ['Action', 'Comedy', 'Drama', 'Romance', 'Thriller', 'Horror', 'Family', 'Crime', 'Fantasy']
+        for size in sizes:
+            # Rough shape of a regional catalog: few directors per film, a shared pool of actors
+            directors = max(1, size // 8)
+            actors = max(8, size // 3)
+            features = [
+                service.content_features(
+                    rng.sample(genres, rng.randint(1, 3)),
+                    [{'id': rng.randrange(directors)}],
+                    [{'id': rng.randrange(actors)} for _ in range(service.TOP_BILLED)],
+                    f"{rng.randint(1960, 2026)}-01-01",
+                )
+                for _ in range(size)
+            ]
+            started = time.perf_counter()
+            matrix = service.content_matrix(features)
+            rows = sum(1 for _ in service.content_neighbors(matrix, list(range(size)), top_k=top_k))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{size:>8} movies: {elapsed:7.2f}s ({rows} rows, {size / elapsed:.0f} movies/s)")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.cache_service import CacheService
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalidate cached TMDB data: a tag (movie:<id>, person:<id>, row:home, row:search, row:genre) "
+        "drops every entry carrying it, a namespace name drops the whole namespace."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', metavar='TARGET', help="Tags or namespace names.")
+        parser.add_argument('--list', action='store_true', help="List the registered namespaces.")
+
+    def handle(self, *args, **options):
+        service = CacheService()
+        if options['list'] or not options['targets']:
+            for name, spec in service.namespaces():
+                self.stdout.write(f"{name:<16} v{spec.version}  {spec.timeout:>7}s  {spec.description}")
+            return
+        for target in options['targets']:
+            try:
+                service.invalidate(target)
+            except (KeyError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Invalidated {target}."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.interaction_service import InteractionService
+
+
+class Command(BaseCommand):
+    help = "Recreate movies.Interaction from the Watched/Favorite/Review tables."
+
+    def handle(self, *args, **options):
+        written = InteractionService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} interactions."))
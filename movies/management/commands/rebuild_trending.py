@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.trending_service import TrendingService
+
+
+class Command(BaseCommand):
+    help = "Recompute the decayed trending scores by replaying all Watched/Favorite/Review history."
+
+    def handle(self, *args, **options):
+        scored = TrendingService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Scored {scored} movies."))
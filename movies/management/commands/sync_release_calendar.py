@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from movies.release_calendar_service import ReleaseCalendarService
+
+
+class Command(BaseCommand):
+    help = "Sync Telugu releases around today from TMDB and precompute the release calendar windows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days-back', type=int, default=ReleaseCalendarService.DAYS_BACK,
+            help="Sync releases from this many days ago.",
+        )
+        parser.add_argument(
+            '--days-ahead', type=int, default=ReleaseCalendarService.DAYS_AHEAD,
+            help="Sync announced releases up to this many days ahead.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        service = ReleaseCalendarService()
+        synced = service.sync(days_back=options['days_back'], days_ahead=options['days_ahead'])
+        buckets = service.buckets()
+        counts = ', '.join(f"{len(buckets[window])} {window.replace('_', ' ')}" for window in service.WINDOWS)
+        self.stdout.write(self.style.SUCCESS(
+            f"Synced {synced} releases in {time.perf_counter() - started:.1f}s ({counts})."
+        ))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.change_tracking_service import ChangeTrackingService
+
+
+class Command(BaseCommand):
+    help = "Read TMDB's movie and person change feeds so unchanged details are reused without a request."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        service = ChangeTrackingService()
+        stamped = service.sync()
+        if stamped is None:
+            raise CommandError("Could not read the TMDB change feeds (is TMDB_API_KEY set?); nothing recorded.")
+        coverage = service.coverage()
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {stamped['movie']} movies and {stamped['person']} people as changed in "
+            f"{time.perf_counter() - started:.1f}s; changes recorded since {coverage['since']:%Y-%m-%d %H:%M}."
+        ))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_favorite_poster_url_favorite_title_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Movie',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('poster_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('backdrop_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('release_date', models.CharField(blank=True, max_length=10, null=True)),
+                ('poster_placeholder', models.TextField(blank=True, null=True)),
+                ('backdrop_placeholder', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
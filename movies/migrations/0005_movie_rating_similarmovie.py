@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SimilarMovie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie_id', models.IntegerField()),
+                ('source', models.CharField(choices=[('collab', 'People who watched this also watched')], max_length=10)),
+                ('neighbors', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('movie_id', 'source')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_rating_similarmovie'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='details',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='similarmovie',
+            name='source',
+            field=models.CharField(choices=[('collab', 'People who watched this also watched'), ('content', 'Shared genres, cast and directors')], max_length=10),
+        ),
+    ]
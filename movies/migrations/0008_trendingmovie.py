@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_userrecommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingMovie',
+            fields=[
+                ('movie_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('log_score', models.FloatField(db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
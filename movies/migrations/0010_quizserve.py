@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_quizattempt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizServe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie_id', models.IntegerField()),
+                ('tier', models.CharField(choices=[('bank', 'Quiz bank'), ('llm', 'LLM within budget'), ('metadata', 'Metadata fallback'), ('unavailable', 'Nothing to serve')], max_length=12)),
+                ('latency_ms', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
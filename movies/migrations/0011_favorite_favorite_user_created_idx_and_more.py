@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0010_quizserve"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favorite",
+            index=models.Index(
+                fields=["user", "created_at"], name="favorite_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="watched",
+            index=models.Index(
+                fields=["user", "created_at"], name="watched_user_created_idx"
+            ),
+        ),
+    ]
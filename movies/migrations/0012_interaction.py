@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    Interaction = apps.get_model("movies", "Interaction")
+    Movie = apps.get_model("movies", "Movie")
+    sources = [
+        (apps.get_model("movies", "Watched"), 1, "watched_at"),
+        (apps.get_model("movies", "Favorite"), 2, "favorited_at"),
+        (apps.get_model("reviews", "Review"), 4, "reviewed_at"),
+    ]
+    rows = {}
+    for model, flag, field in sources:
+        for user_id, movie_id, at in model.objects.values_list(
+            "user_id", "movie_id", "created_at"
+        ).iterator():
+            row = rows.get((user_id, movie_id))
+            if row is None:
+                row = rows[(user_id, movie_id)] = Interaction(
+                    user_id=user_id, movie_id=movie_id, flags=0, created_at=at
+                )
+            row.flags |= flag
+            setattr(row, field, at)
+            row.created_at = min(row.created_at, at)
+    Interaction.objects.bulk_create(rows.values(), batch_size=1000)
+
+    # Titles/posters copied onto Favorite/Watched rows belong on Movie
+    movies = {}
+    for model, _, _ in sources[:2]:
+        for movie_id, title, poster_url in model.objects.exclude(
+            title=None
+        ).values_list("movie_id", "title", "poster_url"):
+            movies.setdefault(
+                movie_id, Movie(id=movie_id, title=title, poster_url=poster_url)
+            )
+    Movie.objects.bulk_create(movies.values(), batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0011_favorite_favorite_user_created_idx_and_more"),
+        ("reviews", "0004_review_review_user_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Interaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("movie_id", models.IntegerField()),
+                ("flags", models.PositiveSmallIntegerField(default=0)),
+                ("watched_at", models.DateTimeField(blank=True, null=True)),
+                ("favorited_at", models.DateTimeField(blank=True, null=True)),
+                ("reviewed_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created_at", "movie_id", "flags"],
+                        name="interaction_user_created_idx",
+                    ),
+                    models.Index(
+                        fields=["movie_id", "flags", "user"],
+                        name="interaction_movie_idx",
+                    ),
+                ],
+                "unique_together": {("user", "movie_id")},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0012_interaction"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                django.db.models.functions.text.Lower("title"),
+                name="movie_title_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0013_movie_title_lower_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movie",
+            name="original_language",
+            field=models.CharField(blank=True, max_length=8, null=True),
+        ),
+    ]
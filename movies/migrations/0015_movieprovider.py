@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0014_movie_original_language"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MovieProvider",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("provider", models.SlugField(max_length=60)),
+                ("provider_name", models.CharField(max_length=100)),
+                (
+                    "provider_logo",
+                    models.URLField(blank=True, max_length=500, null=True),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("stream", "Streaming"), ("rent", "Rent / buy")],
+                        max_length=6,
+                    ),
+                ),
+                ("movie_id", models.IntegerField()),
+                ("title", models.CharField(blank=True, max_length=255, null=True)),
+                ("poster_url", models.URLField(blank=True, max_length=500, null=True)),
+                (
+                    "release_date",
+                    models.CharField(blank=True, max_length=10, null=True),
+                ),
+                (
+                    "original_language",
+                    models.CharField(blank=True, max_length=8, null=True),
+                ),
+                ("popularity", models.FloatField(default=0)),
+                ("community_rating", models.FloatField(default=0)),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("first_seen_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "provider",
+                            "kind",
+                            "-first_seen_at",
+                            "-movie_id",
+                            "original_language",
+                        ],
+                        name="provider_new_idx",
+                    ),
+                    models.Index(
+                        fields=[
+                            "provider",
+                            "kind",
+                            "-popularity",
+                            "-movie_id",
+                            "original_language",
+                        ],
+                        name="provider_popular_idx",
+                    ),
+                    models.Index(
+                        fields=[
+                            "provider",
+                            "kind",
+                            "-community_rating",
+                            "-movie_id",
+                            "original_language",
+                        ],
+                        name="provider_community_idx",
+                    ),
+                    models.Index(fields=["movie_id"], name="provider_movie_idx"),
+                ],
+                "unique_together": {("provider", "kind", "movie_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0015_movieprovider"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Release",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("movie_id", models.IntegerField(unique=True)),
+                ("title", models.CharField(max_length=255)),
+                ("poster_url", models.URLField(blank=True, max_length=500, null=True)),
+                ("release_date", models.DateField()),
+                ("popularity", models.FloatField(default=0)),
+                ("rating", models.FloatField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["release_date", "-popularity"], name="release_date_idx"
+                    )
+                ],
+            },
+        ),
+    ]
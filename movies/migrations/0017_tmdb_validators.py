@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0016_release"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Person",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(blank=True, max_length=255, null=True)),
+                ("details", models.JSONField(blank=True, null=True)),
+                (
+                    "details_etag",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                (
+                    "details_last_modified",
+                    models.CharField(blank=True, max_length=64, null=True),
+                ),
+                ("details_checked_at", models.DateTimeField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="changed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="details_checked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="details_etag",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="details_last_modified",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
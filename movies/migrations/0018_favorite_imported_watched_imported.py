@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0017_tmdb_validators"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="favorite",
+            name="imported",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="watched",
+            name="imported",
+            field=models.BooleanField(default=False),
+        ),
+    ]
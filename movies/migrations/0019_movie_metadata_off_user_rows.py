@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_to_movie(apps, schema_editor):
+    # Rows saved since 0012 still carry a title/poster; keep them on Movie
+    Movie = apps.get_model("movies", "Movie")
+    movies = {}
+    for name in ("Watched", "Favorite"):
+        model = apps.get_model("movies", name)
+        for movie_id, title, poster_url in model.objects.exclude(
+            title=None
+        ).values_list("movie_id", "title", "poster_url"):
+            movies.setdefault(
+                movie_id, Movie(id=movie_id, title=title, poster_url=poster_url)
+            )
+    Movie.objects.bulk_create(movies.values(), batch_size=1000, ignore_conflicts=True)
+    for movie in Movie.objects.filter(id__in=movies, title=None):
+        movie.title = movies[movie.id].title
+        movie.poster_url = movie.poster_url or movies[movie.id].poster_url
+        movie.save(update_fields=["title", "poster_url"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0018_favorite_imported_watched_imported"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_to_movie, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="favorite",
+            name="poster_url",
+        ),
+        migrations.RemoveField(
+            model_name="favorite",
+            name="title",
+        ),
+        migrations.RemoveField(
+            model_name="watched",
+            name="poster_url",
+        ),
+        migrations.RemoveField(
+            model_name="watched",
+            name="title",
+        ),
+        migrations.AddIndex(
+            model_name="interaction",
+            index=models.Index(
+                fields=["user", "favorited_at"], name="interaction_user_fav_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interaction",
+            index=models.Index(
+                fields=["user", "watched_at"], name="interaction_user_watched_idx"
+            ),
+        ),
+    ]
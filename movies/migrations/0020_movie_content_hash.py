@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movies", "0019_movie_metadata_off_user_rows"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="movie",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
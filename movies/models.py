@@ -1,28 +1,282 @@
+import uuid
+
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 
 class Favorite(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     movie_id = models.IntegerField()
-    title = models.CharField(max_length=255, blank=True, null=True)
-    poster_url = models.URLField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # From a history import: created_at is the user's own claim, so no badges or rankings from it
+    imported = models.BooleanField(default=False)
 
     class Meta:
         unique_together = ('user', 'movie_id')
+        indexes = [models.Index(fields=['user', 'created_at'], name='favorite_user_created_idx')]
 
     def __str__(self):
-        return f'{self.user.username} - {self.title or self.movie_id}'
+        return f'{self.user.username} - {self.movie_id}'
 
 class Watched(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     movie_id = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # From a history import: created_at is the user's own claim, so no badges or rankings from it
+    imported = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('user', 'movie_id')
+        indexes = [models.Index(fields=['user', 'created_at'], name='watched_user_created_idx')]
+
+    def __str__(self):
+        return f'{self.user.username} - Watched {self.movie_id}'
+
+class Movie(models.Model):
+    # Local mirror of the TMDB titles we have fetched. The primary key is the
+    # TMDB ID so it lines up with the movie_id columns on the other tables.
+    id = models.IntegerField(primary_key=True)
     title = models.CharField(max_length=255, blank=True, null=True)
     poster_url = models.URLField(max_length=500, blank=True, null=True)
+    backdrop_url = models.URLField(max_length=500, blank=True, null=True)
+    release_date = models.CharField(max_length=10, blank=True, null=True)
+    rating = models.FloatField(blank=True, null=True)
+    original_language = models.CharField(max_length=8, blank=True, null=True)
+    # Processed get_movie_details() payload (cast, directors, genres, ...) minus the similar rail
+    details = models.JSONField(blank=True, null=True)
+
+    # Tiny inline data URIs painted while the real TMDB images load
+    poster_placeholder = models.TextField(blank=True, null=True)
+    backdrop_placeholder = models.TextField(blank=True, null=True)
+
+    # HTTP validators of the details response and when it was last confirmed
+    # current; changed_at is set when TMDB's change feed lists the movie
+    details_etag = models.CharField(max_length=255, blank=True, null=True)
+    details_last_modified = models.CharField(max_length=64, blank=True, null=True)
+    details_checked_at = models.DateTimeField(blank=True, null=True)
+    changed_at = models.DateTimeField(blank=True, null=True)
+    # Fingerprint of the content-similarity features the last index build saw
+    content_hash = models.CharField(max_length=32, blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Case-insensitive title lookups when matching imported watch histories
+        indexes = [models.Index(Lower('title'), name='movie_title_lower_idx')]
+
+    def __str__(self):
+        return self.title or str(self.id)
+
+class Person(models.Model):
+    # Local mirror of the people we have fetched, so an expired cache entry can
+    # be revalidated with TMDB instead of downloaded again. Same validator
+    # columns as Movie.
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=255, blank=True, null=True)
+    # Processed get_person_details() payload
+    details = models.JSONField(blank=True, null=True)
+    details_etag = models.CharField(max_length=255, blank=True, null=True)
+    details_last_modified = models.CharField(max_length=64, blank=True, null=True)
+    details_checked_at = models.DateTimeField(blank=True, null=True)
+    changed_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name or str(self.id)
+
+class SimilarMovie(models.Model):
+    # Precomputed neighbours for the "You Might Also Like" rail, one row per
+    # movie and source so serving is a single indexed read.
+    COLLABORATIVE = 'collab'
+    CONTENT = 'content'
+    SOURCE_CHOICES = [
+        (COLLABORATIVE, 'People who watched this also watched'),
+        (CONTENT, 'Shared genres, cast and directors'),
+    ]
+    # Order the rail prefers them in
+    SOURCE_PRIORITY = [COLLABORATIVE, CONTENT]
+
+    movie_id = models.IntegerField()
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    # [{'id', 'title', 'poster_url', 'poster_placeholder', 'release_date', 'rating', 'score'}, ...] best first
+    neighbors = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('movie_id', 'source')
+
+    def __str__(self):
+        return f'{self.movie_id} - {self.source} ({len(self.neighbors)})'
+
+class UserRecommendation(models.Model):
+    # Precomputed "For You" row; one row per active user, read with a single lookup on home
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # [{'id', 'title', 'poster_url', 'poster_placeholder', 'release_date', 'rating'}, ...] best first
+    movies = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.user.username} - For You ({len(self.movies)})'
+
+class TrendingMovie(models.Model):
+    # Exponentially decayed activity per movie, kept in log space relative to
+    # TrendingService.EPOCH so an event is one O(1) update and ranking by
+    # log_score needs no decay at all. See movies/trending_service.py.
+    movie_id = models.IntegerField(primary_key=True)
+    log_score = models.FloatField(db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.movie_id} - {self.log_score:.2f}'
+
+class QuizAttempt(models.Model):
+    # Quiz shown before a movie can be marked as watched. Only hashes of the
+    # correct answers are stored (see QuizService.hash_answer).
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    movie_id = models.IntegerField()
+    # [{'question', 'options'}, ...]
+    questions = models.JSONField()
+    answer_hashes = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'movie_id'])]
+
+    def __str__(self):
+        return f'{self.user.username} - Quiz {self.movie_id}'
+
+class QuizServe(models.Model):
+    # One row per freshly served quiz, for tracking the latency SLO per tier
+    BANK = 'bank'
+    LLM = 'llm'
+    METADATA = 'metadata'
+    UNAVAILABLE = 'unavailable'
+    TIER_CHOICES = [
+        (BANK, 'Quiz bank'),
+        (LLM, 'LLM within budget'),
+        (METADATA, 'Metadata fallback'),
+        (UNAVAILABLE, 'Nothing to serve'),
+    ]
+
+    movie_id = models.IntegerField()
+    tier = models.CharField(max_length=12, choices=TIER_CHOICES)
+    latency_ms = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.movie_id} - {self.tier} ({self.latency_ms} ms)'
+
+class Interaction(models.Model):
+    # Everything one user has done with one movie, in a single row. Favorite,
+    # Watched and Review stay the tables we write to; movies/signals.py keeps
+    # this in step so hot reads need one indexed lookup instead of three.
+    # Titles and posters come from Movie, not from here or the per-kind rows.
+    WATCHED = 1
+    FAVORITE = 2
+    REVIEWED = 4
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    movie_id = models.IntegerField()
+    flags = models.PositiveSmallIntegerField(default=0)
+    watched_at = models.DateTimeField(blank=True, null=True)
+    favorited_at = models.DateTimeField(blank=True, null=True)
+    reviewed_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField()  # First interaction
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         unique_together = ('user', 'movie_id')
+        indexes = [
+            # Trailing columns make these covering for "a user's movies" and
+            # "who did what with a movie" without touching the table
+            models.Index(fields=['user', 'created_at', 'movie_id', 'flags'], name='interaction_user_created_idx'),
+            models.Index(fields=['movie_id', 'flags', 'user'], name='interaction_movie_idx'),
+            # Profile pages: a user's favorites / watched, newest first
+            models.Index(fields=['user', 'favorited_at'], name='interaction_user_fav_idx'),
+            models.Index(fields=['user', 'watched_at'], name='interaction_user_watched_idx'),
+        ]
+
+    @property
+    def is_watched(self):
+        return bool(self.flags & self.WATCHED)
+
+    @property
+    def is_favorite(self):
+        return bool(self.flags & self.FAVORITE)
+
+    @property
+    def is_reviewed(self):
+        return bool(self.flags & self.REVIEWED)
+
+    def __str__(self):
+        return f'{self.user.username} - {self.movie_id} ({self.flags})'
+
+class MovieProvider(models.Model):
+    # "Where to watch" turned around: one row per movie currently offered by a
+    # provider in India. Title, poster and the sort columns are copied here so a
+    # provider page ("New on Aha", "Telugu on Netflix") is one indexed read.
+    # Kept in step by ProviderIndexService as movie details are (re)fetched.
+    STREAM = 'stream'
+    RENT = 'rent'
+    KIND_CHOICES = [(STREAM, 'Streaming'), (RENT, 'Rent / buy')]
+
+    provider = models.SlugField(max_length=60)
+    provider_name = models.CharField(max_length=100)
+    provider_logo = models.URLField(max_length=500, blank=True, null=True)
+    kind = models.CharField(max_length=6, choices=KIND_CHOICES)
+    movie_id = models.IntegerField()
+    title = models.CharField(max_length=255, blank=True, null=True)
+    poster_url = models.URLField(max_length=500, blank=True, null=True)
+    release_date = models.CharField(max_length=10, blank=True, null=True)
+    original_language = models.CharField(max_length=8, blank=True, null=True)
+    popularity = models.FloatField(default=0)
+    # Average of our own reviews, 0 until the movie has any
+    community_rating = models.FloatField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    # When we first saw the movie on this provider ("New on ...")
+    first_seen_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('provider', 'kind', 'movie_id')
+        # One index per sort, walked in order. original_language is trailing so the
+        # Telugu filter is checked inside the index; the catalog is mostly Telugu,
+        # so "Telugu only" and "all languages" both read about one page of entries.
+        indexes = [
+            models.Index(
+                fields=['provider', 'kind', '-first_seen_at', '-movie_id', 'original_language'],
+                name='provider_new_idx',
+            ),
+            models.Index(
+                fields=['provider', 'kind', '-popularity', '-movie_id', 'original_language'],
+                name='provider_popular_idx',
+            ),
+            models.Index(
+                fields=['provider', 'kind', '-community_rating', '-movie_id', 'original_language'],
+                name='provider_community_idx',
+            ),
+            models.Index(fields=['movie_id'], name='provider_movie_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.provider_name} - {self.title or self.movie_id}'
+
+
+class Release(models.Model):
+    # Telugu releases by date for the release calendar ("This week", "In theatres",
+    # "Coming soon"), synced from TMDB discover by ReleaseCalendarService
+    movie_id = models.IntegerField(unique=True)
+    title = models.CharField(max_length=255)
+    poster_url = models.URLField(max_length=500, blank=True, null=True)
+    release_date = models.DateField()
+    popularity = models.FloatField(default=0)
+    rating = models.FloatField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Every calendar window is a date range read in date order
+        indexes = [models.Index(fields=['release_date', '-popularity'], name='release_date_idx')]
 
     def __str__(self):
-        return f'{self.user.username} - Watched {self.title or self.movie_id}'
+        return f'{self.title} ({self.release_date})'
@@ -0,0 +1,59 @@
+import base64
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+
+from .services import TMDBService
+
+
+class PlaceholderService:
+    """Builds tiny inline blur previews for TMDB posters and backdrops."""
+
+    # Width of the preview in pixels; the browser scales it up and blurs it
+    WIDTH = 16
+    # TMDB serves every image in several sizes. Download the smallest one
+    # instead of the w500/original files the templates use.
+    SOURCE_SIZES = {'poster': 'w92', 'backdrop': 'w300'}
+
+    def __init__(self, session=None):
+        self.session = session or TMDBService().session
+
+    def source_url(self, url, kind):
+        return re.sub(r'/t/p/[^/]+/', f"/t/p/{self.SOURCE_SIZES[kind]}/", url, count=1)
+
+    def encode(self, fp):
+        """Encode an image file/stream into a `data:` URI a few hundred bytes long."""
+        with Image.open(fp) as img:
+            # Let the JPEG decoder downscale while decoding (much cheaper than a full decode)
+            img.draft('RGB', (self.WIDTH * 4, self.WIDTH * 4))
+            img = img.convert('RGB')
+            height = max(1, round(img.height * self.WIDTH / img.width))
+            img = img.resize((self.WIDTH, height), Image.BILINEAR)
+
+        buf = io.BytesIO()
+        img.save(buf, format='WEBP', quality=40)
+        return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+    def fetch(self, url, kind):
+        response = self.session.get(self.source_url(url, kind), timeout=10)
+        response.raise_for_status()
+        return self.encode(io.BytesIO(response.content))
+
+    def build(self, jobs, workers=8):
+        """
+        jobs: list of (key, url, kind) tuples.
+        Returns {key: data_uri}; images that fail to download are left out.
+        """
+        def run(job):
+            key, url, kind = job
+            try:
+                return key, self.fetch(url, kind)
+            except (requests.exceptions.RequestException, OSError) as e:
+                print(f"Error building placeholder for {url}: {e}")
+                return key, None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return {key: uri for key, uri in executor.map(run, jobs) if uri}
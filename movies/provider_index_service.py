@@ -0,0 +1,222 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import Movie, MovieProvider
+
+
+class ProviderIndexService:
+    """
+    Maintains movies.MovieProvider, the provider -> movies index behind the
+    "New on Aha" / "Telugu on Netflix" pages, from the India watch-provider
+    data in mirrored movie details.
+
+    sync() is called whenever get_movie_details() fetches fresh data and
+    only writes what changed: new offers are inserted, offers that
+    disappeared are deleted, and copied metadata is updated. A new offer on
+    a movie whose details we had mirrored before is stamped as first seen
+    now; on the first look at a movie, its start date is unknown and the
+    release date stands in.
+    Review writes refresh the community rating columns. rebuild() recreates
+    everything from Movie.details.
+    """
+
+    PAGE_SIZE = 24
+    KINDS = [MovieProvider.STREAM, MovieProvider.RENT]
+    # sort -> column; each has its own index (see MovieProvider.Meta)
+    SORTS = {
+        'new': 'first_seen_at',
+        'popular': 'popularity',
+        'community': 'community_rating',
+    }
+    PROVIDERS_CACHE_KEY = 'provider_index_providers_{kind}'
+    METADATA_FIELDS = ['provider_name', 'provider_logo', 'title', 'poster_url', 'release_date', 'original_language', 'popularity']
+
+    # ── Writing ──────────────────────────────────────────────────────
+
+    def _offers(self, movie, providers, ratings, first_seen):
+        """Unsaved MovieProvider rows for one movie's {'stream': [...], 'rent': [...]} provider dict."""
+        rows = {}
+        for kind in self.KINDS:
+            for provider in (providers or {}).get(kind) or []:
+                slug = slugify(provider.get('name') or '')
+                if not slug:
+                    continue
+                rows[(slug, kind)] = MovieProvider(
+                    provider=slug,
+                    provider_name=provider['name'],
+                    provider_logo=provider.get('logo'),
+                    kind=kind,
+                    movie_id=movie['id'],
+                    title=movie.get('title'),
+                    poster_url=movie.get('poster_url'),
+                    release_date=(movie.get('release_date') or '')[:10] or None,
+                    original_language=movie.get('original_language'),
+                    popularity=movie.get('popularity') or 0,
+                    community_rating=ratings.get(movie['id'], (0, 0))[0],
+                    review_count=ratings.get(movie['id'], (0, 0))[1],
+                    first_seen_at=first_seen,
+                )
+        return rows
+
+    def _first_seen(self, release_date, now):
+        # Offers present the first time we look at a movie have no known start
+        # date; the release date (if already past) is the best guess
+        try:
+            released = datetime.strptime((release_date or '')[:10], '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+        except ValueError:
+            return now
+        return min(released, now)
+
+    def _ratings(self, movie_ids):
+        from reviews.models import Review
+        rows = (
+            Review.objects.filter(movie_id__in=movie_ids).values('movie_id')
+            .annotate(avg=Avg('rating'), count=Count('id'))
+        )
+        return {row['movie_id']: (round(row['avg'], 2), row['count']) for row in rows}
+
+    def sync(self, movie, first_look=False):
+        """
+        Brings one movie's rows in line with its freshly fetched details dict.
+        `first_look` is True when no details had been mirrored for it before. Returns rows changed.
+        """
+        now = timezone.now()
+        existing = {(row.provider, row.kind): row for row in MovieProvider.objects.filter(movie_id=movie['id'])}
+        # A movie we were already tracking that gains a provider really is new there,
+        # whether or not it had offers before
+        first_seen = self._first_seen(movie.get('release_date'), now) if first_look else now
+        wanted = self._offers(movie, movie.get('providers'), self._ratings([movie['id']]), first_seen)
+
+        gone = [row.pk for key, row in existing.items() if key not in wanted]
+        added = [row for key, row in wanted.items() if key not in existing]
+        changed = []
+        for key, row in existing.items():
+            fresh = wanted.get(key)
+            if fresh and any(getattr(row, f) != getattr(fresh, f) for f in self.METADATA_FIELDS):
+                for f in self.METADATA_FIELDS:
+                    setattr(row, f, getattr(fresh, f))
+                changed.append(row)
+
+        if gone:
+            MovieProvider.objects.filter(pk__in=gone).delete()
+        if added:
+            MovieProvider.objects.bulk_create(added, ignore_conflicts=True)
+        if changed:
+            MovieProvider.objects.bulk_update(changed, self.METADATA_FIELDS)
+        if gone or added:
+            self._forget_providers()
+        return len(gone) + len(added) + len(changed)
+
+    def refresh_ratings(self, movie_id):
+        # After a review is written or deleted; a no-op UPDATE for movies no provider offers
+        avg, count = self._ratings([movie_id]).get(movie_id, (0, 0))
+        MovieProvider.objects.filter(movie_id=movie_id).update(community_rating=avg, review_count=count)
+
+    def rebuild(self, batch_size=500):
+        """Recreates the index from every movie with mirrored details. Returns the number of rows."""
+        now = timezone.now()
+        total = 0
+        movies = (
+            Movie.objects.exclude(details=None).order_by('id')
+            .values('id', 'title', 'poster_url', 'release_date', 'original_language', 'details__providers', 'details__popularity')
+        )
+        batch = []
+
+        def flush(batch):
+            ids = [movie['id'] for movie in batch]
+            ratings = self._ratings(ids)
+            rows = {}
+            for movie in batch:
+                movie['popularity'] = movie.pop('details__popularity')
+                offers = self._offers(
+                    movie, movie.pop('details__providers'), ratings, self._first_seen(movie['release_date'], now)
+                )
+                rows.update({(slug, kind, movie['id']): row for (slug, kind), row in offers.items()})
+            # Upsert, keeping first_seen_at on offers we already had
+            MovieProvider.objects.bulk_create(
+                rows.values(), update_conflicts=True, unique_fields=['provider', 'kind', 'movie_id'],
+                update_fields=self.METADATA_FIELDS + ['community_rating', 'review_count'],
+            )
+            stale = [
+                pk for pk, provider, kind, movie_id in
+                MovieProvider.objects.filter(movie_id__in=ids).values_list('pk', 'provider', 'kind', 'movie_id')
+                if (provider, kind, movie_id) not in rows
+            ]
+            MovieProvider.objects.filter(pk__in=stale).delete()
+            return len(rows)
+
+        for movie in movies.iterator(chunk_size=batch_size):
+            batch.append(movie)
+            if len(batch) >= batch_size:
+                total += flush(batch)
+                batch = []
+        if batch:
+            total += flush(batch)
+        self._forget_providers()
+        return total
+
+    # ── Reading ──────────────────────────────────────────────────────
+
+    def page(self, provider, kind=MovieProvider.STREAM, sort='new', language='te', cursor=None, size=PAGE_SIZE):
+        """One page of a provider's movies as (rows, next_cursor). Walks one index; no joins."""
+        field = self.SORTS.get(sort, self.SORTS['new'])
+        rows = MovieProvider.objects.filter(provider=provider, kind=kind)
+        if language != 'all':
+            rows = rows.filter(original_language=language)
+        if field == 'community_rating':
+            rows = rows.filter(community_rating__gt=0)
+        after = self._decode_cursor(cursor, field)
+        if after:
+            value, movie_id = after
+            rows = rows.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'movie_id__lt': movie_id}))
+        items = list(
+            rows.order_by(f'-{field}', '-movie_id').values(
+                'movie_id', 'title', 'poster_url', 'release_date', 'popularity', 'community_rating',
+                'review_count', 'first_seen_at',
+            )[:size + 1]
+        )
+        next_cursor = self._encode_cursor(items[size - 1], field) if len(items) > size else None
+        return items[:size], next_cursor
+
+    def _encode_cursor(self, item, field):
+        value = item[field]
+        if field == 'first_seen_at':
+            value = int(value.timestamp() * 1_000_000)
+        return f"{value}_{item['movie_id']}"
+
+    def _decode_cursor(self, cursor, field):
+        try:
+            value, movie_id = (cursor or '').rsplit('_', 1)
+            if field == 'first_seen_at':
+                value = datetime.fromtimestamp(int(value) / 1_000_000, tz=dt_timezone.utc)
+            else:
+                value = float(value)
+            return value, int(movie_id)
+        except (ValueError, OverflowError, OSError):
+            # Out-of-range timestamps from a hand-edited ?cursor= raise these in fromtimestamp
+            return None
+
+    def providers(self, kind=MovieProvider.STREAM):
+        """[{'provider', 'provider_name', 'provider_logo', 'count'}, ...] biggest catalogue first."""
+        key = self.PROVIDERS_CACHE_KEY.format(kind=kind)
+        found = cache.get(key)
+        if found is None:
+            merged = {}
+            rows = (
+                MovieProvider.objects.filter(kind=kind)
+                .values('provider', 'provider_name', 'provider_logo')
+                .annotate(count=Count('id'))
+            )
+            # A logo or display name can change between fetches; fold those variants together
+            for row in rows:
+                merged.setdefault(row['provider'], {**row, 'count': 0})['count'] += row['count']
+            found = sorted(merged.values(), key=lambda row: -row['count'])
+            cache.set(key, found, 3600)
+        return found
+
+    def _forget_providers(self):
+        cache.delete_many([self.PROVIDERS_CACHE_KEY.format(kind=kind) for kind in self.KINDS])
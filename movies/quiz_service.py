@@ -1,14 +1,42 @@
+import hashlib
 import json
 import os
 import requests
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import QuizAttempt, QuizServe
+from .transport_service import http_session
+
+# Shared by all requests in this process: caps concurrent calls to the single Ollama GPU
+_llm_pool = ThreadPoolExecutor(max_workers=2)
+# Generations running or waiting in _llm_pool; when all are taken, callers skip the LLM tier
+# instead of queueing behind it, so a slow GPU host can't build up an unbounded backlog
+LLM_QUEUE_LIMIT = 4
+_llm_slots = threading.BoundedSemaphore(LLM_QUEUE_LIMIT)
 
 class QuizService:
+    # How long an unanswered quiz can be reused before a new one is generated
+    ATTEMPT_TTL = timedelta(days=1)
+    # AI quizzes kept per movie, and for how long
+    BANK_SIZE = 5
+    BANK_TIMEOUT = 7 * 86400
+
     def __init__(self):
         # Ollama local endpoint
         # Ollama remote endpoint (User provided)
         self.api_url = os.environ.get("OLLAMA_API_URL", "https://unsanguine-rosette-impressibly.ngrok-free.dev/api/generate")
         self.model = "llama3.2" # Using the user-approved small model
+        self.session = http_session()
 
     def generate_quiz(self, movie_title, movie_overview):
         print(f"DEBUG: Generating quiz for '{movie_title}' using Ollama ({self.model})...")
@@ -50,7 +78,7 @@ class QuizService:
             # High timeout because remote inference can be slow
             # Add header to skip ngrok browser warning
             headers = {"ngrok-skip-browser-warning": "true"}
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=180)
+            response = self.session.post(self.api_url, json=payload, headers=headers, timeout=180)
             response.raise_for_status()
             
             data = response.json()
@@ -124,41 +152,231 @@ class QuizService:
             print(f"DEBUG: Ollama generation failed: {e}")
             return None
 
-    def generate_backup_quiz(self, movie):
-        """Generates a quiz based on metadata if AI fails."""
-        import random
+    def generate_backup_quiz(self, movie, count=2):
+        """Generates a quiz from cached metadata (cast, characters, directors, runtime, year) if AI fails."""
+        builders = [
+            self._character_question,
+            self._actor_question,
+            self._director_question,
+            self._runtime_question,
+            self._year_question,
+        ]
+        random.shuffle(builders)
         
         quiz = []
-        
-        # Q1: Director
-        directors = movie.get('directors', [])
-        if directors:
-            director_name = directors[0]['name']
-            fakes = ["S.S. Rajamouli", "Trivikram Srinivas", "Sukumar", "Nag Aswin", "Puri Jagannadh"]
-            fakes = [f for f in fakes if f != director_name]
-            if len(fakes) >= 3:
-                options = [director_name] + random.sample(fakes, 3)
-            else:
-                options = [director_name] + fakes 
-            random.shuffle(options)
-            
-            quiz.append({
-                "question": f"Who directed '{movie['title']}'?",
-                "options": options,
-                "correct_answer": director_name
-            })
-            
-        # Q2: Release Year
-        year = movie.get('release_date', '')[:4]
-        if year and year.isdigit():
-            y = int(year)
-            options = [str(y), str(y+1), str(y-2), str(y+3)]
-            random.shuffle(options)
-            
-            quiz.append({
-                "question": f"In which year was '{movie['title']}' released?",
-                "options": options,
-                "correct_answer": str(y)
-            })
-            
+        for build in builders:
+            question = build(movie)
+            if question:
+                quiz.append(question)
+            if len(quiz) == count:
+                break
         return quiz
+
+    def _choice_question(self, question, correct, wrong):
+        wrong = [w for w in dict.fromkeys(wrong) if w and w != correct]
+        if len(wrong) < 3:
+            return None
+        options = [correct] + random.sample(wrong, 3)
+        random.shuffle(options)
+        return {"question": question, "options": options, "correct_answer": correct}
+
+    def _credited_cast(self, movie):
+        return [c for c in movie.get('cast', []) if c.get('name') and c.get('character')]
+
+    def _character_question(self, movie):
+        cast = self._credited_cast(movie)
+        if len(cast) < 4:
+            return None
+        actor = random.choice(cast[:5])
+        return self._choice_question(
+            f"Which character did {actor['name']} play in '{movie['title']}'?",
+            actor['character'],
+            [c['character'] for c in cast if c['id'] != actor['id']],
+        )
+
+    def _actor_question(self, movie):
+        cast = self._credited_cast(movie)
+        if len(cast) < 4:
+            return None
+        actor = random.choice(cast[:5])
+        return self._choice_question(
+            f"Who played {actor['character']} in '{movie['title']}'?",
+            actor['name'],
+            [c['name'] for c in cast if c['id'] != actor['id']],
+        )
+
+    def _director_question(self, movie):
+        directors = movie.get('directors', [])
+        if not directors:
+            return None
+        director_name = directors[0]['name']
+        fakes = ["S.S. Rajamouli", "Trivikram Srinivas", "Sukumar", "Nag Aswin", "Puri Jagannadh", "Koratala Siva"]
+        return self._choice_question(f"Who directed '{movie['title']}'?", director_name, fakes)
+
+    def _runtime_question(self, movie):
+        runtime = movie.get('runtime') or 0
+        if runtime < 60:
+            return None
+        return self._choice_question(
+            f"How long is '{movie['title']}'?",
+            f"{runtime} min",
+            [f"{runtime + delta} min" for delta in (-35, -20, 15, 25, 40)],
+        )
+
+    def _year_question(self, movie):
+        year = (movie.get('release_date') or '')[:4]
+        if not year.isdigit():
+            return None
+        y = int(year)
+        return self._choice_question(
+            f"In which year was '{movie['title']}' released?",
+            str(y),
+            [str(y + delta) for delta in (-3, -2, -1, 1, 2, 3)],
+        )
+
+    def _bank_key(self, movie_id):
+        return f'quiz_bank_{movie_id}'
+
+    def _bank(self, movie_id, quiz_data):
+        # Keep AI quizzes around so the next user doesn't wait for the LLM
+        if not quiz_data:
+            return
+        key = self._bank_key(movie_id)
+        bank = cache.get(key) or []
+        if len(bank) < self.BANK_SIZE:
+            cache.set(key, bank + [quiz_data], self.BANK_TIMEOUT)
+
+    def _submit_generation(self, movie):
+        """
+        Queues one AI quiz generation for `movie`, which lands in the bank when
+        done. Returns its future, or None when one is already pending for this
+        movie, the queue is full or the global LLM budget is spent.
+        """
+        pending_key = f"{self._bank_key(movie['id'])}_pending"
+        if not cache.add(pending_key, True, 180):
+            return None
+        if not _llm_slots.acquire(blocking=False):
+            cache.delete(pending_key)
+            print(f"DEBUG: LLM queue full; not generating a quiz for movie {movie['id']}.")
+            return None
+        if not self._llm_allowed():
+            _llm_slots.release()
+            cache.delete(pending_key)
+            print("DEBUG: Global LLM budget exhausted; not generating a quiz.")
+            return None
+
+        def done(future):
+            _llm_slots.release()
+            cache.delete(pending_key)
+            if not future.cancelled() and future.exception() is None:
+                self._bank(movie['id'], future.result())
+
+        future = _llm_pool.submit(self.generate_quiz, movie['title'], movie['overview'])
+        future.add_done_callback(done)
+        return future
+
+    def _quiz_id(self, quiz_data):
+        return hashlib.sha1('|'.join(q.get('question', '') for q in quiz_data).encode()).hexdigest()[:12]
+
+    def _seen_key(self, user, movie_id):
+        return f'quiz_seen_{user.pk}_{movie_id}'
+
+    def _mark_seen(self, user, movie_id, quiz_data):
+        if user is not None:
+            key = self._seen_key(user, movie_id)
+            cache.set(key, (cache.get(key) or []) + [self._quiz_id(quiz_data)], self.BANK_TIMEOUT)
+
+    def serve_quiz(self, movie, budget=None, user=None):
+        """
+        Latency-budgeted quiz for `movie`. Returns (quiz_data, tier):
+
+        1. bank: a previously generated AI quiz (instant) that `user` hasn't
+           been served yet, so failing and retrying can't cycle through the
+           bank until a known question comes up; the bank is topped up in the
+           background
+        2. llm: a fresh AI quiz, if it arrives within the budget
+        3. metadata: questions built from the cached details
+
+        A generation that misses the deadline is cancelled if it hasn't
+        started yet, and otherwise keeps running and still lands in the bank.
+        """
+        started = time.monotonic()
+        if budget is None:
+            budget = settings.QUIZ_LATENCY_BUDGET
+
+        bank = cache.get(self._bank_key(movie['id'])) or []
+        # One generation per movie at a time, whether it's a top-up or for this request
+        future = self._submit_generation(movie) if len(bank) < self.BANK_SIZE else None
+        seen = set(cache.get(self._seen_key(user, movie['id'])) or []) if user is not None else set()
+        unseen = [quiz for quiz in bank if self._quiz_id(quiz) not in seen]
+        if unseen:
+            quiz_data = random.choice(unseen)
+            self._mark_seen(user, movie['id'], quiz_data)
+            return quiz_data, QuizServe.BANK
+
+        quiz_data = None
+        if future is not None:
+            try:
+                quiz_data = future.result(timeout=max(0, budget - (time.monotonic() - started)))
+            except FuturesTimeout:
+                future.cancel()
+                print(f"DEBUG: LLM missed the {budget}s quiz budget for movie {movie['id']}; serving metadata quiz.")
+        if quiz_data:
+            self._mark_seen(user, movie['id'], quiz_data)
+            return quiz_data, QuizServe.LLM
+
+        quiz_data = self.generate_backup_quiz(movie)
+        if quiz_data:
+            return quiz_data, QuizServe.METADATA
+        return None, QuizServe.UNAVAILABLE
+
+    def _llm_allowed(self):
+        # Global budget shared by every user, so one client can't monopolise the GPU host
+        from .rate_limit_service import RateLimitService
+        allowed, _ = RateLimitService().hit('llm')
+        return allowed
+
+    def record_serve(self, movie_id, tier, started):
+        QuizServe.objects.create(
+            movie_id=movie_id, tier=tier, latency_ms=int((time.monotonic() - started) * 1000)
+        )
+
+    def hash_answer(self, attempt_id, answer):
+        # Keyed with SECRET_KEY, so the stored hashes can't be brute-forced against the options
+        return salted_hmac('movies.quiz_answer', f"{attempt_id}:{answer.strip()}").hexdigest()[:20]
+
+    def create_attempt(self, user, movie_id, quiz_data):
+        """Stores a generated quiz without its plain-text answers."""
+        # Old attempts for this movie, and any of the user's expired ones
+        cutoff = timezone.now() - self.ATTEMPT_TTL
+        QuizAttempt.objects.filter(user=user, movie_id=movie_id).delete()
+        QuizAttempt.objects.filter(user=user, created_at__lt=cutoff).delete()
+
+        attempt = QuizAttempt(
+            user=user,
+            movie_id=movie_id,
+            questions=[{'question': q.get('question', ''), 'options': q.get('options', [])} for q in quiz_data],
+        )
+        attempt.answer_hashes = [self.hash_answer(attempt.id, q.get('correct_answer') or '') for q in quiz_data]
+        attempt.save()
+        return attempt
+
+    def get_attempt(self, user, movie_id, attempt_id=None):
+        """The user's live attempt for this movie (a specific one if attempt_id is given)."""
+        attempts = QuizAttempt.objects.filter(
+            user=user, movie_id=movie_id, created_at__gte=timezone.now() - self.ATTEMPT_TTL
+        )
+        try:
+            if attempt_id is not None:
+                attempts = attempts.filter(pk=attempt_id)
+            return attempts.order_by('-created_at').first()
+        except ValidationError:
+            return None  # Malformed attempt ID
+
+    def grade_attempt(self, attempt, answers):
+        """answers: the submitted option per question. Returns the number answered correctly."""
+        score = 0
+        for expected, answer in zip(attempt.answer_hashes, answers):
+            if answer and answer.strip() and constant_time_compare(self.hash_answer(attempt.id, answer), expected):
+                score += 1
+        return score
@@ -0,0 +1,116 @@
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+class RateLimitService:
+    """
+    Sliding-window rate limits backed by the shared cache.
+
+    Each (scope, identity) keeps a counter per fixed window; the current rate
+    is estimated as previous * (unelapsed share of the window) + current, which
+    smooths out bursts at window edges for two cache reads and one increment.
+    Limits live in settings.RATE_LIMITS as scope -> (requests, window seconds).
+    """
+
+    def limit(self, scope):
+        return settings.RATE_LIMITS[scope]
+
+    def hit(self, scope, identity='global'):
+        """Counts one request. Returns (allowed, retry_after_seconds)."""
+        limit, window = self.limit(scope)
+        now = time.time()
+        current = int(now // window)
+        elapsed = now - current * window
+        current_key = f'ratelimit:{scope}:{identity}:{current}'
+        previous_key = f'ratelimit:{scope}:{identity}:{current - 1}'
+
+        counts = cache.get_many([current_key, previous_key])
+        previous_count = counts.get(previous_key, 0)
+        current_count = counts.get(current_key, 0)
+        estimate = previous_count * (window - elapsed) / window + current_count
+
+        if estimate >= limit:
+            self._count(scope, 'blocked')
+            if current_count >= limit or not previous_count:
+                retry_after = window - elapsed
+            else:
+                # Time for the previous window's share to decay below the limit
+                retry_after = min(window - elapsed, (estimate - limit + 1) * window / previous_count)
+            return False, max(1, math.ceil(retry_after))
+
+        cache.add(current_key, 0, window * 2)
+        try:
+            cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(current_key, 1, window * 2)
+        self._count(scope, 'allowed')
+        return True, 0
+
+    def _count(self, scope, outcome):
+        # Running totals for tuning the limits (shown on the admin dashboard)
+        key = f'ratelimit_stats:{scope}:{outcome}'
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+    def stats(self):
+        keys = [f'ratelimit_stats:{scope}:{outcome}' for scope in settings.RATE_LIMITS for outcome in ('allowed', 'blocked')]
+        counts = cache.get_many(keys)
+        return [
+            {
+                'scope': scope,
+                'limit': limit,
+                'window': window,
+                'allowed': counts.get(f'ratelimit_stats:{scope}:allowed', 0),
+                'blocked': counts.get(f'ratelimit_stats:{scope}:blocked', 0),
+            }
+            for scope, (limit, window) in settings.RATE_LIMITS.items()
+        ]
+
+
+def client_identity(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    # Each trusted proxy appends the address it saw, so the client is the
+    # entry our outermost proxy added; anything before it can be forged
+    proxies = settings.TRUSTED_PROXY_COUNT
+    forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+    if proxies and forwarded:
+        ip = forwarded[-min(proxies, len(forwarded))]
+    else:
+        ip = request.META.get('REMOTE_ADDR', '')
+    return f'ip:{ip}'
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse(
+        f"Too many requests. Please try again in {retry_after} seconds.", status=429, content_type='text/plain'
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limited(scope, when=None):
+    """
+    View decorator: per user (or IP) limit for `scope`, answering 429 with
+    Retry-After once it is exceeded. `when(request)` can restrict which
+    requests count, e.g. only searches.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if when is None or when(request):
+                allowed, retry_after = RateLimitService().hit(scope, client_identity(request))
+                if not allowed:
+                    return too_many_requests(retry_after)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,398 @@
+import hashlib
+import json
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.utils import timezone
+from scipy import sparse
+
+from reviews.models import Review
+from .models import Favorite, Movie, SimilarMovie, UserRecommendation, Watched
+
+
+class RecommendationService:
+    """Recommendations computed offline from our own community's activity."""
+
+    # Implicit-feedback weight of each interaction. A review adds rating / 5
+    # on top, so a 5-star review counts as much as a favorite.
+    WATCHED_WEIGHT = 1.0
+    FAVORITE_WEIGHT = 1.0
+
+    # Content index feature weights (before IDF)
+    GENRE_WEIGHT = 1.0
+    DIRECTOR_WEIGHT = 1.5
+    CAST_WEIGHT = 1.0
+    ERA_WEIGHT = 0.5
+    TOP_BILLED = 8
+    ERA_YEARS = 5
+
+    def interaction_matrix(self):
+        """
+        Builds the sparse users x movies matrix from Watched, Favorite and Review.
+        Returns (matrix, user_ids, movie_ids): user_ids[i] is the user of row i
+        and movie_ids[j] the TMDB ID of column j.
+        """
+        users, movies, weights = [], [], []
+        for model, weight in ((Watched, self.WATCHED_WEIGHT), (Favorite, self.FAVORITE_WEIGHT)):
+            pairs = np.array(list(model.objects.values_list('user_id', 'movie_id')), dtype=np.int64).reshape(-1, 2)
+            users.append(pairs[:, 0])
+            movies.append(pairs[:, 1])
+            weights.append(np.full(len(pairs), weight, dtype=np.float32))
+
+        reviews = np.array(list(Review.objects.values_list('user_id', 'movie_id', 'rating')), dtype=np.int64).reshape(-1, 3)
+        users.append(reviews[:, 0])
+        movies.append(reviews[:, 1])
+        weights.append(reviews[:, 2].astype(np.float32) / 5)
+
+        user_ids, rows = np.unique(np.concatenate(users), return_inverse=True)
+        movie_ids, cols = np.unique(np.concatenate(movies), return_inverse=True)
+        # Duplicate (user, movie) entries are summed by the COO -> CSR conversion
+        matrix = sparse.coo_matrix(
+            (np.concatenate(weights), (rows, cols)), shape=(len(user_ids), len(movie_ids))
+        ).tocsr()
+        return matrix, user_ids, movie_ids
+
+    def item_neighbors(self, matrix, top_k=20, min_support=2, shrinkage=10.0, block_size=1024):
+        """
+        Item-item cosine similarity over the columns of `matrix`, computed in
+        blocks of rows so memory stays bounded as the catalog grows.
+
+        Scores are shrunk by support / (support + shrinkage), where support is
+        the number of users who interacted with both movies, and pairs seen
+        together by fewer than `min_support` users are dropped.
+
+        Yields (column, neighbor_columns, scores) for every column with at least one neighbor.
+        """
+        matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        norms[norms == 0] = 1
+        normalized = (matrix @ sparse.diags(1 / norms)).tocsc()
+        binary = (matrix > 0).astype(np.float32).tocsc()
+        normalized_t = normalized.T.tocsr()
+        binary_t = binary.T.tocsr()
+
+        n_items = matrix.shape[1]
+        for start in range(0, n_items, block_size):
+            stop = min(start + block_size, n_items)
+            sims = (normalized_t[start:stop] @ normalized).tocsr()
+            support = (binary_t[start:stop] @ binary).tocsr()
+            sims.sort_indices()
+            support.sort_indices()
+            # All weights are positive, so both products share one sparsity pattern
+            sims.data *= support.data / (support.data + shrinkage)
+            sims.data[support.data < min_support] = 0
+            yield from self._top_k(sims, np.arange(start, stop), top_k)
+
+    def _top_k(self, sims, row_items, top_k, exclude_self=True):
+        """
+        sims: CSR block whose row i holds the scores of row_items[i] against every item.
+        Yields (row_item, items, scores) best first, skipping zero scores and,
+        when the rows are items themselves, the item itself.
+        """
+        for i, item in enumerate(row_items):
+            lo, hi = sims.indptr[i], sims.indptr[i + 1]
+            cols = sims.indices[lo:hi]
+            scores = sims.data[lo:hi].copy()
+            if exclude_self:
+                scores[cols == item] = 0
+            keep = scores > 0
+            cols, scores = cols[keep], scores[keep]
+            if not len(cols):
+                continue
+            if len(cols) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+                cols, scores = cols[best], scores[best]
+            order = np.argsort(-scores, kind='stable')
+            yield item, cols[order], scores[order]
+
+    def build_collaborative(self, top_k=20, min_support=2, min_neighbors=4, batch_size=500):
+        """Recomputes the "people who watched this also watched" rows. Returns rows written."""
+        matrix, _, movie_ids = self.interaction_matrix()
+
+        catalog = Movie.objects.in_bulk([int(m) for m in movie_ids])
+        started = timezone.now()
+        rows = []
+        written = 0
+        for col, neighbor_cols, scores in self.item_neighbors(matrix, top_k=top_k, min_support=min_support):
+            neighbors = []
+            for neighbor_col, score in zip(neighbor_cols, scores):
+                movie = catalog.get(int(movie_ids[neighbor_col]))
+                if movie is None:
+                    continue  # No metadata to render a card with
+                neighbors.append(self._card(movie, score))
+            if len(neighbors) < min_neighbors:
+                continue
+            rows.append(SimilarMovie(movie_id=int(movie_ids[col]), source=SimilarMovie.COLLABORATIVE, neighbors=neighbors))
+            if len(rows) >= batch_size:
+                written += self._save(rows)
+                rows = []
+        written += self._save(rows)
+
+        # Rows this run didn't touch no longer have enough neighbors
+        SimilarMovie.objects.filter(source=SimilarMovie.COLLABORATIVE, updated_at__lt=started).delete()
+        return written
+
+    def content_features(self, genres, directors, cast, release_date):
+        """Returns {token: weight} for one movie."""
+        features = {f'genre:{g}': self.GENRE_WEIGHT for g in genres or []}
+        for d in directors or []:
+            features[f'director:{d["id"]}'] = self.DIRECTOR_WEIGHT
+        for rank, member in enumerate((cast or [])[:self.TOP_BILLED]):
+            # Leads count more than the eighth-billed actor
+            features.setdefault(f'cast:{member["id"]}', self.CAST_WEIGHT / (1 + 0.25 * rank))
+        year = (release_date or '')[:4]
+        if year.isdigit():
+            era = int(year) // self.ERA_YEARS
+            features[f'era:{era}'] = self.ERA_WEIGHT
+            # Half credit for the neighbouring eras so 2009 and 2011 still overlap
+            features[f'era:{era - 1}'] = self.ERA_WEIGHT / 2
+            features[f'era:{era + 1}'] = self.ERA_WEIGHT / 2
+        return features
+
+    def content_matrix(self, feature_dicts):
+        """Stacks feature dicts into an L2-normalised, IDF-weighted CSR matrix (one row per movie)."""
+        vocab = {}
+        indptr, indices, data = [0], [], []
+        for features in feature_dicts:
+            for token, weight in features.items():
+                indices.append(vocab.setdefault(token, len(vocab)))
+                data.append(weight)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(feature_dicts), len(vocab)),
+        )
+
+        # A shared director says more than a shared "Drama"
+        df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        idf = np.log((1 + matrix.shape[0]) / (1 + df)) + 1
+        matrix = matrix @ sparse.diags(idf.astype(np.float32))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return (sparse.diags(1 / norms) @ matrix).tocsr()
+
+    def content_neighbors(self, matrix, rows, top_k=20, block_size=1024):
+        """Cosine top-k against the whole catalog for the given row indices, in blocks."""
+        matrix_t = matrix.T.tocsc()
+        for start in range(0, len(rows), block_size):
+            block = rows[start:start + block_size]
+            sims = (matrix[block] @ matrix_t).tocsr()
+            yield from self._top_k(sims, block, top_k)
+
+    def build_content(self, full=False, top_k=20, min_neighbors=4, batch_size=500):
+        """
+        Refreshes the content-similarity rows from the mirrored TMDB details.
+
+        By default only movies whose features (genres, directors, top-billed
+        cast, era) changed since the last build are recomputed, found by
+        comparing a hash of those features with Movie.content_hash. Their new
+        scores are then merged into the lists of the movies they neighbour now
+        or did before. IDF weights drift a little as the catalog grows, so
+        schedule an occasional full=True rebuild.
+        Returns the number of rows written.
+        """
+        catalog = list(
+            Movie.objects.exclude(details=None)
+            .order_by('id')
+            .values_list('id', 'release_date', 'details__genres', 'details__directors', 'details__cast', 'content_hash')
+        )
+        if not catalog:
+            return 0
+        movie_ids = np.array([row[0] for row in catalog], dtype=np.int64)
+        features = [self.content_features(g, d, c, r) for _, r, g, d, c, _ in catalog]
+        hashes = [hashlib.md5(json.dumps(f, sort_keys=True).encode()).hexdigest() for f in features]
+        matrix = self.content_matrix(features)
+
+        if full:
+            targets = np.arange(len(catalog))
+        else:
+            targets = np.array([i for i, row in enumerate(catalog) if row[5] != hashes[i]], dtype=np.int64)
+        if not len(targets):
+            return 0
+        full = full or len(targets) == len(catalog)
+
+        started = timezone.now()
+        written = 0
+        pending = []
+        for item, cols, scores in self.content_neighbors(matrix, targets, top_k=top_k):
+            pending.append((int(movie_ids[item]), [(int(movie_ids[c]), s) for c, s in zip(cols, scores)]))
+            if len(pending) >= batch_size:
+                written += self._save_content(pending, min_neighbors)
+                pending = []
+        written += self._save_content(pending, min_neighbors)
+
+        if full:
+            SimilarMovie.objects.filter(source=SimilarMovie.CONTENT, updated_at__lt=started).delete()
+        else:
+            # Targets with no neighbours at all weren't yielded above
+            SimilarMovie.objects.filter(
+                source=SimilarMovie.CONTENT, movie_id__in=[int(movie_ids[k]) for k in targets], updated_at__lt=started,
+            ).delete()
+            written += self._merge_content(matrix, movie_ids, targets, top_k, min_neighbors, batch_size)
+        Movie.objects.bulk_update(
+            [Movie(id=int(movie_ids[k]), content_hash=hashes[k]) for k in targets], ['content_hash'], batch_size=batch_size
+        )
+        return written
+
+    def _merge_content(self, matrix, movie_ids, targets, top_k, min_neighbors, batch_size):
+        # Other movies' stored lists: drop the changed movies' old scores and add
+        # their new ones, so they can enter a top-k or fall out of it
+        reverse = (matrix @ matrix[targets].T).tocsr()
+        target_ids = {int(movie_ids[k]) for k in targets}
+        target_set = set(targets.tolist())
+        others = [j for j in range(matrix.shape[0]) if j not in target_set]
+        written = 0
+        for start in range(0, len(others), batch_size):
+            chunk = others[start:start + batch_size]
+            existing = dict(
+                SimilarMovie.objects.filter(
+                    source=SimilarMovie.CONTENT, movie_id__in=[int(movie_ids[j]) for j in chunk]
+                ).values_list('movie_id', 'neighbors')
+            )
+            pending, recompute = [], []
+            for j in chunk:
+                movie_id = int(movie_ids[j])
+                old = [(n['id'], n['score']) for n in existing.get(movie_id, [])]
+                lo, hi = reverse.indptr[j], reverse.indptr[j + 1]
+                if lo == hi and not any(n in target_ids for n, _ in old):
+                    continue
+                scores = {n: score for n, score in old if n not in target_ids}
+                for k, score in zip(reverse.indices[lo:hi], reverse.data[lo:hi]):
+                    scores[int(movie_ids[targets[k]])] = float(score)
+                if not old or len(old) >= top_k and any(
+                    n in target_ids and round(scores.get(n, 0), 4) < s for n, s in old
+                ):
+                    # No stored list to merge into, or a full one lost ground and
+                    # its next best movie was never stored
+                    recompute.append(j)
+                    continue
+                best = sorted(scores.items(), key=lambda kv: -kv[1])[:top_k]
+                if [(n, round(score, 4)) for n, score in best] != old:
+                    pending.append((movie_id, best))
+            for item, cols, scores in self.content_neighbors(matrix, np.array(recompute, dtype=np.int64), top_k=top_k):
+                pending.append((int(movie_ids[item]), [(int(movie_ids[c]), s) for c, s in zip(cols, scores)]))
+            written += self._save_content(pending, min_neighbors)
+        return written
+
+    def _save_content(self, pending, min_neighbors):
+        """
+        pending: [(movie_id, [(neighbor_id, score), ...])]. Movies left with
+        fewer than `min_neighbors` lose their stored row.
+        """
+        ids = {neighbor_id for _, neighbors in pending for neighbor_id, _ in neighbors}
+        catalog = Movie.objects.only('id', 'title', 'poster_url', 'poster_placeholder', 'release_date', 'rating').in_bulk(list(ids))
+        rows, dropped = [], []
+        for movie_id, neighbors in pending:
+            cards = [self._card(catalog[n], score) for n, score in neighbors if n in catalog]
+            if len(cards) >= min_neighbors:
+                rows.append(SimilarMovie(movie_id=movie_id, source=SimilarMovie.CONTENT, neighbors=cards))
+            else:
+                dropped.append(movie_id)
+        if dropped:
+            SimilarMovie.objects.filter(source=SimilarMovie.CONTENT, movie_id__in=dropped).delete()
+        return self._save(rows)
+
+    # How much each neighbour source contributes to "For You" scores
+    SOURCE_WEIGHTS = {SimilarMovie.COLLABORATIVE: 1.0, SimilarMovie.CONTENT: 0.5}
+
+    def build_for_you(self, days=30, size=20, batch_size=500):
+        """
+        Precomputes the "For You" row for users active in the last `days` days:
+        each user's interactions (weighted as in interaction_matrix) are
+        multiplied by the stored neighbour lists, then anything the user has
+        already watched, favorited or reviewed is masked out.
+        Users without history get no row and see the global rows instead.
+        Returns the number of rows written.
+        """
+        matrix, user_ids, movie_ids = self.interaction_matrix()
+        column = {int(m): j for j, m in enumerate(movie_ids)}
+
+        # Item x candidate score matrix from the stored neighbour lists
+        cards = {}
+        candidate_ids = {}
+        rows, cols, vals = [], [], []
+        neighbor_rows = SimilarMovie.objects.filter(movie_id__in=list(column)).values_list('movie_id', 'source', 'neighbors')
+        for movie_id, source, neighbors in neighbor_rows.iterator():
+            weight = self.SOURCE_WEIGHTS.get(source, 0)
+            for n in neighbors:
+                cards.setdefault(n['id'], {k: v for k, v in n.items() if k != 'score'})
+                rows.append(column[movie_id])
+                cols.append(candidate_ids.setdefault(n['id'], len(candidate_ids)))
+                vals.append(weight * n['score'])
+        if not candidate_ids:
+            return 0
+        candidates = np.array(list(candidate_ids), dtype=np.int64)
+        similarity = sparse.coo_matrix(
+            (np.array(vals, dtype=np.float32), (rows, cols)), shape=(len(movie_ids), len(candidates))
+        ).tocsr()
+
+        # Map "already seen" movies into candidate space so they can be masked
+        seen_cols = np.array([candidate_ids.get(int(m), -1) for m in movie_ids], dtype=np.int64)
+
+        cutoff = timezone.now() - timedelta(days=days)
+        active = set(User.objects.filter(last_login__gte=cutoff).values_list('id', flat=True))
+        for model in (Watched, Favorite, Review):
+            active.update(model.objects.filter(created_at__gte=cutoff).values_list('user_id', flat=True))
+        user_rows = np.flatnonzero(np.isin(user_ids, list(active)))
+
+        started = timezone.now()
+        written = 0
+        for start in range(0, len(user_rows), batch_size):
+            block = user_rows[start:start + batch_size]
+            history = matrix[block]
+            scores = (history @ similarity).tocsr()
+            mapped = seen_cols[history.indices]
+            keep = mapped >= 0
+            history_rows = np.repeat(np.arange(len(block)), np.diff(history.indptr))
+            seen = sparse.csr_matrix(
+                (np.ones(keep.sum(), dtype=np.float32), (history_rows[keep], mapped[keep])), shape=scores.shape
+            )
+            scores = (scores - scores.multiply(seen)).tocsr()
+            scores.eliminate_zeros()
+
+            recs = []
+            for i, best, _ in self._top_k(scores, range(len(block)), size, exclude_self=False):
+                recs.append(UserRecommendation(
+                    user_id=int(user_ids[block[i]]),
+                    movies=[cards[int(candidates[c])] for c in best],
+                ))
+            UserRecommendation.objects.bulk_create(
+                recs, update_conflicts=True, unique_fields=['user'], update_fields=['movies', 'updated_at']
+            )
+            written += len(recs)
+
+        # Users who went inactive or lost all candidates
+        UserRecommendation.objects.filter(updated_at__lt=started).delete()
+        return written
+
+    def for_you(self, user):
+        if not user.is_authenticated:
+            return []
+        movies = UserRecommendation.objects.filter(user=user).values_list('movies', flat=True).first()
+        return movies or []
+
+    def _card(self, movie, score):
+        return {
+            'id': movie.id,
+            'title': movie.title,
+            'poster_url': movie.poster_url,
+            'poster_placeholder': movie.poster_placeholder,
+            'release_date': movie.release_date,
+            'rating': movie.rating or 0,
+            'score': round(float(score), 4),
+        }
+
+    def _save(self, rows):
+        SimilarMovie.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['movie_id', 'source'], update_fields=['neighbors', 'updated_at']
+        )
+        return len(rows)
+
+    def similar_movies(self, movie_id, limit=12):
+        """Neighbours from the best available source (see SimilarMovie.SOURCE_PRIORITY)."""
+        rows = dict(SimilarMovie.objects.filter(movie_id=movie_id).values_list('source', 'neighbors'))
+        for source in SimilarMovie.SOURCE_PRIORITY:
+            if rows.get(source):
+                return rows[source][:limit]
+        return []
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .models import Release
+
+# Background syncs, one at a time, started when a reader finds the calendar stale
+_sync_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='release-sync')
+
+
+class ReleaseCalendarService:
+    """
+    Telugu releases by date, kept in movies.Release and synced from TMDB
+    discover over a window around today (DAYS_BACK .. DAYS_AHEAD).
+
+    The calendar windows (this week, in theatres, coming soon) move with the
+    date in India, not UTC, so a Friday release shows up as soon as its
+    first-day shows do. Each day's windows are computed into one cached
+    "buckets" dict. A sync precomputes both today's and tomorrow's buckets, so
+    the page is a single cache read even right after midnight on a release
+    day. Readers kick off a background sync once the last one is older than
+    SYNC_INTERVAL; `sync_release_calendar` does the same from cron.
+    """
+
+    TIMEZONE = ZoneInfo('Asia/Kolkata')
+    DAYS_BACK = 60
+    DAYS_AHEAD = 180
+    MAX_PAGES = 25
+    NOW_PLAYING_DAYS = 28
+    UPCOMING_DAYS = 90
+    BUCKET_SIZE = 100
+    SYNC_INTERVAL = 6 * 3600
+    BUCKETS_KEY = 'release_calendar_v1_{day}'
+    SYNCED_KEY = 'release_calendar_synced'
+    SYNC_LOCK_KEY = 'release_calendar_sync_lock'
+    WINDOWS = {
+        'this_week': 'Releasing this week',
+        'now_playing': 'In theatres',
+        'upcoming': 'Coming soon',
+    }
+
+    def today(self):
+        return timezone.now().astimezone(self.TIMEZONE).date()
+
+    def windows(self, today):
+        """window -> (first day, last day, newest first?) for the calendar on `today`."""
+        week_start = today - timedelta(days=today.weekday())
+        return {
+            'this_week': (week_start, week_start + timedelta(days=6), False),
+            'now_playing': (today - timedelta(days=self.NOW_PLAYING_DAYS - 1), today, True),
+            'upcoming': (today + timedelta(days=1), today + timedelta(days=self.UPCOMING_DAYS), False),
+        }
+
+    # ── Syncing ──────────────────────────────────────────────────────
+
+    def sync(self, today=None, days_back=DAYS_BACK, days_ahead=DAYS_AHEAD):
+        """Upserts every Telugu release in the window from TMDB. Returns the number of releases seen."""
+        from .services import TMDBService
+        tmdb = TMDBService()
+        if not tmdb.api_key:
+            return 0
+        today = today or self.today()
+        first, last = today - timedelta(days=days_back), today + timedelta(days=days_ahead)
+
+        releases, complete, page = {}, False, 1
+        while page <= self.MAX_PAGES:
+            params = {
+                'api_key': tmdb.api_key,
+                'with_original_language': 'te',
+                'primary_release_date.gte': first.isoformat(),
+                'primary_release_date.lte': last.isoformat(),
+                'sort_by': 'primary_release_date.asc',
+                'page': page,
+            }
+            try:
+                response = tmdb.session.get(f"{tmdb.base_url}/discover/movie", params=params, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                print(f"Error syncing release calendar (page {page}): {e}")
+                break
+            for item in data.get('results', []):
+                release = self._release(item, tmdb.image_base_url)
+                if release:
+                    releases[release.movie_id] = release
+            if page >= (data.get('total_pages') or 1):
+                complete = True
+                break
+            page += 1
+
+        if releases:
+            Release.objects.bulk_create(
+                releases.values(), update_conflicts=True, unique_fields=['movie_id'],
+                update_fields=['title', 'poster_url', 'release_date', 'popularity', 'rating', 'updated_at'],
+            )
+            tmdb._remember_movies([self.as_card(release) for release in releases.values()])
+        if complete:
+            # Titles that moved out of the window (postponed, or dropped by TMDB)
+            Release.objects.filter(release_date__range=(first, last)).exclude(movie_id__in=releases).delete()
+
+        for day in (today, today + timedelta(days=1)):
+            self.build_buckets(day)
+        cache.set(self.SYNCED_KEY, True, self.SYNC_INTERVAL)
+        return len(releases)
+
+    def _release(self, item, image_base_url):
+        try:
+            released = date.fromisoformat(item.get('release_date') or '')
+        except ValueError:
+            return None
+        return Release(
+            movie_id=item['id'],
+            title=item['title'][:255],
+            poster_url=f"{image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
+            release_date=released,
+            popularity=item.get('popularity') or 0,
+            rating=item.get('vote_average'),
+        )
+
+    def sync_in_background(self):
+        """Queues a sync unless one ran within SYNC_INTERVAL or is already running."""
+        if cache.get(self.SYNCED_KEY) or not cache.add(self.SYNC_LOCK_KEY, True, 600):
+            return
+        _sync_pool.submit(self._sync_and_release)
+
+    def _sync_and_release(self):
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"Error syncing release calendar: {e}")
+        finally:
+            cache.delete(self.SYNC_LOCK_KEY)
+            connection.close()
+
+    # ── Reading ──────────────────────────────────────────────────────
+
+    def build_buckets(self, today):
+        """Computes and caches {window: [movie cards]} for the calendar as seen on `today`."""
+        buckets = {}
+        for window, (first, last, newest_first) in self.windows(today).items():
+            rows = Release.objects.filter(release_date__range=(first, last)).order_by(
+                '-release_date' if newest_first else 'release_date', '-popularity'
+            )[:self.BUCKET_SIZE]
+            buckets[window] = [self.as_card(row) for row in rows]
+        cache.set(self.BUCKETS_KEY.format(day=today.isoformat()), buckets, 2 * 86400)
+        return buckets
+
+    def buckets(self, today=None):
+        """{'this_week': [...], 'now_playing': [...], 'upcoming': [...]} for today in India."""
+        from .services import TMDBService
+        today = today or self.today()
+        self.sync_in_background()
+        found = cache.get(self.BUCKETS_KEY.format(day=today.isoformat()))
+        buckets = found if found is not None else self.build_buckets(today)
+        # Placeholders are attached per read (one query), never cached
+        TMDBService()._attach_placeholders([card for cards in buckets.values() for card in cards])
+        return buckets
+
+    def as_card(self, release):
+        return {
+            'id': release.movie_id,
+            'title': release.title,
+            'poster_url': release.poster_url,
+            'release_date': release.release_date.isoformat(),
+            'rating': release.rating or 0,
+            'original_language': 'te',
+        }
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection
+
+# Shared by every request in the process; prefetches are best effort and never waited on
+_prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='row-prefetch')
+
+
+class RowService:
+    """
+    Paginated movie rows (home rows, genre rows, search results) for
+    infinite scroll. Every page is a separate TMDB request cached on its own
+    (see TMDBService._row_request). Serving page N also schedules page N+1
+    in the background, so by the time the user scrolls to it the next page
+    is usually already cached and the row never waits on TMDB.
+    """
+
+    # row -> whether it needs an argument (genre id / search query)
+    ROWS = {
+        'recent': False,
+        'top_rated': False,
+        'popular': False,
+        'genre': True,
+        'search': True,
+    }
+    MAX_PAGE = 500
+    # Guards against the same page being scheduled by concurrent requests
+    PREFETCH_LOCK_SECONDS = 60
+
+    def page(self, row, page=1, arg=None, prefetch=True):
+        """
+        {'movies': [...], 'page': N, 'has_next': bool} for one page of a row.
+        Cards come without blur placeholders; attach them with
+        TMDBService._attach_placeholders before rendering.
+        """
+        from .services import TMDBService
+        service = TMDBService()
+        page = max(1, min(page, self.MAX_PAGE))
+        if not service.api_key or (self.ROWS[row] and not arg):
+            return {'movies': [], 'page': page, 'has_next': False}
+
+        result = service._fetch_movie_page(*service._row_request(row, page, arg))
+        has_next = page < result['total_pages']
+        if prefetch and has_next:
+            self.prefetch(row, page + 1, arg)
+        return {'movies': result['movies'], 'page': page, 'has_next': has_next}
+
+    def prefetch(self, row, page, arg=None):
+        """Warms one page in the background unless it is cached or already being fetched."""
+        from .services import TMDBService
+        cache_key = TMDBService()._row_request(row, page, arg)[2]
+        if cache.get(cache_key) is not None or not cache.add(f'row_prefetch_{cache_key}', 1, self.PREFETCH_LOCK_SECONDS):
+            return
+        _prefetch_pool.submit(self._warm, row, page, arg)
+
+    def _warm(self, row, page, arg):
+        try:
+            self.page(row, page, arg, prefetch=False)
+        except Exception as e:
+            print(f"Error prefetching {row} page {page}: {e}")
+        finally:
+            # Worker threads get their own DB connection (catalog mirroring); don't leak it
+            connection.close()
@@ -1,22 +1,26 @@
+import hashlib
 import requests
 import os
 from django.conf import settings
 from django.core.cache import cache
-from requests.adapters import HTTPAdapter
+from django.db import DatabaseError
+from .cache_service import CacheService
+from .transport_service import http_session
 from urllib3.util.retry import Retry
 
 class TMDBService:
     def __init__(self):
         self.api_key = os.environ.get('TMDB_API_KEY')
-        self.base_url = "https://api.themoviedb.org/3"
+        # Overridable to point at a stub server (see benchmark_site)
+        self.base_url = os.environ.get('TMDB_API_URL', "https://api.themoviedb.org/3")
         self.image_base_url = "https://image.tmdb.org/t/p/w500"
         self.backdrop_base_url = "https://image.tmdb.org/t/p/original"
         
         # Configure Retries
-        self.session = requests.Session()
         # Increased retries and backoff for better reliability
         retries = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        # Live, recording or replaying from cassettes depending on HTTP_TRANSPORT
+        self.session = http_session(retries=retries)
 
     def fetch_parallel(self, tasks):
         # Helper for parallel execution
@@ -34,12 +38,73 @@ class TMDBService:
                     results[key] = []
         return results
 
-    def _fetch_movies(self, url, params, cache_key):
-        # Helper to avoid repetition
+    def _remember_movies(self, movies, with_details=False):
+        # Mirror fetched titles into the local catalog so batch jobs
+        # (placeholders, similarity, ...) know about them. Only runs on cache misses.
+        from .models import Movie
+        rows = {
+            m['id']: Movie(
+                id=m['id'],
+                title=m.get('title'),
+                poster_url=m.get('poster_url'),
+                backdrop_url=m.get('backdrop_url'),
+                release_date=m['release_date'] if m.get('release_date') not in (None, '', 'N/A') else None,
+                rating=m.get('rating'),
+                original_language=m.get('original_language'),
+                details={k: v for k, v in m.items() if k != 'similar'} if with_details else None,
+            )
+            for m in movies
+        }
+        # Only overwrite what every dict carries (list endpoints have no backdrops, etc.)
+        fields = ['title', 'poster_url', 'backdrop_url', 'release_date', 'rating', 'original_language']
+        update_fields = [f for f in fields if all(f in m for m in movies)] + ['updated_at']
+        if with_details:
+            update_fields.append('details')
+        try:
+            Movie.objects.bulk_create(
+                list(rows.values()), update_conflicts=True, unique_fields=['id'], update_fields=update_fields
+            )
+        except DatabaseError as e:
+            print(f"Error saving movies to catalog: {e}")
+
+    def _index_providers(self, movie, first_look):
+        # Fresh provider data: update the provider -> movies index ("New on Aha", ...)
+        from .provider_index_service import ProviderIndexService
+        try:
+            ProviderIndexService().sync(movie, first_look=first_look)
+        except DatabaseError as e:
+            print(f"Error indexing providers for {movie['id']}: {e}")
+
+    def _attach_placeholders(self, movies):
+        # One query per batch: copy precomputed blur placeholders onto the dicts
+        from .models import Movie
+        ids = [m['id'] for m in movies]
+        if not ids:
+            return movies
+        try:
+            found = {
+                row['id']: row
+                for row in Movie.objects.filter(id__in=ids).values('id', 'poster_placeholder', 'backdrop_placeholder')
+            }
+        except DatabaseError as e:
+            print(f"Error loading placeholders: {e}")
+            return movies
+        for m in movies:
+            row = found.get(m['id'])
+            m['poster_placeholder'] = row['poster_placeholder'] if row else None
+            if 'backdrop_url' in m:
+                m['backdrop_placeholder'] = row['backdrop_placeholder'] if row else None
+        return movies
+
+    def _fetch_movie_page(self, url, params, cache_key, language=None):
+        # One page of a TMDB list endpoint as {'movies': [...], 'total_pages': N}, cached per page.
+        # `language` keeps only titles in that original language (defaults to the discover filter).
+        # Placeholders aren't cached with it; readers attach them (see _attach_placeholders)
         cached_data = cache.get(cache_key)
         if cached_data:
             return cached_data
 
+        language = language or params.get('with_original_language')
         try:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
@@ -48,7 +113,7 @@ class TMDBService:
             movies = []
             for item in data.get('results', []):
                 # Ensure strictly Telugu where applicable/possible
-                if params.get('with_original_language') == 'te' and item.get('original_language') != 'te':
+                if language and item.get('original_language') != language:
                     continue
 
                 movies.append({
@@ -57,64 +122,125 @@ class TMDBService:
                     'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
                     'release_date': item.get('release_date', 'N/A'),
                     'overview': item.get('overview', ''),
-                    'rating': item.get('vote_average', 0)
+                    'rating': item.get('vote_average', 0),
+                    'original_language': item.get('original_language'),
                 })
-            
-            cache.set(cache_key, movies, 3600) # 1 hour
-            return movies
+
+            self._remember_movies(movies)
+            # TMDB serves at most 500 pages of any list
+            result = {'movies': movies, 'total_pages': min(data.get('total_pages') or 1, 500)}
+            cache.set(cache_key, result, CacheService().timeout('movie_rows'))
+            return result
         except requests.exceptions.RequestException as e:
             print(f"Error fetching movies for {cache_key}: {e}")
-            return []
+            return {'movies': [], 'total_pages': 0}
+
+    def _fetch_movies(self, url, params, cache_key, language=None):
+        # Helper to avoid repetition
+        return self._attach_placeholders(self._fetch_movie_page(url, params, cache_key, language)['movies'])
+
+    def _row_request(self, row, page=1, arg=None):
+        """(url, params, cache_key, language) for one page of a movie row; see RowService."""
+        discover = f"{self.base_url}/discover/movie"
+        base = {'api_key': self.api_key, 'with_original_language': 'te', 'page': page}
+        keys = CacheService()
+        if row == 'popular':
+            return discover, {**base, 'sort_by': 'popularity.desc'}, keys.key('movie_rows', row, page, tags=['row:home']), None
+        if row == 'recent':
+            # Newest first up to today (in India), so the row moves on by itself every day
+            from .release_calendar_service import ReleaseCalendarService
+            today = ReleaseCalendarService().today().isoformat()
+            return discover, {
+                **base,
+                'sort_by': 'primary_release_date.desc',
+                'primary_release_date.lte': today,
+                'vote_count.gte': 0, # get everything
+            }, keys.key('movie_rows', row, today, page, tags=['row:home']), None
+        if row == 'top_rated':
+            return discover, {
+                **base,
+                'sort_by': 'vote_average.desc',
+                'vote_count.gte': 10, # Filter out noise
+            }, keys.key('movie_rows', row, page, tags=['row:home']), None
+        if row == 'genre':
+            return discover, {**base, 'with_genres': arg, 'sort_by': 'popularity.desc'}, keys.key(
+                'movie_rows', row, arg, page, tags=['row:genre']
+            ), None
+        if row == 'search':
+            # TMDB search doesn't strictly filter by lang param alone often, so filter the results instead
+            digest = hashlib.md5(arg.casefold().encode()).hexdigest()
+            return (
+                f"{self.base_url}/search/movie", {'api_key': self.api_key, 'query': arg, 'page': page},
+                keys.key('movie_rows', row, digest, page, tags=['row:search']), 'te',
+            )
+        raise ValueError(f"Unknown movie row: {row}")
 
-    def get_popular_telugu_movies(self):
+    def get_popular_telugu_movies(self, page=1):
         if not self.api_key: return []
-        return self._fetch_movies(
-            f"{self.base_url}/discover/movie",
-            {'api_key': self.api_key, 'with_original_language': 'te', 'sort_by': 'popularity.desc', 'page': 1},
-            'popular_telugu_movies'
-        )
+        return self._fetch_movies(*self._row_request('popular', page))
 
-    def get_recent_releases(self):
+    def get_recent_releases(self, page=1):
         if not self.api_key: return []
-        # 'now_playing' or sort by release_date.desc
-        # TMDB discover is good for strict language filtering
-        return self._fetch_movies(
-            f"{self.base_url}/discover/movie",
-            {
-                'api_key': self.api_key, 
-                'with_original_language': 'te', 
-                'sort_by': 'primary_release_date.desc', 
-                'primary_release_date.lte': '2026-01-11', # Ideally dynamic today's date
-                'vote_count.gte': 0, # get everything
-                'page': 1
-            },
-            'recent_telugu_movies'
-        )
+        return self._fetch_movies(*self._row_request('recent', page))
 
-    def get_top_rated_telugu_movies(self):
+    def get_top_rated_telugu_movies(self, page=1):
         if not self.api_key: return []
-        return self._fetch_movies(
-            f"{self.base_url}/discover/movie",
-            {
-                'api_key': self.api_key, 
-                'with_original_language': 'te', 
-                'sort_by': 'vote_average.desc', 
-                'vote_count.gte': 10, # Filter out noise
-                'page': 1
-            },
-            'top_rated_telugu_movies'
-        )
+        return self._fetch_movies(*self._row_request('top_rated', page))
+
+    def _stored_details(self, model, tmdb_id):
+        # Mirrored details plus their validators, for revalidating instead of re-downloading
+        try:
+            return (
+                model.objects.filter(id=tmdb_id).exclude(details=None)
+                .values('details', 'details_etag', 'details_last_modified', 'details_checked_at', 'changed_at')
+                .first()
+            )
+        except DatabaseError as e:
+            print(f"Error loading stored details for {model.__name__} {tmdb_id}: {e}")
+            return None
 
-    def get_movie_details(self, movie_id):
+    def _conditional_get(self, url, params, stored):
+        # GET that TMDB can answer with 304 Not Modified when the stored copy is current
+        headers = {}
+        if stored and stored['details_etag']:
+            headers['If-None-Match'] = stored['details_etag']
+        if stored and stored['details_last_modified']:
+            headers['If-Modified-Since'] = stored['details_last_modified']
+        response = self.session.get(url, params=params, headers=headers, timeout=10)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def _save_validators(self, model, tmdb_id, response=None):
+        # Stamp the stored copy as confirmed now, with the validators of a fresh download
+        from django.utils import timezone
+        fields = {'details_checked_at': timezone.now()}
+        if response is not None:
+            fields['details_etag'] = response.headers.get('ETag')
+            fields['details_last_modified'] = response.headers.get('Last-Modified')
+        try:
+            model.objects.filter(id=tmdb_id).update(**fields)
+        except DatabaseError as e:
+            print(f"Error saving validators for {model.__name__} {tmdb_id}: {e}")
+
+    def get_movie_details(self, movie_id, refresh=False):
         if not self.api_key:
             return None
 
-        # Check Cache
-        cache_key = f'movie_details_v2_{movie_id}' # v2 to invalidate old structure
-        cached_data = cache.get(cache_key)
+        # Check Cache (refresh=True re-fetches, e.g. to pick up provider changes)
+        cache_key = CacheService().key('movie_details', movie_id, tags=[f'movie:{movie_id}'])
+        cached_data = None if refresh else cache.get(cache_key)
         if cached_data:
-            return cached_data
-            
+            return self._with_placeholders(cached_data)
+
+        # Expired: reuse the mirrored details if the change feed says they are current,
+        # otherwise ask TMDB whether they changed before downloading them again
+        from .models import Movie
+        from .change_tracking_service import ChangeTrackingService
+        stored = self._stored_details(Movie, movie_id)
+        if stored and not refresh and ChangeTrackingService().unchanged(stored):
+            return self._finish_movie_details(dict(stored['details']), cache_key)
+
         url = f"{self.base_url}/movie/{movie_id}"
         params = {
             'api_key': self.api_key,
@@ -122,8 +248,10 @@ class TMDBService:
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._conditional_get(url, params, stored)
+            if response.status_code == 304:
+                self._save_validators(Movie, movie_id)
+                return self._finish_movie_details(dict(stored['details']), cache_key)
             data = response.json()
             
             # Process Cast
@@ -138,11 +266,9 @@ class TMDBService:
 
             # Process Directors
             directors = []
-            director_ids = []
             for crew in data.get('credits', {}).get('crew', []):
                  if crew['job'] == 'Director':
                      directors.append({'id': crew['id'], 'name': crew['name']})
-                     director_ids.append(str(crew['id']))
 
             # Process Genres
             genres = []
@@ -160,34 +286,6 @@ class TMDBService:
                     providers['rent'] = [{'name': p['provider_name'], 'logo': f"{self.image_base_url}{p['logo_path']}"} for p in wp['rent']]
                 providers['link'] = wp.get('link')
 
-            # Fetch Similar (Strict Telugu + Same Director/Cast)
-            similar = []
-            people_ids = director_ids[:1] + [c['id'] for c in cast[:2]]
-            people_str = "|".join(str(p) for p in people_ids if p)
-
-            if people_str:
-                similar_url = f"{self.base_url}/discover/movie"
-                similar_params = {
-                    'api_key': self.api_key,
-                    'with_original_language': 'te',
-                    'with_people': people_str, 
-                    'sort_by': 'popularity.desc',
-                    'page': 1,
-                }
-                try:
-                     s_resp = self.session.get(similar_url, params=similar_params, timeout=5)
-                     s_data = s_resp.json()
-                     for item in s_data.get('results', [])[:12]:
-                         if item['id'] == movie_id: continue # Skip self
-                         similar.append({
-                            'id': item['id'],
-                            'title': item['title'],
-                            'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
-                            'rating': item.get('vote_average', 0)
-                        })
-                except Exception as e:
-                    print(f"Error fetching refined similar: {e}")
-
             movie_data = {
                 'id': data['id'],
                 'title': data['title'],
@@ -197,27 +295,95 @@ class TMDBService:
                 'release_date': data.get('release_date', 'N/A'),
                 'runtime': data.get('runtime', 0),
                 'rating': data.get('vote_average', 0),
+                'original_language': data.get('original_language'),
+                'popularity': data.get('popularity', 0),
                 'imdb_id': data.get('external_ids', {}).get('imdb_id'),
                 'genres': genres,
                 'directors': directors,
                 'cast': cast,
-                'similar': similar,
                 'providers': providers
             }
-            
-            cache.set(cache_key, movie_data, 86400)
-            return movie_data
+
+            self._remember_movies([movie_data], with_details=True)
+            self._save_validators(Movie, movie_id, response)
+            # No details mirrored before this download: its offers' start dates are unknown
+            self._index_providers(movie_data, first_look=stored is None)
+            return self._finish_movie_details(movie_data, cache_key)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching movie details: {e}")
             return None
 
+    def _finish_movie_details(self, movie_data, cache_key):
+        # Shared tail of a download and a reuse: similar rail, cache, placeholders
+        movie_data['similar'] = self._similar_movies(movie_data)
+        cache.set(cache_key, movie_data, CacheService().timeout('movie_details'))
+        return self._with_placeholders(movie_data)
+
+    def _with_placeholders(self, movie_data):
+        # After every cache read, so placeholders built since show up at once
+        self._attach_placeholders([movie_data, *movie_data['similar']])
+        return movie_data
+
+    def _similar_movies(self, movie_data):
+        # Fetch Similar (Strict Telugu + Same Director/Cast)
+        movie_id = movie_data['id']
+        people_ids = [d['id'] for d in movie_data['directors'][:1]] + [c['id'] for c in movie_data['cast'][:2]]
+        people_str = "|".join(str(p) for p in people_ids if p)
+
+        # Skip the discover call when the community neighbours will be used instead
+        from .models import SimilarMovie
+        if not people_str or SimilarMovie.objects.filter(movie_id=movie_id).exists():
+            return []
+        # Kept longer than the details so reusing them doesn't cost a discover call
+        cache_key = CacheService().key('similar_movies', movie_id, tags=[f'movie:{movie_id}'])
+        similar = cache.get(cache_key)
+        if similar is not None:
+            return similar
+
+        similar = []
+        similar_url = f"{self.base_url}/discover/movie"
+        similar_params = {
+            'api_key': self.api_key,
+            'with_original_language': 'te',
+            'with_people': people_str, 
+            'sort_by': 'popularity.desc',
+            'page': 1,
+        }
+        try:
+             s_resp = self.session.get(similar_url, params=similar_params, timeout=5)
+             s_data = s_resp.json()
+             for item in s_data.get('results', [])[:12]:
+                 if item['id'] == movie_id: continue # Skip self
+                 similar.append({
+                    'id': item['id'],
+                    'title': item['title'],
+                    'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
+                    'rating': item.get('vote_average', 0),
+                    'original_language': item.get('original_language'),
+                })
+        except Exception as e:
+            print(f"Error fetching refined similar: {e}")
+            return []
+        self._remember_movies(similar)
+        cache.set(cache_key, similar, CacheService().timeout('similar_movies'))
+        return similar
+
     def get_person_details(self, person_id):
         if not self.api_key: return None
         
-        cache_key = f'person_details_{person_id}'
+        cache_key = CacheService().key('person_details', person_id, tags=[f'person:{person_id}'])
         cached = cache.get(cache_key)
         if cached: return cached
 
+        # Same revalidation as movie details. A reused person leaves the filmography
+        # index to FilmographyService, which fetches the credits alone if it expired.
+        from .models import Person
+        from .change_tracking_service import ChangeTrackingService
+        stored = self._stored_details(Person, person_id)
+        if stored and ChangeTrackingService().unchanged(stored):
+            cache.set(cache_key, stored['details'], CacheService().timeout('person_details'))
+            return stored['details']
+
         url = f"{self.base_url}/person/{person_id}"
         params = {
             'api_key': self.api_key,
@@ -225,44 +391,16 @@ class TMDBService:
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._conditional_get(url, params, stored)
+            if response.status_code == 304:
+                self._save_validators(Person, person_id)
+                cache.set(cache_key, stored['details'], CacheService().timeout('person_details'))
+                return stored['details']
             data = response.json()
 
-            # Process Filmography
-            # Combine cast and crew? Or just cast? Usually cast is what people want.
-            # Let's do Cast + Directing credits
-            
-            credits = data.get('movie_credits', {})
-            filmography = []
-            
-            # Cast credits
-            for item in credits.get('cast', []):
-                 filmography.append({
-                     'id': item['id'],
-                     'title': item.get('title'),
-                     'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
-                     'character': item.get('character'),
-                     'year': item.get('release_date', '9999')[:4] if item.get('release_date') else 'N/A',
-                     'rating': item.get('vote_average', 0),
-                     'role': 'Actor'
-                 })
-                 
-            # Crew credits (Director only to avoid noise)
-            for item in credits.get('crew', []):
-                if item.get('job') == 'Director':
-                     filmography.append({
-                     'id': item['id'],
-                     'title': item.get('title'),
-                     'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
-                     'job': 'Director',
-                     'year': item.get('release_date', '9999')[:4] if item.get('release_date') else 'N/A',
-                     'rating': item.get('vote_average', 0),
-                     'role': 'Director'
-                 })
-
-            # Sort by year desc
-            filmography.sort(key=lambda x: x['year'], reverse=True)
+            # Credits go into the filmography index (same request, so the first page render costs one call)
+            from .filmography_service import FilmographyService
+            FilmographyService().build(person_id, data.get('movie_credits', {}))
 
             person_data = {
                 'id': data['id'],
@@ -270,62 +408,80 @@ class TMDBService:
                 'biography': data.get('biography', ''),
                 'birthday': data.get('birthday', 'N/A'),
                 'place_of_birth': data.get('place_of_birth', 'N/A'),
-                'profile_url': f"{self.backdrop_base_url}{data['profile_path']}" if data.get('profile_path') else None,
-                'movies': filmography
+                # Shown at 300px; w500 instead of the multi-megabyte original
+                'profile_url': f"{self.image_base_url}{data['profile_path']}" if data.get('profile_path') else None,
             }
+
+            try:
+                Person.objects.update_or_create(id=person_id, defaults={'name': data['name'], 'details': person_data})
+            except DatabaseError as e:
+                print(f"Error saving person {person_id}: {e}")
+            self._save_validators(Person, person_id, response)
             
-            cache.set(cache_key, person_data, 86400)
+            cache.set(cache_key, person_data, CacheService().timeout('person_details'))
             return person_data
 
         except Exception as e:
             print(f"Error fetching person: {e}")
             return None
 
-    def search_telugu_movies(self, query):
-        if not self.api_key:
+    def get_person_credits(self, person_id):
+        # Raw TMDB movie_credits, for rebuilding a filmography index that expired before the person did
+        if not self.api_key: return None
+        try:
+            response = self.session.get(
+                f"{self.base_url}/person/{person_id}/movie_credits", params={'api_key': self.api_key}, timeout=10
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            print(f"Error fetching credits for person {person_id}: {e}")
+            return None
+
+    def search_telugu_movies(self, query, page=1):
+        if not self.api_key or not query:
             return []
-            
-        endpoint = f"{self.base_url}/search/movie"
-        params = {
-            'api_key': self.api_key,
-            'query': query,
-            # 'language': 'te'  # TMDB search doesn't strictly filter by lang param alone often
-        }
+        return self._fetch_movies(*self._row_request('search', page, query))
+
+    def find_movie(self, title, year=None):
+        """Best TMDB match for a title and release year (any language), as a movie card, or None."""
+        if not self.api_key:
+            return None
+
+        digest = hashlib.md5(f"{title.casefold()}|{year}".encode()).hexdigest()
+        cache_key = CacheService().key('find_movie', digest)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached or None
 
+        endpoint = f"{self.base_url}/search/movie"
+        params = {'api_key': self.api_key, 'query': title}
+        if year:
+            params['year'] = year
         try:
             response = self.session.get(endpoint, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            movies = []
-            for item in data.get('results', []):
-                # Filter strictly for Telugu content
-                if item.get('original_language') != 'te': 
-                    continue
-                
-                movies.append({
-                    'id': item['id'],
-                    'title': item['title'],
-                    'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
-                    'release_date': item.get('release_date', 'N/A'),
-                    'overview': item.get('overview', ''),
-                    'rating': item.get('vote_average', 0)
-                })
-            return movies
+            results = response.json().get('results', [])
         except requests.exceptions.RequestException as e:
-            print(f"Error searching movies: {e}")
-            return []
+            print(f"Error finding movie {title!r}: {e}")
+            return None
+
+        movie = None
+        if results:
+            item = results[0]
+            movie = {
+                'id': item['id'],
+                'title': item['title'],
+                'poster_url': f"{self.image_base_url}{item['poster_path']}" if item.get('poster_path') else None,
+                'release_date': item.get('release_date', 'N/A'),
+                'rating': item.get('vote_average', 0),
+                'original_language': item.get('original_language'),
+            }
+            self._remember_movies([movie])
+        # Misses are cached too so re-imports don't search for them again
+        cache.set(cache_key, movie or {}, CacheService().timeout('find_movie'))
+        return movie
 
-    def get_movies_by_genre(self, genre_id):
+    def get_movies_by_genre(self, genre_id, page=1):
         if not self.api_key: return []
-        return self._fetch_movies(
-            f"{self.base_url}/discover/movie",
-            {
-                'api_key': self.api_key, 
-                'with_original_language': 'te', 
-                'with_genres': genre_id,
-                'sort_by': 'popularity.desc', 
-                'page': 1
-            },
-            f'genre_{genre_id}_movies'
-        )
+        return self._fetch_movies(*self._row_request('genre', page, genre_id))
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Review
+from .models import Favorite, Watched
+from .interaction_service import InteractionService
+from .provider_index_service import ProviderIndexService
+from .trending_service import TrendingService
+
+
+@receiver(post_save, sender=Watched)
+def watched_trending(sender, instance, created, **kwargs):
+    if created:
+        TrendingService().record(instance.movie_id, 'watched', instance.created_at, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Favorite)
+def favorite_trending(sender, instance, created, **kwargs):
+    if created:
+        TrendingService().record(instance.movie_id, 'favorite', instance.created_at, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Review)
+def review_trending(sender, instance, created, **kwargs):
+    if created:
+        TrendingService().record(instance.movie_id, 'review', instance.created_at, user_id=instance.user_id)
+
+
+# Keep movies.Interaction in step with the three source tables
+INTERACTION_KINDS = {Watched: 'watched', Favorite: 'favorite', Review: 'review'}
+
+
+@receiver(post_save, sender=Watched)
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=Review)
+def interaction_saved(sender, instance, created, **kwargs):
+    if created:
+        InteractionService().record(INTERACTION_KINDS[sender], instance.user_id, instance.movie_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Watched)
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=Review)
+def interaction_deleted(sender, instance, **kwargs):
+    InteractionService().clear(INTERACTION_KINDS[sender], instance.user_id, instance.movie_id)
+
+
+# Community rating shown and sorted on the provider pages
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def provider_rating(sender, instance, **kwargs):
+    ProviderIndexService().refresh_ratings(instance.movie_id)
@@ -1,3 +1,18 @@
-from django.test import TestCase
+from django.test import TransactionTestCase, override_settings
 
-# Create your tests here.
+from .load_test_service import LoadTestService, StubCatalog, summarize
+
+
+@override_settings(ACHIEVEMENTS_ASYNC=False)
+class LoadTestScenarioTests(TransactionTestCase):
+    # Scenarios that only touch our own database, so no stub upstream is needed.
+    # Each checks its response body, so an empty search or export fails here too
+    LOCAL_SCENARIOS = {'profile', 'export', 'admin_export', 'review_search', 'admin_dashboard'}
+
+    def test_local_scenarios_run_without_errors(self):
+        service = LoadTestService(StubCatalog(movies=40, people=5), seed=1)
+        service.seed_data(users=3)
+        elapsed = service.run(1, iterations=60, only=self.LOCAL_SCENARIOS)
+        endpoints = summarize(service.samples, elapsed)
+        self.assertTrue({'profile', 'profile_list', 'export', 'admin_export', 'review_search'} <= set(endpoints))
+        self.assertEqual({name: stats['errors'] for name, stats in endpoints.items() if stats['errors']}, {})
@@ -0,0 +1,264 @@
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+LIVE = 'live'
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Never written to a cassette, and ignored when matching requests
+SECRET_PARAMS = {'api_key', 'key'}
+# Response headers worth replaying; the rest is dropped to keep cassettes small
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+# One store per cassette directory, shared by every session in the process
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _option(name, default):
+    # Settings when running under Django, environment otherwise (standalone scripts)
+    if settings.configured:
+        return getattr(settings, name, default)
+    return os.environ.get(name, default)
+
+
+def fingerprint(request, conditional=True):
+    """Identifies a request by method, URL without secrets, body and (optionally) validators."""
+    parts = urlsplit(request.url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS)
+    body = request.body or b''
+    if isinstance(body, str):
+        body = body.encode()
+    if body and 'json' in request.headers.get('Content-Type', ''):
+        # Same payload, same key, whatever the dict order was
+        body = json.dumps(json.loads(body), sort_keys=True).encode()
+    digest = hashlib.sha1()
+    for piece in (request.method, parts.netloc, parts.path, urlencode(query)):
+        digest.update(piece.encode() + b'\0')
+    digest.update(body)
+    for header in CONDITIONAL_HEADERS:
+        # conditional=False gives the key of the same request sent without validators
+        digest.update(b'\0' + (request.headers.get(header, '') if conditional else '').encode())
+    return digest.hexdigest()[:24]
+
+
+def public_url(url):
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class CassetteStore:
+    """
+    Recorded responses on disk: one gzipped JSON-lines file per host, e.g.
+    `api.themoviedb.org.jsonl.gz`, with one entry per distinct request.
+    Entries are appended while recording (a re-recorded request that comes
+    back unchanged is not written again) and the last entry for a key wins
+    on load. API keys never reach the file.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._entries = {}
+        self._writers = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _path(self, host):
+        return os.path.join(self.directory, f"{host.replace(':', '_')}.jsonl.gz")
+
+    def _load(self, host):
+        if host in self._entries:
+            return self._entries[host]
+        entries = {}
+        path = self._path(host)
+        if os.path.exists(path):
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry
+            except (EOFError, json.JSONDecodeError):
+                # A recorder that was killed leaves a truncated tail; keep what was read
+                pass
+        self._entries[host] = entries
+        return entries
+
+    def get(self, host, key):
+        with self._lock:
+            return self._load(host).get(key)
+
+    def put(self, host, entry):
+        with self._lock:
+            entries = self._load(host)
+            previous = entries.get(entry['key'])
+            if previous and all(previous.get(f) == entry.get(f) for f in ('status', 'body', 'body_b64')):
+                return
+            entries[entry['key']] = entry
+            writer = self._writers.get(host)
+            if writer is None:
+                os.makedirs(self.directory, exist_ok=True)
+                writer = self._writers[host] = gzip.open(self._path(host), 'at', encoding='utf-8')
+            writer.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            # Sync-flush so a crashed recorder still leaves readable entries
+            writer.flush()
+
+    def hosts(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len('.jsonl.gz')] for name in os.listdir(self.directory) if name.endswith('.jsonl.gz'))
+
+    def count(self, host):
+        with self._lock:
+            return len(self._load(host))
+
+    def close(self):
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+
+
+def cassette_store(directory=None):
+    directory = directory or _option('HTTP_CASSETTE_DIR', None) or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cassettes'
+    )
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = CassetteStore(directory)
+        return _stores[directory]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests for real and writes every response to the cassette store."""
+
+    def __init__(self, store, **kwargs):
+        self.store = store
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        if not kwargs.get('stream'):
+            entry = {
+                'key': fingerprint(request),
+                'method': request.method,
+                'url': public_url(request.url),
+                'status': response.status_code,
+                'headers': {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+                'elapsed_ms': round((time.perf_counter() - started) * 1000),
+            }
+            if 'json' in response.headers.get('Content-Type', '') or 'text' in response.headers.get('Content-Type', ''):
+                entry['body'] = response.content.decode(response.encoding or 'utf-8', 'replace')
+            else:
+                entry['body_b64'] = base64.b64encode(response.content).decode()
+            self.store.put(urlsplit(request.url).netloc, entry)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests from the cassette store without touching the network.
+
+    `latency` is 'recorded' (sleep as long as the real request took), a
+    number of milliseconds, or a 'min-max' range. `error_rate` is the share
+    of requests that fail instead, as a timeout, a connection error or a
+    503, to exercise the error paths. A conditional request with no
+    recording of its own gets the unconditional recording. Anything else
+    unrecorded fails like an unreachable host.
+    """
+
+    def __init__(self, store, latency='recorded', error_rate=0.0, seed=None):
+        super().__init__()
+        self.store = store
+        self.latency = str(latency)
+        self.error_rate = float(error_rate)
+        self.random = random.Random(seed)
+
+    def _delay(self, entry):
+        if self.latency == 'recorded':
+            ms = entry.get('elapsed_ms', 0) if entry else 0
+        elif '-' in self.latency:
+            low, high = (float(v) for v in self.latency.split('-', 1))
+            ms = self.random.uniform(low, high)
+        else:
+            ms = float(self.latency or 0)
+        if ms > 0:
+            time.sleep(ms / 1000)
+        return ms
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        host = urlsplit(request.url).netloc
+        entry = self.store.get(host, fingerprint(request)) or self.store.get(host, fingerprint(request, conditional=False))
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            failure = self.random.choice(['timeout', 'connection', 'unavailable'])
+            self._delay(entry)
+            if failure == 'timeout':
+                raise requests.exceptions.ReadTimeout(f"Injected timeout for {public_url(request.url)}", request=request)
+            if failure == 'connection':
+                raise requests.exceptions.ConnectionError(f"Injected connection error for {public_url(request.url)}", request=request)
+            entry = {'status': 503, 'headers': {'Content-Type': 'application/json'}, 'body': '{"status_message": "Injected error"}'}
+        elif entry is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recording for {request.method} {public_url(request.url)}", request=request
+            )
+
+        ms = self._delay(entry)
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = HTTPStatus(entry['status']).phrase
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = (
+            base64.b64decode(entry['body_b64']) if 'body_b64' in entry else (entry.get('body') or '').encode('utf-8')
+        )
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(milliseconds=ms)
+        return response
+
+    def close(self):
+        pass
+
+
+def http_session(retries=None, mode=None):
+    """
+    A requests.Session for talking to TMDB and Ollama, with the transport
+    picked by HTTP_TRANSPORT: 'live' (default), 'record' (live, and every
+    response saved to the cassettes) or 'replay' (cassettes only, no
+    network). `retries` (a urllib3 Retry) applies to live and record.
+    """
+    mode = mode or _option('HTTP_TRANSPORT', LIVE)
+    retries = retries if retries is not None else 0
+    if mode == REPLAY:
+        adapter = ReplayAdapter(
+            cassette_store(),
+            latency=_option('HTTP_REPLAY_LATENCY', 'recorded'),
+            error_rate=_option('HTTP_REPLAY_ERROR_RATE', 0),
+            seed=_option('HTTP_REPLAY_SEED', None),
+        )
+    elif mode == RECORD:
+        adapter = RecordingAdapter(cassette_store(), max_retries=retries)
+    else:
+        adapter = HTTPAdapter(max_retries=retries)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
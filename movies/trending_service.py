@@ -0,0 +1,126 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from reviews.models import Review
+from .models import Favorite, Movie, TrendingMovie, Watched
+
+
+class TrendingService:
+    """
+    "Trending on ManaCine": per-movie activity with exponential decay.
+
+    A movie's score is sum(weight * exp(-rate * age)) over its events. We store
+    log(sum(weight * exp(rate * (t - EPOCH)))) instead, which never needs
+    rewriting as time passes: recording an event is a single log-add-exp
+    UPDATE, every movie shares the same decay factor so ORDER BY log_score is
+    the trending order, and the actual decayed score is only computed when
+    displayed.
+
+    A user's event counts once per movie and kind within DEBOUNCE_SECONDS, so
+    toggling a favorite off and on again can't pump a movie's score.
+    """
+
+    EPOCH = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+    HALF_LIFE_DAYS = 3
+    WEIGHTS = {'watched': 1.0, 'favorite': 1.0, 'review': 1.5}
+    # Movies whose decayed score dropped below this are no longer trending
+    MIN_SCORE = 0.5
+    CACHE_KEY = 'trending_movies'
+    DEBOUNCE_SECONDS = 7 * 86400
+
+    def __init__(self):
+        self.rate = math.log(2) / (self.HALF_LIFE_DAYS * 86400)
+
+    def _log_value(self, kind, at):
+        return math.log(self.WEIGHTS[kind]) + self.rate * (at - self.EPOCH).total_seconds()
+
+    def record(self, movie_id, kind, at=None, user_id=None):
+        if user_id is not None and not cache.add(f'trending_seen:{kind}:{user_id}:{movie_id}', True, self.DEBOUNCE_SECONDS):
+            return
+        value = self._log_value(kind, at or timezone.now())
+        _, created = TrendingMovie.objects.get_or_create(movie_id=movie_id, defaults={'log_score': value})
+        if not created:
+            # log(e^a + e^b) = max(a, b) + log(1 + e^-|a - b|), evaluated in the database
+            new = Value(value, output_field=FloatField())
+            TrendingMovie.objects.filter(movie_id=movie_id).update(
+                log_score=Greatest(F('log_score'), new) + Ln(1 + Exp(-Abs(F('log_score') - new)))
+            )
+
+    def score(self, log_score, now=None):
+        """Decayed score at `now` for a stored log_score."""
+        return math.exp(log_score - self.rate * ((now or timezone.now()) - self.EPOCH).total_seconds())
+
+    def top(self, limit=20, use_cache=True):
+        """Top trending movies as cards (with their decayed 'score'), best first."""
+        if use_cache:
+            cached = cache.get(self.CACHE_KEY)
+            if cached is not None:
+                return cached[:limit]
+
+        now = timezone.now()
+        threshold = math.log(self.MIN_SCORE) + self.rate * (now - self.EPOCH).total_seconds()
+        rows = list(
+            TrendingMovie.objects.filter(log_score__gte=threshold)
+            .order_by('-log_score')
+            .values_list('movie_id', 'log_score')[:limit]
+        )
+        catalog = Movie.objects.in_bulk([movie_id for movie_id, _ in rows])
+        movies = [
+            {
+                'id': movie_id,
+                'title': catalog[movie_id].title,
+                'poster_url': catalog[movie_id].poster_url,
+                'poster_placeholder': catalog[movie_id].poster_placeholder,
+                'release_date': catalog[movie_id].release_date,
+                'rating': catalog[movie_id].rating or 0,
+                'score': round(self.score(log_score, now), 2),
+            }
+            for movie_id, log_score in rows
+            if movie_id in catalog
+        ]
+        if use_cache:
+            cache.set(self.CACHE_KEY, movies, 60)
+        return movies
+
+    def rebuild(self):
+        """Replays every Watched/Favorite/Review event. Returns the number of movies scored."""
+        movie_ids, values = [], []
+        for kind, model in (('watched', Watched), ('favorite', Favorite), ('review', Review)):
+            events = list(model.objects.values_list('movie_id', 'created_at'))
+            if not events:
+                continue
+            ids, times = zip(*events)
+            seconds = np.array([(t - self.EPOCH).total_seconds() for t in times])
+            movie_ids.append(np.array(ids, dtype=np.int64))
+            values.append(math.log(self.WEIGHTS[kind]) + self.rate * seconds)
+        if not movie_ids:
+            TrendingMovie.objects.all().delete()
+            return 0
+
+        movie_ids = np.concatenate(movie_ids)
+        values = np.concatenate(values)
+        order = np.argsort(movie_ids, kind='stable')
+        movie_ids, values = movie_ids[order], values[order]
+        unique_ids, starts = np.unique(movie_ids, return_index=True)
+        # Per-movie log-sum-exp, shifted by each group's max for stability
+        group_max = np.maximum.reduceat(values, starts)
+        counts = np.diff(np.append(starts, len(values)))
+        sums = np.add.reduceat(np.exp(values - np.repeat(group_max, counts)), starts)
+        log_scores = group_max + np.log(sums)
+
+        # Readers never see an empty or half-written table
+        with transaction.atomic():
+            TrendingMovie.objects.all().delete()
+            TrendingMovie.objects.bulk_create(
+                [TrendingMovie(movie_id=int(m), log_score=float(s)) for m, s in zip(unique_ids, log_scores)],
+                batch_size=1000,
+            )
+        cache.delete(self.CACHE_KEY)
+        return len(unique_ids)
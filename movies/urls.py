@@ -4,13 +4,21 @@ from reviews import views as review_views
 
 urlpatterns = [
     path('', views.home, name='movie-home'),
+    path('browse/', views.browse, name='browse'),
+    path('releases/', views.release_calendar, name='release-calendar'),
+    path('rows/<str:row>/', views.movie_row, name='movie-row'),
     path('movie/<int:movie_id>/', views.movie_detail, name='movie-detail'),
     path('toggle-favorite/<int:movie_id>/', views.toggle_favorite, name='toggle-favorite'),
     path('toggle-watched/<int:movie_id>/', views.toggle_watched, name='toggle-watched'),
     path('quiz/<int:movie_id>/', views.take_quiz, name='take-quiz'),
     path('movie/<int:movie_id>/review/', review_views.add_review, name='add-review'),
     path('review/<int:review_id>/edit/', review_views.edit_review, name='edit-review'),
+    path('reviews/search/', review_views.search_reviews, name='search-reviews'),
     path('person/<int:person_id>/', views.person_detail, name='person-detail'),
+    path('person/<int:person_id>/filmography/', views.person_filmography, name='person-filmography'),
     path('fan-corner/', views.fan_corner, name='fan-corner'),
+    path('watch/', views.watch_providers, name='watch-providers'),
+    path('watch/<slug:provider>/', views.watch_provider, name='watch-provider'),
     path('admin-dashboard/', views.admin_dashboard, name='admin-dashboard'),
+    path('admin-dashboard/export/<str:dataset>/', views.admin_export, name='admin-export'),
 ]
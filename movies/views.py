@@ -1,85 +1,166 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from .services import TMDBService
+from .cache_service import CacheService
+from .export_service import ExportService
+from .interaction_service import InteractionService
+from .recommendation_service import RecommendationService
+from .trending_service import TrendingService
+from .rate_limit_service import RateLimitService, rate_limited
+from .row_service import RowService
+from .release_calendar_service import ReleaseCalendarService
 from reviews.models import Review
 from reviews.forms import ReviewForm
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Count, Avg, Max, Min
+from django.db.models import Count, Avg, F, Max, Min
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
+from urllib.parse import urlencode
+import time
 
+# TMDB genre IDs the old home pills linked to, for /?genre=<id> bookmarks
+LEGACY_GENRE_IDS = {
+    28: 'Action', 35: 'Comedy', 18: 'Drama', 10749: 'Romance', 53: 'Thriller', 27: 'Horror', 10751: 'Family',
+}
+
+
+@rate_limited('search', when=lambda request: bool(request.GET.get('q')))
 def home(request):
     service = TMDBService()
     query = request.GET.get('q')
     genre_id = request.GET.get('genre')
-    
-    context = {'query': query, 'genre': genre_id}
-    
+    if genre_id and not query:
+        # Genre browsing moved to the faceted browse page
+        name = LEGACY_GENRE_IDS.get(int(genre_id)) if genre_id.isdigit() else genre_id
+        return redirect(f"{reverse('browse')}?{urlencode({'genre': name})}" if name else 'browse')
+
+    context = {'query': query}
     # Common Telugu Genres
-    genres_data = [
-        {'id': 28, 'name': 'Action'},
-        {'id': 35, 'name': 'Comedy'},
-        {'id': 18, 'name': 'Drama'},
-        {'id': 10749, 'name': 'Romance'},
-        {'id': 53, 'name': 'Thriller'},
-        {'id': 27, 'name': 'Horror'},
-        {'id': 10751, 'name': 'Family'}
-    ]
-    
-    # Mark active
-    for g in genres_data:
-        g['active'] = (str(g['id']) == str(genre_id)) if genre_id else False
-        
-    context['genres'] = genres_data
+    context['genres'] = list(LEGACY_GENRE_IDS.values())
     
+    rows = RowService()
     if query:
-        context['search_results'] = service.search_telugu_movies(query)
-    elif genre_id:
-        context['search_results'] = service.get_movies_by_genre(genre_id)
-        context['is_genre_filter'] = True
-        # Find genre name
-        for g in context['genres']:
-            if str(g['id']) == str(genre_id):
-                context['genre_name'] = g['name']
-                break
+        results = rows.page('search', arg=query)
+        context['search_results'] = service._attach_placeholders(results['movies'])
+        context['search_has_next'] = results['has_next']
     else:
-        # Parallel Fetch for Instant Load
+        # Parallel Fetch for Instant Load; each row also starts prefetching its second page
         tasks = [
-            ('recent', service.get_recent_releases, []),
-            ('top', service.get_top_rated_telugu_movies, []),
-            ('popular', service.get_popular_telugu_movies, [])
+            ('recent', rows.page, ['recent']),
+            ('top', rows.page, ['top_rated']),
+            ('popular', rows.page, ['popular'])
         ]
         results = service.fetch_parallel(tasks)
         
-        context['recent_releases'] = results.get('recent', [])
-        context['top_rated'] = results.get('top', [])
-        context['popular_movies'] = results.get('popular', [])
+        # Precomputed by `build_for_you`; empty for anonymous and cold-start users
+        context['for_you'] = RecommendationService().for_you(request.user)
+        context['trending'] = TrendingService().top()
+        # Precomputed calendar bucket; no TMDB call on the request path
+        context['coming_soon'] = ReleaseCalendarService().buckets()['upcoming'][:20]
+        context['recent_releases'] = (results.get('recent') or {}).get('movies', [])
+        context['top_rated'] = (results.get('top') or {}).get('movies', [])
+        context['popular_movies'] = (results.get('popular') or {}).get('movies', [])
+        # One query for all three rows, here rather than in the fetch threads
+        service._attach_placeholders(context['recent_releases'] + context['top_rated'] + context['popular_movies'])
+        context['has_next'] = {
+            row: (results.get(key) or {}).get('has_next', False)
+            for key, row in [('recent', 'recent'), ('top', 'top_rated'), ('popular', 'popular')]
+        }
         
     return render(request, 'movies/home.html', context)
 
+
+@rate_limited('search', when=lambda request: bool(request.GET.get('q')))
+def movie_row(request, row):
+    # Further pages of a home / genre / search row for infinite scroll: card HTML, or JSON with ?format=json
+    from django.http import Http404, JsonResponse
+    if row not in RowService.ROWS:
+        raise Http404
+    page = request.GET.get('page', '2')
+    page = int(page) if page.isdigit() else 2
+    arg = request.GET.get('q') if row == 'search' else request.GET.get('genre')
+    results = RowService().page(row, page=page, arg=arg)
+    TMDBService()._attach_placeholders(results['movies'])
+    if request.GET.get('format') == 'json':
+        response = JsonResponse(results)
+    else:
+        response = render(request, 'movies/row_cards.html', {'movies': results['movies'], 'grid': row == 'search'})
+    response['X-Has-Next'] = 'true' if results['has_next'] else 'false'
+    return response
+
+
+def release_calendar(request):
+    # This week / in theatres / coming soon, from the day's precomputed buckets
+    buckets = ReleaseCalendarService().buckets()
+    sections = [(window, label, buckets[window]) for window, label in ReleaseCalendarService.WINDOWS.items()]
+    return render(request, 'movies/releases.html', {'sections': sections})
+
+
+def browse(request):
+    # Any combination of genres, years, rating and providers over the local catalog
+    from .browse_service import BrowseService
+
+    def number(name, cast=int):
+        try:
+            return cast(request.GET.get(name, ''))
+        except ValueError:
+            return None
+
+    genres = request.GET.getlist('genre')
+    providers = request.GET.getlist('provider')
+    results = BrowseService().search(
+        genres=genres,
+        providers=providers,
+        year_from=number('year_from'),
+        year_to=number('year_to'),
+        min_rating=number('rating', float),
+        language=request.GET.get('lang') or BrowseService.DEFAULT_LANGUAGE,
+        sort=request.GET.get('sort', 'newest'),
+        page=number('page') or 1,
+    )
+    params = request.GET.copy()
+    params.pop('page', None)
+    return render(request, 'movies/browse.html', {
+        'results': results,
+        'selected_genres': genres,
+        'selected_providers': providers,
+        'year_from': number('year_from'),
+        'year_to': number('year_to'),
+        'min_rating': number('rating', float),
+        'sort': request.GET.get('sort', 'newest'),
+        'sorts': BrowseService.SORTS.items(),
+        'querystring': params.urlencode(),
+    })
+
 def movie_detail(request, movie_id):
     service = TMDBService()
     movie = service.get_movie_details(movie_id)
+
+    # Prefer what our own community watched together; fall back to TMDB's people-based list
+    similar = RecommendationService().similar_movies(movie_id)
+    if not similar and movie:
+        similar = movie['similar']
     
-    reviews = Review.objects.filter(movie_id=movie_id).order_by('-created_at')
+    reviews = Review.objects.filter(movie_id=movie_id).select_related('user').order_by('-created_at')
     
-    is_favorite = False
-    is_watched = False
+    # One lookup for watched/favorite/reviewed; the review itself only when there is one
+    interaction = InteractionService().get(request.user, movie_id)
+    is_favorite = bool(interaction and interaction.is_favorite)
+    is_watched = bool(interaction and interaction.is_watched)
     user_review = None
-    if request.user.is_authenticated:
-        from movies.models import Favorite, Watched
-        is_favorite = Favorite.objects.filter(user=request.user, movie_id=movie_id).exists()
-        is_watched = Watched.objects.filter(user=request.user, movie_id=movie_id).exists()
+    if interaction and interaction.is_reviewed:
         user_review = Review.objects.filter(user=request.user, movie_id=movie_id).first()
     
     form = ReviewForm()
 
     return render(request, 'movies/detail.html', {
         'movie': movie, 
+        'similar': similar,
         'reviews': reviews,
         'form': form,
-        'is_favorite': is_favorite,
+        'is_favorited': is_favorite,
         'is_watched': is_watched,
         'user_review': user_review,
     })
@@ -94,29 +175,8 @@ def toggle_favorite(request, movie_id):
         favorite.delete()
         messages.success(request, 'Removed from favorites.')
     else:
-        # Fetch metadata to save
-        service = TMDBService()
-        movie = service.get_movie_details(movie_id)
-        if movie:
-            favorite.title = movie.get('title')
-            favorite.poster_url = movie.get('poster_url')
-            favorite.save()
-
-            # Award FDFS Badge check
-            release_date_str = movie.get('release_date')
-            if release_date_str and release_date_str != 'N/A':
-                try:
-                    from datetime import datetime
-                    from django.utils import timezone
-                    release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                    now = timezone.now().date()
-                    days_diff = (now - release_date).days
-                    if 0 <= days_diff <= 7:
-                        request.user.profile.fdfs_badge = True
-                        request.user.profile.save()
-                        messages.success(request, "Congratulations! You earned the FDFS Badge! 🎉")
-                except ValueError:
-                    pass
+        # Make sure the catalog has its title and poster for the profile page
+        TMDBService().get_movie_details(movie_id)
 
         messages.success(request, 'Added to favorites!')
     
@@ -138,6 +198,7 @@ def toggle_watched(request, movie_id):
         return redirect('take-quiz', movie_id=movie_id)
 
 @login_required
+@rate_limited('quiz')
 def take_quiz(request, movie_id):
     from .quiz_service import QuizService
     from movies.models import Watched
@@ -154,113 +215,67 @@ def take_quiz(request, movie_id):
         messages.error(request, "Movie not found.")
         return redirect('home')
 
+    quiz_service = QuizService()
+
     if request.method == 'POST':
         # Verify Answers
-        quiz_data = request.session.get(f'quiz_{movie_id}')
-        if not quiz_data:
+        attempt = quiz_service.get_attempt(request.user, movie_id, request.POST.get('attempt'))
+        if not attempt:
             messages.error(request, "Quiz session expired. Please refresh.")
             return redirect('take-quiz', movie_id=movie_id)
             
-        score = 0
-        total = len(quiz_data)
-        
-
-
-        for i, q in enumerate(quiz_data):
-            user_answer = request.POST.get(f'question_{i}')
-            correct_answer = q.get('correct_answer')
-            
-            # Use strip() to handle potential whitespace issues
-            if user_answer and correct_answer and user_answer.strip() == correct_answer.strip():
-                score += 1
+        total = len(attempt.answer_hashes)
+        answers = [request.POST.get(f'question_{i}') for i in range(total)]
+        score = quiz_service.grade_attempt(attempt, answers)
+        # One quiz per attempt: pass or fail, the next one is freshly generated
+        attempt.delete()
         
         if score == total:
-            # Success! Save with metadata
-            service = TMDBService()
-            movie = service.get_movie_details(movie_id)
-            
+            # Success! The details fetch above already put the movie in the catalog
             watches_exist = Watched.objects.filter(user=request.user, movie_id=movie_id).exists()
             if not watches_exist:
-                watched = Watched.objects.create(user=request.user, movie_id=movie_id)
-                if movie:
-                    watched.title = movie.get('title')
-                    watched.poster_url = movie.get('poster_url')
-                    watched.save()
-                    
-                    # Award FDFS Badge check
-                    release_date_str = movie.get('release_date')
-                    if release_date_str and release_date_str != 'N/A':
-                        try:
-                            from datetime import datetime
-                            from django.utils import timezone
-                            release_date = datetime.strptime(release_date_str, '%Y-%m-%d').date()
-                            now = timezone.now().date()
-                            days_diff = (now - release_date).days
-                            if 0 <= days_diff <= 7:
-                                request.user.profile.fdfs_badge = True
-                                request.user.profile.save()
-                                messages.success(request, "Congratulations! You earned the FDFS Badge! 🎉")
-                        except ValueError:
-                            pass
-            
-            if f'quiz_{movie_id}' in request.session:
-                del request.session[f'quiz_{movie_id}']
-            
+                Watched.objects.create(user=request.user, movie_id=movie_id)
+
             messages.success(request, f"Correct! Movie marked as Watched.")
             return redirect('movie-detail', movie_id=movie_id)
         else:
             # Failed - Force regenerate
-            if f'quiz_{movie_id}' in request.session:
-                del request.session[f'quiz_{movie_id}']
-            messages.error(request, f"Incorrect answer. Generating a new question...")
+            messages.error(request, "Incorrect answer. Here's another quiz to try.")
             return redirect('take-quiz', movie_id=movie_id)
 
     else:
-        # GET - Load Quiz
-        quiz_data = request.session.get(f'quiz_{movie_id}')
-        
-        # Check if stored quiz is the "Fallback" version (starts with "Have you watched")
-        # If so, force new generation because we likely fixed the API now.
-        if quiz_data and len(quiz_data) > 0:
-             first_q = quiz_data[0].get('question', '')
-             # Clear if fallback ("Have you watched") OR Backup ("Who directed", "In which year")
-             if "Have you watched" in first_q or "Who directed" in first_q or "In which year" in first_q:
-                 print("DEBUG: Detected Backup/Fallback quiz in session. Forcing AI regeneration.")
-                 quiz_data = None # Force null to regenerate
+        # GET - Load Quiz (reuse an unanswered one so refreshing doesn't hit the LLM again)
+        attempt = quiz_service.get_attempt(request.user, movie_id)
         
-        if not quiz_data:
-            quiz_service = QuizService()
-            quiz_data = quiz_service.generate_quiz(movie['title'], movie['overview'])
+        if not attempt:
+            # Quiz bank -> LLM within QUIZ_LATENCY_BUDGET -> metadata questions
+            started = time.monotonic()
+            quiz_data, tier = quiz_service.serve_quiz(movie, user=request.user)
+            quiz_service.record_serve(movie_id, tier, started)
             
-            # User explicit request: "story questions only".
-            # If AI fails, do NOT show metadata fallback.
             if not quiz_data:
-                print("DEBUG: AI generation failed. Returning error instead of backup.")
-                messages.warning(request, "AI is currently busy generating story questions. Please try again in 5 seconds.")
+                messages.warning(request, "Couldn't build a quiz for this movie right now. Please try again shortly.")
                 return redirect('movie-detail', movie_id=movie_id)
             
-            # CRITICAL FIX: Store in session
-            request.session[f'quiz_{movie_id}'] = quiz_data
-            request.session.save()
-            print(f"DEBUG: Saved quiz to session for movie {movie_id}")
+            attempt = quiz_service.create_attempt(request.user, movie_id, quiz_data)
         
-        print(f"DEBUG: Rendering Quiz with data: {quiz_data}") # Check structure here
-        return render(request, 'movies/quiz.html', {'movie': movie, 'questions': quiz_data})
+        return render(request, 'movies/quiz.html', {'movie': movie, 'questions': attempt.questions, 'attempt': attempt})
 
 @login_required
 def fan_corner(request):
     from django.contrib.auth.models import User
-    from django.db.models import Count
-    from movies.models import Watched
+    from django.db.models import F
+    from users.profile_service import ProfileService
 
-    # Leaderboard: Top 10 users with most watched movies
+    # Leaderboard: Top 10 users with most watched movies (indexed counter on users.UserStats).
+    # Imported history doesn't count: anyone could upload a long CSV
     leaderboard = User.objects.annotate(
-        watched_count=Count('watched')
-    ).order_by('-watched_count')[:10]
+        watched_count=F('stats__ranked_watched_count')
+    ).filter(watched_count__gt=0).order_by('-watched_count')[:10]
     
     # User's own stats
     user_stats = {
-        'count': Watched.objects.filter(user=request.user).count(),
+        'count': ProfileService().stats(request.user.pk).ranked_watched_count if request.user.is_authenticated else 0,
         'rank': list(leaderboard).index(request.user) + 1 if request.user in leaderboard else 'N/A'
     }
 
@@ -269,16 +284,74 @@ def fan_corner(request):
         'user_stats': user_stats
     })
 
+def watch_providers(request):
+    from .provider_index_service import ProviderIndexService
+    return render(request, 'movies/providers.html', {'providers': ProviderIndexService().providers()})
+
+
+def watch_provider(request, provider):
+    # "New on Aha", "Telugu on Netflix", ...: one indexed read per page
+    from django.http import Http404
+    from .provider_index_service import ProviderIndexService
+    service = ProviderIndexService()
+    kind = 'rent' if request.GET.get('kind') == 'rent' else 'stream'
+    sort = request.GET.get('sort') if request.GET.get('sort') in service.SORTS else 'new'
+    language = 'all' if request.GET.get('lang') == 'all' else 'te'
+    info = next((row for row in service.providers(kind) if row['provider'] == provider), None)
+    if info is None:
+        raise Http404
+    items, next_cursor = service.page(provider, kind, sort, language, request.GET.get('cursor'))
+    return render(request, 'movies/provider.html', {
+        'info': info,
+        'items': items,
+        'next_cursor': next_cursor,
+        'kind': kind,
+        'sort': sort,
+        'language': language,
+    })
+
+
+def _filmography_filters(request):
+    year = request.GET.get('year', '')
+    return {
+        'role': request.GET.get('role', 'all'),
+        'language': request.GET.get('lang') or None,
+        'year': int(year) if year.isdigit() else None,
+    }
+
+
 def person_detail(request, person_id):
+    from .filmography_service import FilmographyService
     service = TMDBService()
     person = service.get_person_details(person_id)
-    return render(request, 'movies/person_detail.html', {'person': person})
+    filters = _filmography_filters(request)
+    credits, has_next = FilmographyService().page(person_id, **filters) if person else ([], False)
+    return render(request, 'movies/person_detail.html', {
+        'person': person,
+        'credits': credits,
+        'has_next': has_next,
+        'facets': FilmographyService().facets(person_id, filters['language']) if person else None,
+        'role': filters['role'],
+        'year': filters['year'],
+    })
+
+
+def person_filmography(request, person_id):
+    # Further pages of the person page's grid, fetched as HTML as the user scrolls
+    from .filmography_service import FilmographyService
+    page = request.GET.get('page', '2')
+    page = int(page) if page.isdigit() else 2
+    credits, has_next = FilmographyService().page(person_id, page=page, **_filmography_filters(request))
+    response = render(request, 'movies/filmography_cards.html', {'credits': credits})
+    response['X-Has-Next'] = 'true' if has_next else 'false'
+    return response
 
 
 @staff_member_required
 def admin_dashboard(request):
     from django.contrib.auth.models import User
-    from movies.models import Favorite, Watched
+    from django.db import connection
+    from movies.models import Interaction, Movie
     from django.db.models.functions import TruncDate, TruncMonth
 
     now = timezone.now()
@@ -335,79 +408,128 @@ def admin_dashboard(request):
     # Top reviewers
     top_reviewers = (
         User.objects
-        .annotate(review_count=Count('review'))
+        .annotate(review_count=F('stats__reviews_count'))
         .filter(review_count__gt=0)
         .order_by('-review_count')[:10]
     )
 
     # ── Favorites Analytics ───────────────────────────────────────────
-    total_favorites = Favorite.objects.count()
-    favorites_7d = Favorite.objects.filter(created_at__gte=seven_days_ago).count()
+    # Favorites and watches are read from Interaction, titles from Movie
+    favorited = Interaction.objects.filter(favorited_at__isnull=False)
+    total_favorites = favorited.count()
+    favorites_7d = favorited.filter(favorited_at__gte=seven_days_ago).count()
 
-    most_favorited = (
-        Favorite.objects
-        .values('movie_id', 'title')
+    most_favorited = list(
+        favorited
+        .values('movie_id')
         .annotate(fav_count=Count('id'))
         .order_by('-fav_count')[:10]
     )
 
     users_with_most_favorites = (
         User.objects
-        .annotate(fav_count=Count('favorite'))
+        .annotate(fav_count=F('stats__favorites_count'))
         .filter(fav_count__gt=0)
         .order_by('-fav_count')[:10]
     )
 
     # ── Watched Analytics ─────────────────────────────────────────────
-    total_watched = Watched.objects.count()
-    watched_7d = Watched.objects.filter(created_at__gte=seven_days_ago).count()
+    watched = Interaction.objects.filter(watched_at__isnull=False)
+    total_watched = watched.count()
+    watched_7d = watched.filter(watched_at__gte=seven_days_ago).count()
 
-    most_watched_movies = (
-        Watched.objects
-        .values('movie_id', 'title')
+    most_watched_movies = list(
+        watched
+        .values('movie_id')
         .annotate(watch_count=Count('id'))
         .order_by('-watch_count')[:10]
     )
 
     top_watchers = (
         User.objects
-        .annotate(watch_count=Count('watched'))
+        .annotate(watch_count=F('stats__watched_count'))
         .filter(watch_count__gt=0)
         .order_by('-watch_count')[:10]
     )
 
+    # Decayed community activity, maintained incrementally on every write
+    trending = TrendingService()
+    trending_movies = trending.top(limit=10, use_cache=False)
+
+    # ── Quiz Serving SLO ──────────────────────────────────────────────
+    from django.conf import settings
+    from django.db.models import Q
+    from movies.models import QuizServe
+    quiz_budget_ms = settings.QUIZ_LATENCY_BUDGET * 1000
+    quiz_tiers = (
+        QuizServe.objects
+        .filter(created_at__gte=seven_days_ago)
+        .values('tier')
+        .annotate(
+            count=Count('id'),
+            avg_ms=Avg('latency_ms'),
+            within_budget=Count('id', filter=Q(latency_ms__lte=quiz_budget_ms)),
+        )
+        .order_by('-count')
+    )
+
     # ── FDFS Badge holders ────────────────────────────────────────────
-    from users.models import Profile
-    fdfs_badge_count = Profile.objects.filter(fdfs_badge=True).count()
-    fdfs_badge_holders = Profile.objects.filter(fdfs_badge=True).select_related('user')[:20]
+    from users.models import UserBadge
+    fdfs_badge_count = UserBadge.objects.filter(code='fdfs').count()
+    fdfs_badge_holders = UserBadge.objects.filter(code='fdfs').select_related('user').order_by('-awarded_at')[:20]
 
     # ── Recent Activity ───────────────────────────────────────────────
     recent_reviews_list = Review.objects.select_related('user').order_by('-created_at')[:15]
-    recent_favorites_list = Favorite.objects.select_related('user').order_by('-created_at')[:15]
-    recent_watched_list = Watched.objects.select_related('user').order_by('-created_at')[:15]
+    recent_favorites_list = list(favorited.select_related('user').order_by('-favorited_at')[:15])
+    recent_watched_list = list(watched.select_related('user').order_by('-watched_at')[:15])
+    top_movies = most_favorited + most_watched_movies
+    recent_items = recent_favorites_list + recent_watched_list
+    catalog = Movie.objects.only('title').in_bulk(
+        {m['movie_id'] for m in top_movies} | {item.movie_id for item in recent_items}
+    )
+    for m in top_movies:
+        m['title'] = catalog[m['movie_id']].title if m['movie_id'] in catalog else None
+    for item in recent_items:
+        item.title = catalog[item.movie_id].title if item.movie_id in catalog else None
     recent_users_list = User.objects.order_by('-date_joined')[:15]
 
     # ── All Users Management ──────────────────────────────────────────
+    # Per-user counts come from users.UserStats rather than three COUNT joins
+    user_counts = {
+        'review_count': F('stats__reviews_count'),
+        'fav_count': F('stats__favorites_count'),
+        'watch_count': F('stats__watched_count'),
+    }
     search_user = request.GET.get('search_user', '').strip()
+    users = User.objects.annotate(**user_counts)
     if search_user:
-        all_users = User.objects.filter(
-            username__icontains=search_user
-        ).annotate(
-            review_count=Count('review'),
-            fav_count=Count('favorite'),
-            watch_count=Count('watched')
-        ).order_by('-date_joined')
-    else:
-        all_users = User.objects.annotate(
-            review_count=Count('review'),
-            fav_count=Count('favorite'),
-            watch_count=Count('watched')
-        ).order_by('-date_joined')[:50]
+        # Served by the trigram index on PostgreSQL (users migration 0010); a
+        # trigram needs 3 characters, so shorter searches match prefixes only
+        lookup = 'username__icontains' if len(search_user) >= 3 else 'username__istartswith'
+        if connection.vendor == 'postgresql':
+            users = users.filter(**{lookup: search_user})
+        else:
+            # No trigram index: match on the username index first, or a rare
+            # name walks the whole (date_joined, id) index row by row
+            users = users.filter(id__in=User.objects.filter(**{lookup: search_user}).values('id'))
+    # Keyset pagination over the (date_joined, id) index: page 1000 costs what page 1 does
+    from users.profile_service import ProfileService
+    all_users, users_cursor = ProfileService().keyset_page(
+        users, 'date_joined', request.GET.get('users_before'), size=50
+    )
 
     # Handle admin actions (toggle staff / delete user)
     if request.method == 'POST':
         action = request.POST.get('action')
         target_user_id = request.POST.get('user_id')
+        if action == 'invalidate_cache':
+            target = request.POST.get('target', '').strip()
+            try:
+                CacheService().invalidate(target)
+                messages.success(request, f"Cache invalidated: {target}.")
+            except (KeyError, ValueError):
+                messages.error(request, f"Unknown cache tag or namespace: {target or '(empty)'}.")
+            return redirect('admin-dashboard')
         if target_user_id:
             try:
                 target_user = User.objects.get(pk=target_user_id)
@@ -457,6 +579,14 @@ def admin_dashboard(request):
         'watched_7d': watched_7d,
         'most_watched_movies': most_watched_movies,
         'top_watchers': top_watchers,
+        'trending_movies': trending_movies,
+        'trending_half_life': trending.HALF_LIFE_DAYS,
+        # Quiz serving
+        'quiz_tiers': quiz_tiers,
+        'quiz_budget': settings.QUIZ_LATENCY_BUDGET,
+        'rate_limits': RateLimitService().stats(),
+        'cache_namespaces': CacheService().namespaces(),
+        'export_datasets': ExportService().datasets(),
         # FDFS
         'fdfs_badge_count': fdfs_badge_count,
         'fdfs_badge_holders': fdfs_badge_holders,
@@ -467,8 +597,19 @@ def admin_dashboard(request):
         'recent_users_list': recent_users_list,
         # User management
         'all_users': all_users,
+        'users_cursor': users_cursor,
+        'users_page_older': bool(request.GET.get('users_before')),
         'search_user': search_user,
         'now': now,
     }
 
     return render(request, 'movies/admin_dashboard.html', context)
+
+
+@staff_member_required
+def admin_export(request, dataset):
+    # Streamed straight from the database, so this works for tables of any size
+    from django.http import Http404
+    if dataset not in ExportService().datasets():
+        raise Http404
+    return ExportService().response(dataset, request.GET.get('format', 'csv'))
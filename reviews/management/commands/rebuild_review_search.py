@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from reviews.models import Review
+from reviews.search_service import ReviewSearchService
+
+# Synthetic review text: common filler plus the phrases people actually search for
+WORDS = (
+    "the a and of to was is in it this movie film story hero villain scene scenes first half second "
+    "slow fast boring brilliant superb average climax twist songs song dance fight comedy emotional "
+    "screenplay direction acting performance camera visuals editing length lag mass elevation"
+).split()
+PHRASES = ["bgm", "interval block", "background score", "pre interval", "cinematography", "item song"]
+QUERIES = ["bgm", "interval block", "cinematography", "emotional climax", "screenplay lag", "zzzz"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the review full-text index and refill it from every review. "
+        "Needed on SQLite after a migration that alters reviews_review (table copies drop the triggers)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--benchmark', type=int, metavar='N',
+            help="Instead, time searches over N synthetic reviews (seeded in a transaction that is rolled back).",
+        )
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options['benchmark'])
+        started = time.perf_counter()
+        ReviewSearchService().install()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {Review.objects.count()} reviews in {time.perf_counter() - started:.1f}s ({connection.vendor})."
+        ))
+
+    def benchmark(self, n_reviews):
+        service = ReviewSearchService()
+        with transaction.atomic():
+            self.seed(n_reviews)
+            for query in QUERIES:
+                self.stdout.write(f"{query!r}:")
+                self.timed("ranked, site-wide, page 1", lambda: service.search(query)[0])
+                self.timed("ranked, site-wide, page 10", lambda: service.search(query, page=10)[0])
+                self.timed("ranked, one movie", lambda: service.search(query, movie_id=7)[0])
+                self.timed("icontains scan, page 1 (before)", lambda: list(
+                    Review.objects.filter(content__icontains=query).order_by('-id')[:service.PAGE_SIZE]
+                ))
+            transaction.set_rollback(True)
+
+    def seed(self, n_reviews):
+        rng = random.Random(7)
+        started = time.perf_counter()
+        # (user, movie_id) is unique, so spread the reviews over enough users
+        per_user = 1000
+        n_users = -(-n_reviews // per_user)
+        first_id = (User.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+        User.objects.bulk_create(
+            [User(id=first_id + i, username=f'reviewbench{i:06d}', password='!') for i in range(n_users)],
+            batch_size=5000,
+        )
+
+        def text():
+            words = rng.choices(WORDS, k=rng.randint(15, 80))
+            for _ in range(rng.randint(0, 2)):
+                words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+            return ' '.join(words)
+
+        batch = []
+        for i in range(n_reviews):
+            batch.append(Review(
+                user_id=first_id + i // per_user, movie_id=i % per_user, rating=rng.randint(1, 5), content=text(),
+            ))
+            if len(batch) == 10_000:
+                Review.objects.bulk_create(batch)
+                batch = []
+        Review.objects.bulk_create(batch)
+        self.stdout.write(f"Seeded {n_reviews} reviews in {time.perf_counter() - started:.0f}s ({connection.vendor}).")
+
+    def timed(self, label, query, repeat=3):
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = query()
+            runs.append(time.perf_counter() - started)
+        self.stdout.write(f"  {label:<36} {statistics.median(runs) * 1000:9.1f} ms  ({len(rows)} rows)")
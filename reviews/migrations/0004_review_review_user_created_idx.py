@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_review_updated_at_alter_review_unique_together"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["user", "created_at"], name="review_user_created_idx"
+            ),
+        ),
+    ]
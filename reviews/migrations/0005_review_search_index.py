@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # tsvector + GIN on PostgreSQL, FTS5 + triggers on SQLite (see reviews/search_service.py)
+    from reviews.search_service import ReviewSearchService
+
+    ReviewSearchService(schema_editor.connection).install()
+
+
+def drop_search_index(apps, schema_editor):
+    from reviews.search_service import ReviewSearchService
+
+    ReviewSearchService(schema_editor.connection).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0004_review_review_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
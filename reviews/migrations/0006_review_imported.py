@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:36
+
+from django.db import migrations, models
+
+
+def install_search_index(apps, schema_editor):
+    # On SQLite the AddField copies reviews_review, which drops the FTS triggers from 0005
+    from reviews.search_service import ReviewSearchService
+
+    ReviewSearchService(schema_editor.connection).install()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0005_review_search_index"),
+    ]
+
+    operations = [
+        # Reverse of the RemoveField copies the table again; reinstall after it
+        migrations.RunPython(migrations.RunPython.noop, install_search_index),
+        migrations.AddField(
+            model_name="review",
+            name="imported",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(install_search_index, migrations.RunPython.noop),
+    ]
@@ -16,9 +16,12 @@ class Review(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # From a history import (see movies.Watched.imported)
+    imported = models.BooleanField(default=False)
 
     class Meta:
         unique_together = ('user', 'movie_id')
+        indexes = [models.Index(fields=['user', 'created_at'], name='review_user_created_idx')]
 
     def __str__(self):
         return f'{self.user.username} - {self.movie_id}'
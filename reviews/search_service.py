@@ -0,0 +1,173 @@
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# One ranked hit: the Review (user preloaded), its movie's catalog row if we have one, and a highlighted excerpt
+SearchHit = namedtuple('SearchHit', ['review', 'movie', 'snippet', 'rank'])
+
+# Highlight markers put in by the database; swapped for <mark> after the excerpt is escaped
+_START, _STOP = '\ue000', '\ue001'
+
+
+class ReviewSearchService:
+    """
+    Full-text search over Review.content. The index lives in the database so
+    every write path keeps it current (add/edit review, bulk imports, admin):
+
+    - PostgreSQL: a generated `search_vector` tsvector column with a GIN
+      index, queried with websearch_to_tsquery and ranked with ts_rank_cd.
+    - SQLite: an external-content FTS5 table kept in step by triggers,
+      ranked with bm25.
+
+    Other databases fall back to an unranked icontains scan.
+    """
+
+    PAGE_SIZE = 20
+    FTS_TABLE = 'reviews_review_fts'
+
+    POSTGRES_SCHEMA = [
+        "ALTER TABLE reviews_review ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS reviews_review_search_idx ON reviews_review USING GIN (search_vector)",
+    ]
+    SQLITE_SCHEMA = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "content, movie_id, content='reviews_review', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ai AFTER INSERT ON reviews_review BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, content, movie_id) VALUES (new.id, new.content, new.movie_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ad AFTER DELETE ON reviews_review BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, movie_id) "
+        "VALUES ('delete', old.id, old.content, old.movie_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS reviews_review_fts_au AFTER UPDATE OF content, movie_id ON reviews_review BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, movie_id) "
+        "VALUES ('delete', old.id, old.content, old.movie_id); "
+        f"INSERT INTO {FTS_TABLE}(rowid, content, movie_id) VALUES (new.id, new.content, new.movie_id); END",
+    ]
+
+    def __init__(self, using=None):
+        self.connection = using or connection
+
+    # ── Schema ───────────────────────────────────────────────────────
+
+    def install(self):
+        """Creates the index (idempotent) and fills it from existing reviews."""
+        vendor = self.connection.vendor
+        statements = {'postgresql': self.POSTGRES_SCHEMA, 'sqlite': self.SQLITE_SCHEMA}.get(vendor, [])
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        # The generated column backfills itself; FTS5 needs an explicit rebuild
+        if vendor == 'sqlite':
+            self.rebuild()
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            if self.connection.vendor == 'postgresql':
+                cursor.execute("DROP INDEX IF EXISTS reviews_review_search_idx")
+                cursor.execute("ALTER TABLE reviews_review DROP COLUMN IF EXISTS search_vector")
+            elif self.connection.vendor == 'sqlite':
+                for suffix in ('ai', 'ad', 'au'):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS reviews_review_fts_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {self.FTS_TABLE}")
+
+    def rebuild(self):
+        # SQLite's migrations copy tables when altering them, which drops the triggers; install() puts them back
+        if self.connection.vendor == 'sqlite':
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}) VALUES ('rebuild')")
+
+    # ── Querying ─────────────────────────────────────────────────────
+
+    def search(self, query, movie_id=None, page=1, size=PAGE_SIZE):
+        """
+        Best matches for `query` first, optionally within one movie's reviews.
+        Returns (hits, has_next) for 1-based `page`.
+        """
+        query = (query or '').strip()
+        if not query:
+            return [], False
+        offset = (max(page, 1) - 1) * size
+        vendor = self.connection.vendor
+        if vendor == 'postgresql':
+            rows = self._search_postgres(query, movie_id, size + 1, offset)
+        elif vendor == 'sqlite':
+            rows = self._search_sqlite(query, movie_id, size + 1, offset)
+        else:
+            rows = self._search_fallback(query, movie_id, size + 1, offset)
+        return self._hits(rows[:size]), len(rows) > size
+
+    def _search_postgres(self, query, movie_id, limit, offset):
+        movie_filter = "AND r.movie_id = %s" if movie_id else ""
+        params = [query] + ([movie_id] if movie_id else []) + [limit, offset]
+        # Rank the matches, then build excerpts for the page only (ts_headline re-parses the text)
+        sql = f"""
+            SELECT page.id, page.rank,
+                   ts_headline('english', page.content, page.q,
+                               'StartSel={_START}, StopSel={_STOP}, MaxWords=35, MinWords=15, MaxFragments=2')
+            FROM (
+                SELECT r.id, r.content, q, ts_rank_cd(r.search_vector, q) AS rank
+                FROM reviews_review r, websearch_to_tsquery('english', %s) q
+                WHERE r.search_vector @@ q {movie_filter}
+                ORDER BY rank DESC, r.id DESC
+                LIMIT %s OFFSET %s
+            ) page
+            ORDER BY page.rank DESC, page.id DESC
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _search_sqlite(self, query, movie_id, limit, offset):
+        match = self._fts5_query(query)
+        if not match:
+            return []
+        if movie_id:
+            # movie_id is indexed too, so one movie's reviews are a posting-list intersection rather than a filter
+            match = f'movie_id:"{int(movie_id)}" AND ({match})'
+        # bm25() is lower-is-better; negate it so rank reads the same way as on PostgreSQL.
+        # The movie_id column gets weight 0 so only the review text counts.
+        sql = f"""
+            SELECT {self.FTS_TABLE}.rowid, -bm25({self.FTS_TABLE}, 1.0, 0.0),
+                   snippet({self.FTS_TABLE}, 0, '{_START}', '{_STOP}', '…', 30)
+            FROM {self.FTS_TABLE}
+            WHERE {self.FTS_TABLE} MATCH %s
+            ORDER BY bm25({self.FTS_TABLE}, 1.0, 0.0), {self.FTS_TABLE}.rowid DESC
+            LIMIT %s OFFSET %s
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [match, limit, offset])
+            return cursor.fetchall()
+
+    def _fts5_query(self, query):
+        # Plain words only: every term must appear, the last one as a prefix so "interv" finds "interval"
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return ''
+        # Column filter keeps the words from matching movie IDs
+        return 'content: (' + ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*)'
+
+    def _search_fallback(self, query, movie_id, limit, offset):
+        from .models import Review
+        reviews = Review.objects.filter(content__icontains=query)
+        if movie_id:
+            reviews = reviews.filter(movie_id=movie_id)
+        return [
+            (pk, 0.0, content[:200])
+            for pk, content in reviews.order_by('-id').values_list('id', 'content')[offset:offset + limit]
+        ]
+
+    def _hits(self, rows):
+        from movies.models import Movie
+        from .models import Review
+        reviews = Review.objects.select_related('user').in_bulk([row[0] for row in rows])
+        movies = Movie.objects.in_bulk({review.movie_id for review in reviews.values()})
+        hits = []
+        for pk, rank, snippet in rows:
+            review = reviews.get(pk)
+            if review:
+                excerpt = escape(snippet or '').replace(_START, '<mark>').replace(_STOP, '</mark>')
+                hits.append(SearchHit(review, movies.get(review.movie_id), mark_safe(excerpt), rank))
+        return hits
@@ -1,3 +1,38 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from .models import Review
+from .search_service import ReviewSearchService
+
+
+@override_settings(ACHIEVEMENTS_ASYNC=False)
+class ReviewSearchTests(TestCase):
+    # The test database is built by running every migration, so these also
+    # catch a later migration that copies reviews_review and loses the index
+
+    def setUp(self):
+        self.user = User.objects.create(username='critic')
+
+    def test_new_review_is_found_after_all_migrations(self):
+        review = Review.objects.create(user=self.user, movie_id=1, rating=4, content="Lovely zebrafish music")
+        hits, has_next = ReviewSearchService().search('zebrafish')
+        self.assertEqual([hit.review.pk for hit in hits], [review.pk])
+        self.assertFalse(has_next)
+
+    def test_edited_and_deleted_reviews_leave_the_index(self):
+        review = Review.objects.create(user=self.user, movie_id=1, rating=4, content="Lovely zebrafish music")
+        review.content = "Forgettable songs"
+        review.save()
+        self.assertEqual(ReviewSearchService().search('zebrafish'), ([], False))
+        self.assertEqual(len(ReviewSearchService().search('forgettable')[0]), 1)
+        review.delete()
+        self.assertEqual(ReviewSearchService().search('forgettable'), ([], False))
+
+    def test_sqlite_triggers_installed(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("FTS5 triggers are SQLite only")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'reviews_review'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        self.assertEqual(triggers, {'reviews_review_fts_ai', 'reviews_review_fts_ad', 'reviews_review_fts_au'})
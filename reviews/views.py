@@ -1,4 +1,4 @@
-from django.shortcuts import redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .models import Review
@@ -43,3 +43,26 @@ def edit_review(request, review_id):
             messages.error(request, 'There was an error updating your review.')
 
     return redirect('movie-detail', movie_id=review.movie_id)
+
+
+def search_reviews(request):
+    # Full-text search across all reviews, or one movie's with ?movie=<id>
+    from .search_service import ReviewSearchService
+    query = request.GET.get('q', '').strip()
+    movie_id = request.GET.get('movie')
+    movie_id = int(movie_id) if movie_id and movie_id.isdigit() else None
+    page = request.GET.get('page', '1')
+    page = int(page) if page.isdigit() and int(page) > 0 else 1
+
+    hits, has_next = ReviewSearchService().search(query, movie_id=movie_id, page=page)
+    movie = None
+    if movie_id:
+        from movies.models import Movie
+        movie = Movie.objects.filter(id=movie_id).values('id', 'title').first() or {'id': movie_id, 'title': None}
+    return render(request, 'reviews/search.html', {
+        'query': query,
+        'movie': movie,
+        'hits': hits,
+        'page': page,
+        'has_next': has_next,
+    })
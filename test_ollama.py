@@ -1,6 +1,7 @@
-import requests
 import json
 
+from movies.transport_service import http_session
+
 url = "https://unsanguine-rosette-impressibly.ngrok-free.dev/api/generate"
 payload = {
     "model": "llama3.2",
@@ -16,7 +17,8 @@ try:
         "ngrok-skip-browser-warning": "true",
         "Origin": "https://unsanguine-rosette-impressibly.ngrok-free.dev"
     }
-    response = requests.post(url, json=payload, headers=headers, timeout=10)
+    # HTTP_TRANSPORT=record saves the exchange; HTTP_TRANSPORT=replay runs this without the network
+    response = http_session().post(url, json=payload, headers=headers, timeout=10)
     print(f"Status Code: {response.status_code}")
     if response.status_code == 200:
         print("Success! Ollama is reachable via ngrok.")
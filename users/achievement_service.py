@@ -0,0 +1,212 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import UserBadge
+
+# A domain event: kind is 'watched', 'favorited' or 'reviewed'. Imported events
+# carry the user's own dates, so release_window rules ignore them.
+Event = namedtuple('Event', ['kind', 'user_id', 'movie_id', 'at', 'imported'], defaults=[False])
+
+# Declarative badge rules. A rule fires on the listed event kinds and has
+# exactly one condition:
+#   release_window: the event happened within N days of the movie's release
+#   count: the user has at least N events of those kinds
+RULES = [
+    {
+        'code': 'fdfs',
+        'name': 'FDFS',
+        'description': 'Added a movie within 7 days of release!',
+        'events': ['watched', 'favorited'],
+        'release_window': 7,
+    },
+    {
+        'code': 'first_review',
+        'name': 'Critic',
+        'description': 'Wrote a first review.',
+        'events': ['reviewed'],
+        'count': 1,
+    },
+    {
+        'code': 'watched_25',
+        'name': 'Cinephile',
+        'description': 'Watched 25 movies.',
+        'events': ['watched'],
+        'count': 25,
+    },
+    {
+        'code': 'watched_100',
+        'name': 'Centurion',
+        'description': 'Watched 100 movies.',
+        'events': ['watched'],
+        'count': 100,
+    },
+]
+RULES_BY_CODE = {rule['code']: rule for rule in RULES}
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+class AchievementService:
+    """
+    Awards badges from domain events. Requests only enqueue events; a
+    background thread drains the queue and evaluates them in batches, so
+    neither the rule set nor its size adds latency to a request. Events still
+    queued when a process exits are lost, which `replay_achievements` repairs.
+    """
+
+    BATCH_SIZE = 200
+    # How long the worker waits to fill a batch
+    BATCH_WAIT = 0.5
+
+    def _models(self):
+        from movies.models import Favorite, Movie, Watched
+        from reviews.models import Review
+        return {'watched': Watched, 'favorited': Favorite, 'reviewed': Review}, Movie
+
+    def publish(self, kind, user_id, movie_id, at):
+        event = Event(kind, user_id, movie_id, at)
+        if not getattr(settings, 'ACHIEVEMENTS_ASYNC', True):
+            self.evaluate([event])
+            return
+        _queue.put(event)
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        global _worker
+        with _worker_lock:
+            if _worker is None or not _worker.is_alive():
+                _worker = threading.Thread(target=self._drain, name='achievements', daemon=True)
+                _worker.start()
+
+    def _drain(self):
+        while True:
+            batch = [_queue.get()]
+            deadline = time.monotonic() + self.BATCH_WAIT
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(_queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.evaluate(batch)
+            except Exception as e:
+                print(f"Error evaluating achievements: {e}")
+            finally:
+                close_old_connections()
+
+    def evaluate(self, events, fetch_missing=True):
+        """Checks a batch of events against RULES. Returns the badges awarded."""
+        event_models, Movie = self._models()
+        user_ids = {e.user_id for e in events}
+        owned = set(UserBadge.objects.filter(user_id__in=user_ids).values_list('user_id', 'code'))
+        movie_ids = {e.movie_id for e in events}
+        release_dates = dict(Movie.objects.filter(id__in=movie_ids).values_list('id', 'release_date'))
+        if fetch_missing:
+            # A favorite is saved before its details are fetched; fill the gap off the request path
+            from movies.services import TMDBService
+            for movie_id in movie_ids - release_dates.keys():
+                movie = TMDBService().get_movie_details(movie_id)
+                if movie:
+                    release_dates[movie_id] = movie.get('release_date')
+
+        awards = {}
+        for rule in RULES:
+            relevant = [
+                e for e in events
+                if e.kind in rule['events'] and (e.user_id, rule['code']) not in owned
+                and not (e.imported and 'release_window' in rule)
+            ]
+            if not relevant:
+                continue
+
+            if 'release_window' in rule:
+                for e in sorted(relevant, key=lambda e: e.at):
+                    released = self._parse_date(release_dates.get(e.movie_id))
+                    if released and 0 <= (e.at.date() - released).days <= rule['release_window']:
+                        awards.setdefault((e.user_id, rule['code']), (e.movie_id, e.at))
+
+            elif 'count' in rule:
+                crossed = self._threshold_times(rule, {e.user_id for e in relevant}, event_models)
+                for user_id, at in crossed.items():
+                    awards[(user_id, rule['code'])] = (None, at)
+
+        badges = [
+            UserBadge(user_id=user_id, code=code, movie_id=movie_id, awarded_at=at)
+            for (user_id, code), (movie_id, at) in awards.items()
+        ]
+        UserBadge.objects.bulk_create(badges, ignore_conflicts=True)
+        if badges:
+            from .profile_service import ProfileService
+            ProfileService().invalidate(*{badge.user_id for badge in badges})
+        return badges
+
+    def _threshold_times(self, rule, user_ids, event_models):
+        """
+        {user_id: when they reached rule['count'] events} for those of `user_ids`
+        who have, with one windowed query per event kind for the whole batch.
+        The time (not just the count) matters when replaying history.
+        """
+        n = rule['count']
+
+        def numbered(kind):
+            return event_models[kind].objects.filter(user_id__in=user_ids).annotate(
+                position=Window(RowNumber(), partition_by=[F('user_id')], order_by=[F('created_at').asc(), F('id').asc()])
+            )
+
+        if len(rule['events']) == 1:
+            # The nth row is the answer
+            return dict(numbered(rule['events'][0]).filter(position=n).values_list('user_id', 'created_at'))
+        # Several kinds: merge each kind's first n
+        times = {}
+        for kind in rule['events']:
+            for user_id, at in numbered(kind).filter(position__lte=n).values_list('user_id', 'created_at'):
+                times.setdefault(user_id, []).append(at)
+        return {user_id: sorted(at)[n - 1] for user_id, at in times.items() if len(at) >= n}
+
+    def _parse_date(self, value):
+        try:
+            return date.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+    def replay(self, user_ids=None, batch_size=1000, users_per_chunk=500):
+        """
+        Re-evaluates historical events (all users or `user_ids`) in time order.
+        Rules are per user, so history is loaded users_per_chunk users at a
+        time and memory stays bounded. Returns the number of badges awarded.
+        """
+        from django.contrib.auth.models import User
+        event_models, _ = self._models()
+        if user_ids is None:
+            user_ids = User.objects.order_by('id').values_list('id', flat=True)
+        user_ids = list(user_ids)
+
+        awarded = 0
+        for chunk_start in range(0, len(user_ids), users_per_chunk):
+            chunk = user_ids[chunk_start:chunk_start + users_per_chunk]
+            events = []
+            for kind, model in event_models.items():
+                history = model.objects.filter(user_id__in=chunk).values_list('user_id', 'movie_id', 'created_at', 'imported')
+                events.extend(Event(kind, *row) for row in history)
+            events.sort(key=lambda e: e.at)
+            for start in range(0, len(events), batch_size):
+                awarded += len(self.evaluate(events[start:start + batch_size], fetch_missing=False))
+        return awarded
+
+    def badges_for(self, user):
+        """The user's badges with their display name and description, oldest first."""
+        return [
+            {**RULES_BY_CODE[badge.code], 'awarded_at': badge.awarded_at, 'movie_id': badge.movie_id}
+            for badge in UserBadge.objects.filter(user=user).order_by('awarded_at')
+            if badge.code in RULES_BY_CODE
+        ]
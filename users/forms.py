@@ -13,3 +13,16 @@ class ProfileUpdateForm(forms.ModelForm):
     class Meta:
         model = Profile
         fields = ['avatar', 'bio']
+
+class ImportHistoryForm(forms.Form):
+    file = forms.FileField(label='CSV file', help_text='e.g. watched.csv, diary.csv, reviews.csv or likes/films.csv from a Letterboxd export')
+    as_favorites = forms.BooleanField(required=False, label='These are likes: also add them to my Favorites')
+
+    def clean_file(self):
+        from .import_service import ImportService
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith('.csv'):
+            raise forms.ValidationError('Please upload a .csv file.')
+        if upload.size > ImportService.MAX_UPLOAD_BYTES:
+            raise forms.ValidationError('That file is too large (20 MB max).')
+        return upload
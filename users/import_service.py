@@ -0,0 +1,263 @@
+import csv
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dt_time
+
+from django.db import connection, close_old_connections
+from django.db.models import Case, DateTimeField, Value, When
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import ImportJob
+
+# One parsed CSV line
+ImportRow = namedtuple('ImportRow', ['title', 'year', 'watched_at', 'rating', 'review'])
+
+# Imports run one at a time, off the request path
+_import_pool = ThreadPoolExecutor(max_workers=1)
+
+
+class ImportService:
+    """
+    Streams a watch-history CSV into Watched, Favorite and Review. Letterboxd's
+    exports (watched, diary, ratings, reviews, likes) work as-is, and so does
+    anything with a Name/Title column and optionally Year, Date, Rating and
+    Review. The file is read BATCH_SIZE rows at a time, each batch is matched
+    and written with bulk_create, and details for the matched movies are
+    fetched on a side pool while later batches are read. Memory stays flat
+    whatever the file size.
+
+    Titles are matched against the local Movie catalog first (one indexed
+    query per batch). Only the misses go to TMDB search.
+    """
+
+    BATCH_SIZE = 500
+    SEARCH_WORKERS = 4
+    ENRICH_WORKERS = 4
+    MAX_UNMATCHED = 50
+    MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+    TITLE_COLUMNS = ('name', 'title', 'film')
+    YEAR_COLUMNS = ('year', 'release year')
+    DATE_COLUMNS = ('watched date', 'date', 'watched')
+    RATING_COLUMNS = ('rating',)
+    REVIEW_COLUMNS = ('review',)
+
+    def start(self, user, upload, as_favorites=False):
+        """Saves the upload to a temp file and queues it. Returns the ImportJob."""
+        fd, path = tempfile.mkstemp(prefix='import-', suffix='.csv')
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in upload.chunks():
+                out.write(chunk)
+        job = ImportJob.objects.create(user=user, filename=upload.name[:255], as_favorites=as_favorites)
+        _import_pool.submit(self._run_in_background, job.pk, path)
+        return job
+
+    def _run_in_background(self, job_id, path):
+        try:
+            self.run(ImportJob.objects.get(pk=job_id), path)
+        finally:
+            os.remove(path)
+            close_old_connections()
+
+    def run(self, job, path, progress=None):
+        """Imports the CSV at `path` into `job.user`, saving progress on `job` after every batch."""
+        job.status = ImportJob.RUNNING
+        job.save(update_fields=['status'])
+        imported = set()
+        enrich_pool = ThreadPoolExecutor(max_workers=self.ENRICH_WORKERS)
+        try:
+            with open(path, newline='', encoding='utf-8-sig', errors='replace') as f:
+                for batch in self._batches(csv.DictReader(f)):
+                    movie_ids = self._import_batch(job, batch)
+                    enrich_pool.submit(self._enrich, movie_ids - imported)
+                    imported |= movie_ids
+                    job.save(update_fields=['rows', 'matched', 'created', 'reviews', 'unmatched'])
+                    if progress:
+                        progress(job)
+            self._sync(job.user_id)
+            job.status = ImportJob.DONE
+        except Exception as e:
+            print(f"Error importing {job.filename} for {job.user_id}: {e}")
+            job.status = ImportJob.FAILED
+            job.error = str(e)[:500]
+        finally:
+            enrich_pool.shutdown(wait=True)
+        job.finished_at = timezone.now()
+        job.save()
+        return job
+
+    # ── Parsing ──────────────────────────────────────────────────────
+
+    def _batches(self, reader):
+        batch = []
+        for raw in reader:
+            row = self._parse(raw)
+            if row:
+                batch.append(row)
+            if len(batch) >= self.BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _parse(self, raw):
+        # Extra cells land under the None key as a list; ignore them
+        row = {key.strip().lower(): (value or '').strip() for key, value in raw.items() if isinstance(key, str)}
+
+        def first(columns):
+            return next((row[c] for c in columns if row.get(c)), '')
+
+        title = first(self.TITLE_COLUMNS)
+        if not title:
+            return None
+        year = first(self.YEAR_COLUMNS)
+        try:
+            rating = float(first(self.RATING_COLUMNS))
+        except ValueError:
+            rating = None
+        return ImportRow(
+            title=title[:255],
+            year=int(year) if year.isdigit() else None,
+            watched_at=self._parse_date(first(self.DATE_COLUMNS)),
+            rating=rating,
+            review=first(self.REVIEW_COLUMNS),
+        )
+
+    def _parse_date(self, value):
+        try:
+            day = date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+        return timezone.make_aware(datetime.combine(day, dt_time(12)))
+
+    # ── Matching ─────────────────────────────────────────────────────
+
+    def match(self, rows):
+        """{(title, year): movie} for the rows we can place, catalog first then TMDB search."""
+        keys = {(row.title, row.year) for row in rows}
+        found = self._match_local(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from movies.services import TMDBService
+            tmdb = TMDBService()
+            with ThreadPoolExecutor(max_workers=self.SEARCH_WORKERS) as pool:
+                for key, movie in zip(missing, pool.map(lambda key: self._search(tmdb, *key), missing)):
+                    if movie:
+                        found[key] = movie
+        return found
+
+    def _search(self, tmdb, title, year):
+        try:
+            return tmdb.find_movie(title, year)
+        finally:
+            # find_movie saves hits to the catalog from this worker thread
+            connection.close()
+
+    def _match_local(self, keys):
+        from movies.models import Movie
+        candidates = {}
+        rows = (
+            Movie.objects.annotate(title_lower=Lower('title'))
+            .filter(title_lower__in={title.lower() for title, _ in keys})
+            .values('id', 'title', 'poster_url', 'release_date', 'title_lower')
+        )
+        for movie in rows:
+            candidates.setdefault(movie['title_lower'], []).append(movie)
+
+        found = {}
+        for title, year in keys:
+            movie = self._pick(candidates.get(title.lower(), []), year)
+            if movie:
+                found[(title, year)] = movie
+        return found
+
+    def _pick(self, options, year):
+        if year is None:
+            # Without a year only an unambiguous title is safe; TMDB search ranks the rest
+            return options[0] if len(options) == 1 else None
+        for tolerance in (0, 1):  # Festival vs theatrical release years often differ by one
+            for movie in options:
+                released = (movie['release_date'] or '')[:4]
+                if released.isdigit() and abs(int(released) - year) <= tolerance:
+                    return movie
+        return None
+
+    # ── Writing ──────────────────────────────────────────────────────
+
+    def _import_batch(self, job, rows):
+        """Writes one batch and updates the job's counters. Returns the matched movie IDs."""
+        from movies.models import Favorite, Watched
+        from reviews.models import Review
+
+        matches = self.match(rows)
+        job.rows += len(rows)
+        # Diaries list rewatches oldest first; keep the latest entry per movie
+        latest = {}
+        for row in rows:
+            movie = matches.get((row.title, row.year))
+            if movie:
+                job.matched += 1
+                latest[movie['id']] = (row, movie)
+            elif len(job.unmatched) < self.MAX_UNMATCHED:
+                job.unmatched.append([row.title, row.year])
+
+        def card(model, row, movie):
+            # Titles and posters live on Movie; matching only returns catalog movies
+            return model(user=job.user, movie_id=movie['id'], imported=True)
+
+        def review(row, movie):
+            # Only written reviews; a bare star rating has nothing to show on the movie page
+            if not row.review or row.rating is None:
+                return None
+            rating = min(5, max(1, int(row.rating + 0.5)))
+            return Review(user=job.user, movie_id=movie['id'], rating=rating, content=row.review, imported=True)
+
+        job.created += self._create_new(Watched, job.user_id, latest, lambda row, movie: card(Watched, row, movie))
+        if job.as_favorites:
+            self._create_new(Favorite, job.user_id, latest, lambda row, movie: card(Favorite, row, movie))
+        job.reviews += self._create_new(Review, job.user_id, latest, review)
+        return set(latest)
+
+    def _create_new(self, model, user_id, latest, build):
+        """bulk_creates build(row, movie) for movies the user has no `model` row for yet. Returns how many."""
+        existing = set(model.objects.filter(user_id=user_id, movie_id__in=latest).values_list('movie_id', flat=True))
+        objects = {
+            movie_id: build(row, movie) for movie_id, (row, movie) in latest.items() if movie_id not in existing
+        }
+        objects = {movie_id: obj for movie_id, obj in objects.items() if obj is not None}
+        model.objects.bulk_create(objects.values(), batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+
+        # created_at is auto_now_add, so set the real watch dates in one UPDATE afterwards
+        dated = {movie_id: latest[movie_id][0].watched_at for movie_id in objects if latest[movie_id][0].watched_at}
+        if dated:
+            model.objects.filter(user_id=user_id, movie_id__in=dated).update(created_at=Case(
+                *[When(movie_id=movie_id, then=Value(at)) for movie_id, at in dated.items()],
+                output_field=DateTimeField(),
+            ))
+        return len(objects)
+
+    def _enrich(self, movie_ids):
+        # Full details (runtime, genres, cast) for viewing stats and recommendations
+        from movies.models import Movie
+        from movies.services import TMDBService
+        try:
+            tmdb = TMDBService()
+            for movie_id in Movie.objects.filter(id__in=movie_ids, details=None).values_list('id', flat=True):
+                tmdb.get_movie_details(movie_id)
+        except Exception as e:
+            print(f"Error enriching imported movies: {e}")
+        finally:
+            connection.close()
+
+    def _sync(self, user_id):
+        # bulk_create sends no signals: bring the derived tables up to date in one go
+        from movies.interaction_service import InteractionService
+        from .achievement_service import AchievementService
+        from .profile_service import ProfileService
+        ProfileService().recount(user_id)
+        ProfileService().invalidate(user_id)
+        InteractionService().rebuild(user_ids=[user_id])
+        AchievementService().replay(user_ids=[user_id])
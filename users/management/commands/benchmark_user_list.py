@@ -0,0 +1,101 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from movies.models import Favorite, Watched
+from users.profile_service import ProfileService
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the admin user list (join counts + OFFSET vs counters + keyset, username search) "
+        "on a synthetic user table. Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--interactions', type=int, default=500_000, help="Synthetic Watched and Favorite rows each.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per query; the median is reported.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['users'], options['interactions'])
+            self.run(options['users'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, n_users, n_interactions):
+        rng = random.Random(42)
+        started = time.perf_counter()
+        now = timezone.now()
+        first_id = (User.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+        batch = 10_000
+        for start in range(0, n_users, batch):
+            User.objects.bulk_create([
+                User(
+                    id=first_id + i,
+                    username=f'bench{i:07d}',
+                    password='!',
+                    date_joined=now - timedelta(seconds=rng.randrange(5 * 365 * 86400)),
+                )
+                for i in range(start, min(start + batch, n_users))
+            ])
+        for model in (Watched, Favorite):
+            for start in range(0, n_interactions, batch):
+                model.objects.bulk_create(
+                    [
+                        model(user_id=first_id + rng.randrange(n_users), movie_id=rng.randrange(50_000))
+                        for _ in range(min(batch, n_interactions - start))
+                    ],
+                    ignore_conflicts=True,
+                )
+        ProfileService().rebuild()
+        self.stdout.write(f"Seeded {n_users} users and {n_interactions} watched/favorites each "
+                          f"in {time.perf_counter() - started:.0f}s ({connection.vendor}).")
+
+    def timed(self, label, query, repeat):
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = query()
+            runs.append(time.perf_counter() - started)
+        self.stdout.write(f"  {label:<52} {statistics.median(runs) * 1000:9.1f} ms  ({len(rows)} rows)")
+
+    def run(self, n_users, repeat):
+        profiles = ProfileService()
+        joins = User.objects.annotate(
+            review_count=Count('review'), fav_count=Count('favorite'), watch_count=Count('watched')
+        ).order_by('-date_joined', '-id')
+        counters = User.objects.annotate(
+            review_count=F('stats__reviews_count'),
+            fav_count=F('stats__favorites_count'),
+            watch_count=F('stats__watched_count'),
+        )
+        deep = n_users // 2
+        # Cursor for the same position the OFFSET query jumps to (not timed)
+        anchor = User.objects.order_by('-date_joined', '-id')[deep - 1:deep].get()
+        cursor = profiles.encode_cursor(anchor, 'date_joined')
+        needle = f'{n_users // 3:07d}'[-5:]
+
+        self.stdout.write("First page:")
+        self.timed("three COUNT joins", lambda: list(joins[:50]), repeat)
+        self.timed("UserStats counters, keyset", lambda: profiles.keyset_page(counters, 'date_joined', size=50)[0], repeat)
+        self.stdout.write(f"Page at row {deep}:")
+        self.timed("three COUNT joins, OFFSET", lambda: list(joins[deep:deep + 50]), repeat)
+        self.timed("UserStats counters, keyset", lambda: profiles.keyset_page(counters, 'date_joined', cursor, size=50)[0], repeat)
+        self.stdout.write(f"Username search {needle!r}:")
+        self.timed("icontains + COUNT joins", lambda: list(joins.filter(username__icontains=needle)[:50]), repeat)
+        self.timed("icontains + counters, keyset", lambda: profiles.keyset_page(
+            counters.filter(username__icontains=needle), 'date_joined', size=50)[0], repeat)
+        # What the dashboard runs where there is no trigram index
+        self.timed("icontains id__in subquery + counters, keyset", lambda: profiles.keyset_page(
+            counters.filter(id__in=User.objects.filter(username__icontains=needle).values('id')),
+            'date_joined', size=50)[0], repeat)
+        self.timed("istartswith (short prefix) + counters, keyset", lambda: profiles.keyset_page(
+            counters.filter(username__istartswith='bench00'), 'date_joined', size=50)[0], repeat)
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.viewing_stats_service import ViewingStatsService
+
+
+class Command(BaseCommand):
+    help = "Recompute the personal viewing statistics shown on profiles for users with new activity."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every user, not just those with new activity.")
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Users aggregated per batch.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = ViewingStatsService().build(full=options['full'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Built viewing stats for {written} users in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,39 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from users.import_service import ImportService
+from users.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Import a watch-history CSV (e.g. a Letterboxd export) for a user, printing progress as it goes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('path', help="CSV file to import.")
+        parser.add_argument('--favorites', action='store_true', help="Rows are likes: also add them to Favorites.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+
+        job = ImportJob.objects.create(user=user, filename=options['path'][-255:], as_favorites=options['favorites'])
+        started = time.perf_counter()
+
+        def progress(job):
+            self.stdout.write(
+                f"{job.rows:>7} rows  {job.matched:>7} matched  {job.created:>7} new  "
+                f"({job.rows / (time.perf_counter() - started):.0f} rows/s)"
+            )
+
+        job = ImportService().run(job, options['path'], progress=progress)
+        if job.status == ImportJob.FAILED:
+            raise CommandError(job.error)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {job.created} watched and {job.reviews} reviews from {job.rows} rows "
+            f"({job.rows - job.matched} unmatched) in {time.perf_counter() - started:.1f}s."
+        ))
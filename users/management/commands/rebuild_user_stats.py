@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.profile_service import ProfileService
+
+
+class Command(BaseCommand):
+    help = "Recount every user's watched/favorites/reviews counters from scratch."
+
+    def handle(self, *args, **options):
+        written = ProfileService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {written} users."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.achievement_service import AchievementService
+
+
+class Command(BaseCommand):
+    help = "Award any badges earned so far by replaying all Watched/Favorite/Review history against the rules."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Events evaluated per batch.")
+
+    def handle(self, *args, **options):
+        awarded = AchievementService().replay(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Awarded {awarded} badges."))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_profile_fdfs_badge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='banner_placeholder',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
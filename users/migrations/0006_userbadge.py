@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_fdfs_badges(apps, schema_editor):
+    Profile = apps.get_model("users", "Profile")
+    UserBadge = apps.get_model("users", "UserBadge")
+    now = timezone.now()
+    UserBadge.objects.bulk_create(
+        [
+            UserBadge(user_id=user_id, code="fdfs", awarded_at=now)
+            for user_id in Profile.objects.filter(fdfs_badge=True).values_list(
+                "user_id", flat=True
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def restore_fdfs_badges(apps, schema_editor):
+    Profile = apps.get_model("users", "Profile")
+    UserBadge = apps.get_model("users", "UserBadge")
+    Profile.objects.filter(
+        user_id__in=UserBadge.objects.filter(code="fdfs").values("user_id")
+    ).update(fdfs_badge=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_profile_banner_placeholder"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserBadge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=50)),
+                ("movie_id", models.IntegerField(blank=True, null=True)),
+                ("awarded_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="badges",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "code")},
+            },
+        ),
+        migrations.RunPython(copy_fdfs_badges, restore_fdfs_badges),
+        migrations.RemoveField(
+            model_name="profile",
+            name="fdfs_badge",
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing(apps, schema_editor):
+    User = apps.get_model("auth", "User")
+    UserStats = apps.get_model("users", "UserStats")
+    counts = {
+        "watched_count": apps.get_model("movies", "Watched"),
+        "favorites_count": apps.get_model("movies", "Favorite"),
+        "reviews_count": apps.get_model("reviews", "Review"),
+    }
+    stats = {
+        user_id: UserStats(user_id=user_id)
+        for user_id in User.objects.values_list("id", flat=True)
+    }
+    for field, model in counts.items():
+        for row in model.objects.values("user_id").annotate(n=Count("id")):
+            setattr(stats[row["user_id"]], field, row["n"])
+    UserStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0006_userbadge"),
+        ("movies", "0011_favorite_favorite_user_created_idx_and_more"),
+        ("reviews", "0004_review_review_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "watched_count",
+                    models.PositiveIntegerField(db_index=True, default=0),
+                ),
+                (
+                    "favorites_count",
+                    models.PositiveIntegerField(db_index=True, default=0),
+                ),
+                (
+                    "reviews_count",
+                    models.PositiveIntegerField(db_index=True, default=0),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
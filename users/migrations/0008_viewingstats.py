@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0007_userstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewingStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="viewing",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("runtime_minutes", models.PositiveIntegerField(default=0)),
+                ("genres", models.JSONField(default=list)),
+                ("directors", models.JSONField(default=list)),
+                ("actors", models.JSONField(default=list)),
+                ("ratings", models.JSONField(default=dict)),
+                ("activity", models.JSONField(default=list)),
+                ("computed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import DatabaseError, migrations, transaction
+
+
+def create_indexes(apps, schema_editor):
+    # auth_user belongs to django.contrib.auth, so its indexes are added here by hand
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS auth_user_date_joined_id_idx ON auth_user (date_joined, id)"
+    )
+    if schema_editor.connection.vendor == "postgresql":
+        # Matches the UPPER(username::text) LIKE ... that icontains/istartswith compile to.
+        # CREATE EXTENSION needs privileges a managed database may not grant; the
+        # search still works without the index, so skip it rather than fail
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError as e:
+            print(f"\n  Skipping auth_user_username_trgm_idx, pg_trgm unavailable: {e}")
+            return
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS auth_user_username_trgm_idx "
+            "ON auth_user USING gin (UPPER(username::text) gin_trgm_ops)"
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS auth_user_date_joined_id_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS auth_user_username_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0009_importjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:36
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_watched_count(apps, schema_editor):
+    # Imports were not flagged before this migration, so every existing watch counts
+    UserStats = apps.get_model("users", "UserStats")
+    UserStats.objects.update(ranked_watched_count=F("watched_count"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0010_auth_user_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userstats",
+            name="ranked_watched_count",
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(copy_watched_count, migrations.RunPython.noop),
+    ]
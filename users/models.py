@@ -6,8 +6,91 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     avatar = CloudinaryField('image', default='https://res.cloudinary.com/djgau34yl/image/upload/v1/default_avatar.png')
     banner_url = models.URLField(blank=True, null=True, max_length=500)
+    banner_placeholder = models.TextField(blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
-    fdfs_badge = models.BooleanField(default=False)
 
     def __str__(self):
         return f'{self.user.username} Profile'
+
+class UserBadge(models.Model):
+    # Achievement awarded by users/achievement_service.py; `code` names one of its RULES
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='badges')
+    code = models.CharField(max_length=50)
+    movie_id = models.IntegerField(blank=True, null=True)  # Movie that triggered it, if any
+    awarded_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'code')
+
+    def __str__(self):
+        return f'{self.user.username} - {self.code}'
+
+class UserStats(models.Model):
+    # Per-user counters kept in step with Watched/Favorite/Review by users/signals.py,
+    # so profiles, leaderboards and the dashboard read them instead of COUNT(*)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    watched_count = models.PositiveIntegerField(default=0, db_index=True)
+    favorites_count = models.PositiveIntegerField(default=0, db_index=True)
+    reviews_count = models.PositiveIntegerField(default=0, db_index=True)
+    # Watches logged here, imports excluded: what the fan corner leaderboard ranks by
+    ranked_watched_count = models.PositiveIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.user.username} Stats'
+
+class ViewingStats(models.Model):
+    # Personal viewing statistics, precomputed by `build_viewing_stats` from
+    # Watched/Review and the movie details mirrored in movies.Movie
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='viewing')
+    runtime_minutes = models.PositiveIntegerField(default=0)
+    genres = models.JSONField(default=list)     # [[name, movies watched], ...] most watched first
+    directors = models.JSONField(default=list)  # [[person id, name, movies watched], ...]
+    actors = models.JSONField(default=list)     # [[person id, name, movies watched], ...]
+    ratings = models.JSONField(default=dict)    # {'overall': 3.8, 'music': 4.1, ...} average per aspect
+    activity = models.JSONField(default=list)   # Movies watched per month, oldest first, last month is the current one
+    computed_at = models.DateTimeField()
+
+    def genre_bars(self):
+        top = max((count for _, count in self.genres), default=0)
+        return [{'name': name, 'count': count, 'percent': round(100 * count / top)} for name, count in self.genres]
+
+    def activity_bars(self):
+        top = max(self.activity, default=0)
+        return [{'count': count, 'percent': round(100 * count / top) if top else 0} for count in self.activity]
+
+    def __str__(self):
+        return f'{self.user.username} Viewing Stats'
+
+class ImportJob(models.Model):
+    # One uploaded watch-history CSV (e.g. a Letterboxd export), processed by users/import_service.py
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Queued'),
+        (RUNNING, 'Importing'),
+        (DONE, 'Finished'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='imports')
+    filename = models.CharField(max_length=255)
+    as_favorites = models.BooleanField(default=False)  # Rows are likes, so also add them to Favorites
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    rows = models.PositiveIntegerField(default=0)
+    matched = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)   # New Watched rows
+    reviews = models.PositiveIntegerField(default=0)   # New Review rows
+    unmatched = models.JSONField(default=list)         # First few [title, year] we couldn't find
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    @property
+    def is_active(self):
+        return self.status in (self.PENDING, self.RUNNING)
+
+    def __str__(self):
+        return f'{self.user.username} - {self.filename} ({self.status})'
@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import UserStats, ViewingStats
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class ProfileService:
+    """
+    Profile data whose cost doesn't grow with the user's history: counters come
+    from the UserStats row, and favorites/watched/reviews are read a page at a
+    time with (timestamp, id) cursors. Favorites and watched come from
+    movies.Interaction with titles/posters from Movie; reviews from Review.
+    The first page of everything is cached per user and dropped whenever one
+    of their rows changes.
+    """
+
+    PAGE_SIZE = 12
+    CACHE_TIMEOUT = 60 * 10
+
+    COUNTER_FIELDS = {
+        'watched': 'watched_count',
+        'favorites': 'favorites_count',
+        'reviews': 'reviews_count',
+    }
+    # Also kept per user: watches that weren't imported, for the leaderboard
+    RANKED_FIELD = 'ranked_watched_count'
+
+    def _models(self):
+        from movies.models import Favorite, Watched
+        from reviews.models import Review
+        return {'watched': Watched, 'favorites': Favorite, 'reviews': Review}
+
+    # ── Counters ─────────────────────────────────────────────────────
+
+    def stats(self, user_id):
+        stats = UserStats.objects.filter(user_id=user_id).first()
+        return stats or self.recount(user_id)
+
+    def recount(self, user_id):
+        """Recomputes a user's counters from their rows (also creates a missing stats row)."""
+        counts = {
+            self.COUNTER_FIELDS[kind]: model.objects.filter(user_id=user_id).count()
+            for kind, model in self._models().items()
+        }
+        counts[self.RANKED_FIELD] = self._models()['watched'].objects.filter(user_id=user_id, imported=False).count()
+        stats, _ = UserStats.objects.update_or_create(user_id=user_id, defaults=counts)
+        return stats
+
+    def bump(self, user_id, kind, delta, imported=False):
+        fields = [self.COUNTER_FIELDS[kind]] + ([self.RANKED_FIELD] if kind == 'watched' and not imported else [])
+        updated = UserStats.objects.filter(user_id=user_id).update(
+            # Clamped: a delete racing a recount can't push a counter below 0
+            **{field: Greatest(F(field) + delta, 0) for field in fields}, updated_at=timezone.now()
+        )
+        if not updated and delta > 0:
+            self.recount(user_id)
+        self.invalidate(user_id)
+
+    def rebuild(self):
+        """Recounts every user with one GROUP BY per table. Returns the number of rows written."""
+        from django.contrib.auth.models import User
+        stats = {user_id: UserStats(user_id=user_id) for user_id in User.objects.values_list('id', flat=True)}
+        for kind, model in self._models().items():
+            for row in model.objects.values('user_id').annotate(n=Count('id')):
+                setattr(stats[row['user_id']], self.COUNTER_FIELDS[kind], row['n'])
+        for row in self._models()['watched'].objects.filter(imported=False).values('user_id').annotate(n=Count('id')):
+            setattr(stats[row['user_id']], self.RANKED_FIELD, row['n'])
+        UserStats.objects.bulk_create(
+            stats.values(),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[*self.COUNTER_FIELDS.values(), self.RANKED_FIELD, 'updated_at'],
+        )
+        cache.delete_many([self._cache_key(user_id) for user_id in stats])
+        return len(stats)
+
+    # ── Cursor pagination ────────────────────────────────────────────
+
+    def encode_cursor(self, item, field='created_at'):
+        return f"{(getattr(item, field) - EPOCH) // timedelta(microseconds=1)}-{item.pk}"
+
+    def decode_cursor(self, cursor):
+        try:
+            micros, pk = cursor.split('-')
+            return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+        except (AttributeError, ValueError, OverflowError):
+            # Tampered or out-of-range cursors start again from the first page
+            return None
+
+    def keyset_page(self, queryset, field, cursor=None, size=PAGE_SIZE):
+        """
+        Newest-first page of `queryset` by (`field`, id), starting after `cursor`.
+        Seeks straight to the position through an index on (field, id), so deep
+        pages cost the same as the first. Returns (items, next_cursor).
+        """
+        queryset = queryset.order_by(f'-{field}', '-id')
+        position = self.decode_cursor(cursor) if cursor else None
+        if position:
+            value, pk = position
+            queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}))
+        items = list(queryset[:size + 1])
+        next_cursor = self.encode_cursor(items[size - 1], field) if len(items) > size else None
+        return items[:size], next_cursor
+
+    # kind -> Interaction timestamp set while the flag is on
+    INTERACTION_FIELDS = {'watched': 'watched_at', 'favorites': 'favorited_at'}
+
+    def page(self, user, kind, cursor=None, size=PAGE_SIZE):
+        """Newest-first page of the user's `kind` rows after `cursor`. Returns (items, next_cursor)."""
+        if kind not in self.INTERACTION_FIELDS:
+            return self.keyset_page(self._models()[kind].objects.filter(user=user), 'created_at', cursor, size)
+        from movies.models import Interaction
+        field = self.INTERACTION_FIELDS[kind]
+        queryset = Interaction.objects.filter(user=user, **{f'{field}__isnull': False})
+        items, next_cursor = self.keyset_page(queryset, field, cursor, size)
+        return self.with_movies(items), next_cursor
+
+    def with_movies(self, items):
+        """Sets .title and .poster_url on each item from the Movie catalog, in one query."""
+        from movies.models import Movie
+        catalog = Movie.objects.only('title', 'poster_url').in_bulk({item.movie_id for item in items})
+        for item in items:
+            movie = catalog.get(item.movie_id)
+            item.title = movie.title if movie else None
+            item.poster_url = movie.poster_url if movie else None
+        return items
+
+    # ── Cached profile summary ───────────────────────────────────────
+
+    def _cache_key(self, user_id):
+        return f'profile_summary:{user_id}'
+
+    def summary(self, user):
+        key = self._cache_key(user.pk)
+        summary = cache.get(key)
+        if summary is None:
+            from .achievement_service import AchievementService
+            stats = self.stats(user.pk)
+            favorites, favorites_cursor = self.page(user, 'favorites')
+            watched, watched_cursor = self.page(user, 'watched', size=10)
+            recent_reviews, _ = self.page(user, 'reviews', size=5)
+            summary = {
+                'watched_count': stats.watched_count,
+                'favorites_count': stats.favorites_count,
+                'reviews_count': stats.reviews_count,
+                'favorites': favorites,
+                'favorites_cursor': favorites_cursor,
+                'watched_movies': watched,
+                'watched_cursor': watched_cursor,
+                'recent_reviews': recent_reviews,
+                'badges': AchievementService().badges_for(user),
+                'viewing': ViewingStats.objects.filter(user=user).first(),
+            }
+            cache.set(key, summary, self.CACHE_TIMEOUT)
+        return summary
+
+    def invalidate(self, *user_ids):
+        cache.delete_many([self._cache_key(user_id) for user_id in user_ids])
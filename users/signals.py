@@ -1,13 +1,61 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Profile
+from movies.models import Favorite, Watched
+from reviews.models import Review
+from .models import Profile, UserStats
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+        UserStats.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
 def save_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+
+def _publish_achievement_event(kind, instance):
+    from .achievement_service import AchievementService
+    transaction.on_commit(
+        lambda: AchievementService().publish(kind, instance.user_id, instance.movie_id, instance.created_at)
+    )
+
+@receiver(post_save, sender=Watched)
+def watched_achievements(sender, instance, created, **kwargs):
+    if created:
+        _publish_achievement_event('watched', instance)
+
+@receiver(post_save, sender=Favorite)
+def favorite_achievements(sender, instance, created, **kwargs):
+    if created:
+        _publish_achievement_event('favorited', instance)
+
+@receiver(post_save, sender=Review)
+def review_achievements(sender, instance, created, **kwargs):
+    if created:
+        _publish_achievement_event('reviewed', instance)
+
+
+# Per-user counters and the cached profile summary
+STATS_KINDS = {Watched: 'watched', Favorite: 'favorites', Review: 'reviews'}
+
+@receiver(post_save, sender=Watched)
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=Review)
+def count_saved(sender, instance, created, **kwargs):
+    from .profile_service import ProfileService
+    if created:
+        ProfileService().bump(instance.user_id, STATS_KINDS[sender], 1, imported=instance.imported)
+    else:
+        # Edited title/poster/review text shows on the profile
+        ProfileService().invalidate(instance.user_id)
+
+@receiver(post_delete, sender=Watched)
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=Review)
+def count_deleted(sender, instance, **kwargs):
+    from .profile_service import ProfileService
+    ProfileService().bump(instance.user_id, STATS_KINDS[sender], -1, imported=instance.imported)
@@ -1,3 +1,63 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from movies.models import Watched
+from .profile_service import ProfileService
+
+
+class CursorTests(TestCase):
+
+    def test_round_trip(self):
+        user = User.objects.create(username='fan')
+        self.assertEqual(ProfileService().decode_cursor(ProfileService().encode_cursor(user, 'date_joined')),
+                         (user.date_joined, user.pk))
+
+    def test_bad_cursors_decode_to_none(self):
+        for cursor in ['', 'abc', '12-ab', '1-2-3', None, '99999999999999999999999-1', '-99999999999999999999999-1']:
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(ProfileService().decode_cursor(cursor))
+
+
+@override_settings(ACHIEVEMENTS_ASYNC=False)
+class ProfileListTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='fan')
+        for movie_id in range(1, 4):
+            Watched.objects.create(user=self.user, movie_id=movie_id)
+        self.client.force_login(self.user)
+
+    def test_pages_follow_the_cursor(self):
+        items, cursor = ProfileService().page(self.user, 'watched', size=2)
+        rest, end = ProfileService().page(self.user, 'watched', cursor, size=2)
+        self.assertEqual([item.movie_id for item in items + rest], [3, 2, 1])
+        self.assertIsNone(end)
+
+    def test_out_of_range_cursor_shows_the_first_page(self):
+        response = self.client.get(reverse('profile-list', args=['favorites']), {'cursor': '99999999999999999999999-1'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse('profile-list', args=['watched']), {'cursor': '99999999999999999999999-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['items']), 3)
+
+
+class AdminUserListTests(TestCase):
+
+    def setUp(self):
+        self.staff = User.objects.create(username='boss', is_staff=True)
+        for i in range(3):
+            User.objects.create(username=f'member{i}')
+        self.client.force_login(self.staff)
+
+    def test_out_of_range_cursor_shows_the_first_page(self):
+        response = self.client.get(reverse('admin-dashboard'), {'users_before': '99999999999999999999999-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['all_users']), 4)
+
+    def test_username_search(self):
+        # 3+ characters match anywhere, shorter searches match the start
+        for search, expected in [('ember', 3), ('member1', 1), ('me', 3), ('em', 0)]:
+            with self.subTest(search=search):
+                response = self.client.get(reverse('admin-dashboard'), {'search_user': search})
+                self.assertEqual(len(response.context['all_users']), expected)
@@ -0,0 +1,162 @@
+from datetime import timezone as dt_timezone
+
+import numpy as np
+from scipy import sparse
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import UserStats, ViewingStats
+
+
+class ViewingStatsService:
+    """
+    Builds users.ViewingStats in bulk. For a chunk of users the Watched rows
+    become a sparse user x movie matrix, and runtime, genre, director and
+    actor totals are that matrix times per-movie feature vectors/matrices
+    built once from movies.Movie.details; review aspects and monthly activity
+    are np.bincount sums. Only users whose activity changed since their last
+    build are recomputed unless `full` is set.
+    """
+
+    TOP_GENRES = 8
+    TOP_PEOPLE = 5
+    TOP_BILLED = 5  # Actors per movie that count towards "favourite actors"
+    MONTHS = 12
+    ASPECTS = {
+        'overall': 'rating',
+        'music': 'music_rating',
+        'direction': 'direction_rating',
+        'acting': 'acting_rating',
+        'cinematography': 'cinematography_rating',
+    }
+
+    def stale_users(self):
+        """Users with watched/review changes since their stats were built (or never built)."""
+        from reviews.models import Review
+        counters = UserStats.objects.filter(
+            Q(user__viewing=None, watched_count__gt=0)
+            | Q(user__viewing=None, reviews_count__gt=0)
+            | Q(updated_at__gt=F('user__viewing__computed_at'))
+        ).values_list('user_id', flat=True)
+        # Edited reviews don't touch the counters
+        edited = Review.objects.filter(updated_at__gt=F('user__viewing__computed_at')).values_list('user_id', flat=True)
+        return set(counters) | set(edited)
+
+    def build(self, full=False, chunk_size=5000):
+        """Recomputes stale users (all users with `full`). Returns the number of rows written."""
+        from django.contrib.auth.models import User
+        from .profile_service import ProfileService
+        user_ids = sorted(User.objects.values_list('id', flat=True) if full else self.stale_users())
+        written = 0
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            # Taken before reading so activity during the build marks the user stale again
+            computed_at = timezone.now()
+            rows = self.compute(chunk, computed_at)
+            ViewingStats.objects.bulk_create(
+                rows,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['runtime_minutes', 'genres', 'directors', 'actors', 'ratings', 'activity', 'computed_at'],
+            )
+            ProfileService().invalidate(*chunk)
+            written += len(rows)
+        return written
+
+    def compute(self, user_ids, computed_at):
+        from movies.models import Movie, Watched
+        from reviews.models import Review
+        users = np.asarray(user_ids)
+        n_users = len(users)
+
+        watched = list(Watched.objects.filter(user_id__in=user_ids).values_list('user_id', 'movie_id', 'created_at'))
+        movie_ids = np.unique(np.fromiter((movie_id for _, movie_id, _ in watched), dtype=np.int64, count=len(watched)))
+        w_user = np.searchsorted(users, np.fromiter((u for u, _, _ in watched), dtype=np.int64, count=len(watched)))
+        w_movie = np.searchsorted(movie_ids, np.fromiter((m for _, m, _ in watched), dtype=np.int64, count=len(watched)))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(watched), dtype=np.float32), (w_user, w_movie)), shape=(n_users, len(movie_ids))
+        )
+
+        runtime, genres, directors, actors = self._movie_features(
+            dict(Movie.objects.filter(id__in=movie_ids.tolist()).values_list('id', 'details')), movie_ids
+        )
+        runtime_totals = matrix @ runtime
+        genre_counts = (matrix @ genres['matrix']).tocsr()
+        director_counts = (matrix @ directors['matrix']).tocsr()
+        actor_counts = (matrix @ actors['matrix']).tocsr()
+
+        activity = self._activity(w_user, [at for _, _, at in watched], n_users, computed_at)
+
+        reviews = list(Review.objects.filter(user_id__in=user_ids).values_list('user_id', *self.ASPECTS.values()))
+        r_user = np.searchsorted(users, np.fromiter((row[0] for row in reviews), dtype=np.int64, count=len(reviews)))
+        scores = np.array([row[1:] for row in reviews], dtype=np.float64).reshape(len(reviews), len(self.ASPECTS))
+        rated = ~np.isnan(scores)
+        filled = np.where(rated, scores, 0)
+        aspects = range(scores.shape[1])
+        sums = np.stack([np.bincount(r_user, weights=filled[:, k], minlength=n_users) for k in aspects], axis=1)
+        counts = np.stack([np.bincount(r_user, weights=rated[:, k], minlength=n_users) for k in aspects], axis=1)
+        averages = np.divide(sums, counts, out=np.full_like(sums, np.nan), where=counts > 0)
+
+        return [
+            ViewingStats(
+                user_id=int(user_id),
+                runtime_minutes=int(runtime_totals[i]),
+                genres=[[genres['labels'][j], n] for j, n in self._top(genre_counts, i, self.TOP_GENRES)],
+                directors=[[*directors['labels'][j], n] for j, n in self._top(director_counts, i, self.TOP_PEOPLE)],
+                actors=[[*actors['labels'][j], n] for j, n in self._top(actor_counts, i, self.TOP_PEOPLE)],
+                ratings={
+                    aspect: round(float(averages[i, k]), 1)
+                    for k, aspect in enumerate(self.ASPECTS) if not np.isnan(averages[i, k])
+                },
+                activity=activity[i].tolist(),
+                computed_at=computed_at,
+            )
+            for i, user_id in enumerate(users)
+        ]
+
+    def _movie_features(self, details_by_id, movie_ids):
+        """Per-movie runtime vector plus movie x genre/director/actor incidence matrices."""
+        runtime = np.zeros(len(movie_ids), dtype=np.float64)
+        vocabularies = {'genres': {}, 'directors': {}, 'actors': {}}
+        entries = {name: ([], []) for name in vocabularies}
+
+        def add(name, row, key, label):
+            column = vocabularies[name].setdefault(key, (len(vocabularies[name]), label))[0]
+            entries[name][0].append(row)
+            entries[name][1].append(column)
+
+        for row, movie_id in enumerate(movie_ids.tolist()):
+            details = details_by_id.get(movie_id) or {}
+            runtime[row] = details.get('runtime') or 0
+            for genre in set(details.get('genres') or []):
+                add('genres', row, genre, genre)
+            for person in {d['id']: d for d in details.get('directors') or []}.values():
+                add('directors', row, person['id'], (person['id'], person.get('name')))
+            for person in {c['id']: c for c in (details.get('cast') or [])[:self.TOP_BILLED]}.values():
+                add('actors', row, person['id'], (person['id'], person.get('name')))
+
+        features = [runtime]
+        for name, vocabulary in vocabularies.items():
+            rows, columns = entries[name]
+            labels = [label for _, label in sorted(vocabulary.values())]
+            matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(len(movie_ids), len(labels))
+            )
+            features.append({'matrix': matrix, 'labels': labels})
+        return features
+
+    def _activity(self, w_user, watched_at, n_users, computed_at):
+        # Month buckets as months since 1970; the last column is the current month
+        current = np.datetime64(computed_at.replace(tzinfo=None), 'M').astype(np.int64)
+        months = np.array([at.astimezone(dt_timezone.utc).replace(tzinfo=None) for at in watched_at], dtype='datetime64[M]')
+        offset = months.astype(np.int64) - (current - self.MONTHS + 1)
+        recent = (offset >= 0) & (offset < self.MONTHS)
+        counts = np.bincount(w_user[recent] * self.MONTHS + offset[recent], minlength=n_users * self.MONTHS)
+        return counts.reshape(n_users, self.MONTHS)
+
+    def _top(self, counts, row, k):
+        start, end = counts.indptr[row], counts.indptr[row + 1]
+        columns, values = counts.indices[start:end], counts.data[start:end]
+        best = np.argsort(-values, kind='stable')[:k]
+        return [(int(columns[j]), int(values[j])) for j in best]
@@ -1,6 +1,6 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from .forms import UserRegisterForm, ProfileUpdateForm
+from .forms import UserRegisterForm, ProfileUpdateForm, ImportHistoryForm
 from django.contrib.auth.decorators import login_required
 
 def register(request):
@@ -26,30 +26,10 @@ def profile(request):
     else:
         p_form = ProfileUpdateForm(instance=request.user.profile)
 
-    # Fetch Stats
-    from reviews.models import Review
-    from movies.models import Favorite, Watched
-    
-    watched_count = Watched.objects.filter(user=request.user).count()
-    watched_movies = Watched.objects.filter(user=request.user).order_by('-created_at')[:10] # Get recent 10
-    
-    reviews = Review.objects.filter(user=request.user)
-    # reviews_count no longer primary metric for 'watched', but we can still show it or keep variable name if needed.
-    # User wanted "Watched" stat to update when clicking Watch button.
-    
-    recent_reviews = reviews.order_by('-created_at')[:5]
-    
-    favorites = Favorite.objects.filter(user=request.user)
-    favorites_count = favorites.count()
-
-    context = {
-        'p_form': p_form,
-        'reviews_count': watched_count, # Mapping 'Watched' UI label to this count
-        'recent_reviews': recent_reviews,
-        'favorites': favorites,
-        'favorites_count': favorites_count,
-        'watched_movies': watched_movies
-    }
+    # Counters come from the user's stats row and the lists are first pages only,
+    # so this stays the same size however long their history gets
+    from .profile_service import ProfileService
+    context = {'p_form': p_form, **ProfileService().summary(request.user)}
 
     return render(request, 'users/profile.html', context)
 
@@ -61,9 +41,50 @@ def set_banner(request, movie_id):
     
     if movie and movie.get('backdrop_url'):
         request.user.profile.banner_url = movie['backdrop_url']
+        request.user.profile.banner_placeholder = movie.get('backdrop_placeholder')
         request.user.profile.save()
         messages.success(request, f"Profile banner updated to {movie['title']}!")
     else:
         messages.error(request, "Could not set banner from this movie.")
     
     return redirect('profile')
+
+@login_required
+def profile_list(request, kind):
+    # Full favorites / watched history, a page at a time
+    from django.http import Http404
+    from .profile_service import ProfileService
+    titles = {'favorites': 'Favorite Movies', 'watched': 'Watched'}
+    if kind not in titles:
+        raise Http404
+    items, next_cursor = ProfileService().page(request.user, kind, request.GET.get('cursor'))
+    return render(request, 'users/profile_list.html', {
+        'title': titles[kind],
+        'kind': kind,
+        'items': items,
+        'next_cursor': next_cursor,
+    })
+
+@login_required
+def import_history(request):
+    from .import_service import ImportService
+    if request.method == 'POST':
+        form = ImportHistoryForm(request.POST, request.FILES)
+        if form.is_valid():
+            ImportService().start(request.user, form.cleaned_data['file'], form.cleaned_data['as_favorites'])
+            messages.success(request, "Import started. Matched movies will show up on your profile as it runs.")
+            return redirect('import-history')
+    else:
+        form = ImportHistoryForm()
+
+    jobs = request.user.imports.order_by('-created_at')[:10]
+    return render(request, 'users/import.html', {
+        'form': form,
+        'jobs': jobs,
+        'running': any(job.is_active for job in jobs),
+    })
+
+@login_required
+def download_my_data(request):
+    from movies.export_service import ExportService
+    return ExportService().user_data(request.user)